@@ -0,0 +1,179 @@
+"""Benchmarks du pipeline du tableau de bord.
+
+Depuis ``Homework/`` :
+
+    python -m benchmarks.run_benchmarks --sizes 1k,10k,100k
+    python -m benchmarks.run_benchmarks --sizes 1k,10k --save-baseline
+
+Les jeux de données synthétiques sont générés une fois dans ``benchmarks/.data``.
+Les résultats (JSON) sont comparés à ``benchmarks/baseline.json`` : une étape
+plus lente de plus de ``--threshold`` est signalée et le code de sortie vaut 1.
+
+La référence dépend de la machine : elle n'est pas versionnée (.gitignore).
+Chacun l'enregistre sur sa machine, à partir du commit de départ, avec
+``--save-baseline`` (même ``--sizes`` que les mesures à comparer), puis
+compare ses modifications à celle-ci. Une référence prise sur une autre
+machine (Python, plateforme, nombre de cœurs) est signalée.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.synthetic_data import ensure_dataset, parse_size, size_label
+from services.report_generator import ReportGenerator
+from storage.json_storage import JSONStorage
+from ui.virtual_web_ui import _render_virtual_html
+from ui.web_ui import _build_member_maps, _parse_events, _render_html, _split_members
+
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_SIZES = "1k,10k,100k"
+# En dessous, l'écart relève du bruit de mesure, pas d'une régression.
+_MIN_DELTA = 0.005
+# Une référence n'est comparable que mesurée dans le même environnement.
+_MACHINE_KEYS = ("python", "platform", "cpu_count")
+
+STAGES = (
+    "load_members",
+    "load_events",
+    "load_subscriptions",
+    "load_donations",
+    "split_members",
+    "build_member_maps",
+    "parse_events",
+    "render_html",
+    "write_html",
+    "render_virtual",
+    "report_generator",
+)
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run_once(data_dir: Path, out_dir: Path) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    storage = JSONStorage(data_dir)
+    timings["load_members"], members = _timed(storage.load_members)
+    timings["load_events"], events_raw = _timed(storage.load_events)
+    timings["load_subscriptions"], subs = _timed(storage.load_subscriptions)
+    timings["load_donations"], donations = _timed(storage.load_donations)
+
+    timings["split_members"], (students, teachers) = _timed(lambda: _split_members(members))
+    timings["build_member_maps"], (s_map, t_map) = _timed(lambda: _build_member_maps(students, teachers))
+    timings["parse_events"], events = _timed(lambda: _parse_events(events_raw, s_map, t_map))
+    timings["render_html"], html = _timed(lambda: _render_html(students, teachers, events, subs, donations))
+    out_file = out_dir / "madrassa.html"
+    timings["write_html"], _ = _timed(lambda: out_file.write_text(html, encoding="utf-8"))
+    timings["render_virtual"], _ = _timed(lambda: _render_virtual_html(students, teachers, events, subs, donations))
+    report = ReportGenerator(out_dir)
+    timings["report_generator"], _ = _timed(lambda: report.build_and_save(members, events_raw))
+    return timings
+
+
+def bench_size(n_members: int, repeat: int, seed: int, cache_dir: Path) -> Dict[str, Any]:
+    data_dir = ensure_dataset(cache_dir, n_members, seed)
+    runs: List[Dict[str, float]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(max(1, repeat)):
+            runs.append(run_once(data_dir, Path(tmp)))
+    counts = json.loads((data_dir / "counts.json").read_text(encoding="utf-8"))
+    bytes_in = sum((data_dir / f"{name}.json").stat().st_size for name in counts)
+    # Meilleur temps de chaque étape : le moins sensible aux perturbations de la machine.
+    stages = {stage: min(run[stage] for run in runs) for stage in STAGES}
+    return {
+        "members": n_members,
+        "records": counts,
+        "input_bytes": bytes_in,
+        "repeat": len(runs),
+        "stages": stages,
+        "total": sum(stages.values()),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Étapes plus lentes que la référence de plus de ``threshold`` (0.25 = +25 %)."""
+    regressions: List[str] = []
+    for label, current in results["sizes"].items():
+        reference = baseline.get("sizes", {}).get(label)
+        if reference is None:
+            continue
+        for stage, seconds in current["stages"].items():
+            before = reference["stages"].get(stage)
+            if before is None:
+                continue
+            if seconds > before * (1 + threshold) and seconds - before > _MIN_DELTA:
+                regressions.append(f"{label} {stage}: {before:.4f}s -> {seconds:.4f}s (+{(seconds / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _print_table(results: Dict[str, Any]) -> None:
+    labels = list(results["sizes"])
+    print(f"{'stage':<20}" + "".join(f"{label:>12}" for label in labels))
+    for stage in (*STAGES, "total"):
+        cells = []
+        for label in labels:
+            entry = results["sizes"][label]
+            cells.append(entry["total"] if stage == "total" else entry["stages"][stage])
+        print(f"{stage:<20}" + "".join(f"{c:>11.4f}s" for c in cells))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Mesure chaque étape du tableau de bord sur des données synthétiques.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="nombres de membres, ex: 1k,10k,1M,10M")
+    parser.add_argument("--repeat", type=int, default=3, help="exécutions par taille (le meilleur temps est gardé)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", type=Path, default=BENCH_DIR / ".data")
+    parser.add_argument("--out", type=Path, default=BENCH_DIR / "results.json")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="ralentissement toléré avant de signaler une régression")
+    parser.add_argument("--save-baseline", action="store_true", help="enregistre ces résultats comme nouvelle référence")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "sizes": {},
+    }
+    for size in args.sizes.split(","):
+        n = parse_size(size)
+        print(f"[bench] {size_label(n)} membres...", file=sys.stderr)
+        results["sizes"][size_label(n)] = bench_size(n, args.repeat, args.seed, args.cache_dir)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    _print_table(results)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Référence enregistrée : {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print("Pas de référence : relancer avec --save-baseline pour en créer une.")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    other = [k for k in _MACHINE_KEYS if baseline.get(k) != results[k]]
+    if other:
+        print(f"Attention : référence prise sur une autre machine ({', '.join(other)}) ; relancer avec --save-baseline.")
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"[REGRESSION] {line}")
+    if not regressions:
+        print("Aucune régression par rapport à la référence.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+from __future__ import annotations
+import json
+import random
+import unicodedata
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator
+
+
+FIRST_NAMES = (
+    "Ali", "Amine", "Yacine", "Mohamed", "Karim", "Sofiane", "Bilal", "Omar", "Yousra", "Amina",
+    "Sarah", "Lina", "Meriem", "Ines", "Khadija", "Fatima", "Nour", "Rania", "Hamza", "Walid",
+    "Zakaria", "Imane", "Samira", "Anis", "Réda", "Aïcha", "Mélissa", "Ilyès", "Hanane", "Idriss",
+)
+LAST_NAMES = (
+    "Ben", "Rahmani", "Belkacem", "Haddad", "Mansouri", "Saidi", "Boualem", "Cherif", "Kaci",
+    "Meziane", "Brahimi", "Djebbar", "Hamidi", "Benali", "Ouali", "Zerrouki", "Lounis", "Amrani",
+    "Bensaïd", "Khelifa", "Taleb", "Yahiaoui", "Ait Ahmed", "Benmoussa",
+)
+ADDRESSES = (
+    "Bouzaréah", "Bab Ezzouar", "Kouba", "El Harrach", "Hydra", "Birkhadem", "Chéraga",
+    "Dely Ibrahim", "Bir Mourad Raïs", "Hussein Dey", "Bab El Oued", "Alger Centre", "Draria",
+)
+SKILLS = ("Hifz", "Tajwid", "Tafsir", "Arabic", "Fiqh", "Seerah", "Calligraphy", "Nasheed")
+INTERESTS = ("Memorisation", "Competitions", "Reading", "Coaching", "Trips", "Volunteering", "Sports")
+EVENT_KINDS = ("Hifdh Circle", "Tajwid Workshop", "Seerah Lecture", "Quran Competition", "Family Trip", "Parents Meeting")
+DONATION_SOURCES = ("Student", "Parent", "External", "Anonymous")
+DONATION_PURPOSES = ("Zakat", "Library", "Maintenance", "Scholarship", "Events")
+
+TEACHER_RATIO = 25
+GROUP_SIZE = 25
+EVENT_RATIO = 50
+DONATION_RATIO = 10
+_START = date(2024, 9, 1)
+
+
+def parse_size(text: str) -> int:
+    """« 1k » -> 1000, « 10M » -> 10000000."""
+    text = text.strip().lower().replace("_", "")
+    factor = 1
+    if text[-1:] in ("k", "m"):
+        factor = 1000 if text[-1] == "k" else 1_000_000
+        text = text[:-1]
+    return int(float(text) * factor)
+
+
+def size_label(n: int) -> str:
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}M"
+    if n >= 1000 and n % 1000 == 0:
+        return f"{n // 1000}k"
+    return str(n)
+
+
+def _day(rng: random.Random, span: int = 365) -> str:
+    return (_START + timedelta(days=rng.randrange(span))).isoformat()
+
+
+def _ascii(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+def _person(rng: random.Random, n: int) -> Dict[str, Any]:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "full_name": f"{first} {last}",
+        "email": _ascii(f"{first}.{last}{n}@example.com".lower().replace(" ", "")),
+        "phone": f"05{rng.randrange(10**8):08d}",
+        "address": rng.choice(ADDRESSES),
+        "join_date": _day(rng),
+        "skills": rng.sample(SKILLS, rng.randint(0, 3)),
+        "interests": rng.sample(INTERESTS, rng.randint(0, 2)),
+    }
+
+
+def iter_members(n_members: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Un professeur pour ``TEACHER_RATIO`` membres, le reste des étudiants."""
+    rng = random.Random(seed)
+    n_teachers = max(1, n_members // TEACHER_RATIO)
+    for t in range(1, n_teachers + 1):
+        yield {"teacher_id": t, **_person(rng, t)}
+    for s in range(1, n_members - n_teachers + 1):
+        record = {"student_id": s, **_person(rng, s)}
+        record["groupe"] = (s - 1) // GROUP_SIZE + 1
+        record["subscription_status"] = "Paid" if rng.random() < 0.7 else "Unpaid"
+        yield record
+
+
+def iter_events(n_members: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed + 1)
+    n_teachers = max(1, n_members // TEACHER_RATIO)
+    n_students = max(1, n_members - n_teachers)
+    for e in range(1, max(1, n_members // EVENT_RATIO) + 1):
+        kind = rng.choice(EVENT_KINDS)
+        # Participants pris dans quelques groupes voisins, comme une vraie sortie.
+        first = rng.randrange(n_students)
+        participants = sorted({(first + rng.randrange(3 * GROUP_SIZE)) % n_students + 1 for _ in range(rng.randint(5, 30))})
+        yield {
+            "event_name": f"{kind} #{e}",
+            "description": f"{kind} ({rng.choice(ADDRESSES)})",
+            "event_date": _day(rng, 300),
+            "organizer_ids": rng.sample(range(1, n_teachers + 1), min(n_teachers, rng.randint(1, 3))),
+            "participant_ids": participants,
+        }
+
+
+def iter_subscriptions(n_members: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed + 2)
+    n_students = max(1, n_members - max(1, n_members // TEACHER_RATIO))
+    for s in range(1, n_students + 1):
+        for _ in range(rng.choice((1, 1, 1, 2))):
+            status = "paid" if rng.random() < 0.7 else "unpaid"
+            if rng.random() < 0.7:
+                yield {
+                    "student_id": s, "amount": rng.choice((1500, 1800, 2000, 2500)), "date": _day(rng),
+                    "status": status, "kind": "monthly", "months": rng.randint(1, 3),
+                }
+            else:
+                yield {
+                    "student_id": s, "amount": rng.choice((15000, 18000, 20000)), "date": _day(rng),
+                    "status": status, "kind": "annual", "year": 2025, "discount_rate": 0.10,
+                }
+
+
+def iter_donations(n_members: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed + 3)
+    for d in range(max(1, n_members // DONATION_RATIO)):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "donor_name": f"{first} {last}",
+            "source": rng.choice(DONATION_SOURCES),
+            "amount": rng.choice((500, 1000, 2000, 5000, 12000)),
+            "date": _day(rng),
+            "purpose": rng.choice(DONATION_PURPOSES),
+            "note": "",
+        }
+
+
+def _write_array(fh: IO[str], records: Iterable[Dict[str, Any]]) -> int:
+    # Écrit le tableau enregistrement par enregistrement : 10M membres ne tiennent pas en mémoire.
+    count = 0
+    fh.write("[")
+    for r in records:
+        fh.write(",\n  " if count else "\n  ")
+        fh.write(json.dumps(r, ensure_ascii=False))
+        count += 1
+    fh.write("\n]\n")
+    return count
+
+
+def generate(out_dir: Path, n_members: int, seed: int = 0) -> Dict[str, int]:
+    """Écrit members/events/subscriptions/donations.json dans ``out_dir``."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    counts: Dict[str, int] = {}
+    for name, records in (
+        ("members", iter_members(n_members, seed)),
+        ("events", iter_events(n_members, seed)),
+        ("subscriptions", iter_subscriptions(n_members, seed)),
+        ("donations", iter_donations(n_members, seed)),
+    ):
+        tmp = out_dir / f"{name}.json.tmp"
+        with tmp.open("w", encoding="utf-8") as fh:
+            counts[name] = _write_array(fh, records)
+        tmp.replace(out_dir / f"{name}.json")
+    (out_dir / "counts.json").write_text(json.dumps(counts), encoding="utf-8")
+    return counts
+
+
+def ensure_dataset(cache_dir: Path, n_members: int, seed: int = 0) -> Path:
+    """Jeu de données en cache (``<cache>/<taille>-s<seed>``), généré au besoin."""
+    out_dir = Path(cache_dir) / f"{size_label(n_members)}-s{seed}"
+    if not (out_dir / "counts.json").exists():
+        generate(out_dir, n_members, seed)
+    return out_dir
@@ -3,6 +3,10 @@ from abc import ABC, abstractmethod
 from typing import Any, List, Dict
 
 
+# Les quatre collections du projet, dans l'ordre de chargement (load_<nom>, iter_<nom>, stamp(nom)).
+COLLECTIONS = ("members", "events", "subscriptions", "donations")
+
+
 class StorageInterface(ABC):
     @abstractmethod
     def load_members(self) -> List[Dict[str, Any]]:
@@ -1,37 +1,188 @@
 from __future__ import annotations
+import argparse
+import os
+import threading
+import webbrowser
 from pathlib import Path
-from typing import Any, Dict
-from ui.web_ui import WebUI
+from typing import Any, Dict, List, Optional
 
 
-from interfaces.storage_interface import StorageInterface
+from interfaces.storage_interface import COLLECTIONS, StorageInterface
 from interfaces.ui_interface import UIInterface
+from storage.concurrent_storage import ConcurrentStorage
+from storage.data_watcher import DataWatcher
 from storage.json_storage import JSONStorage
+from storage.snapshot_storage import SnapshotStorage
+from ui.dashboard_pipeline import DashboardPipeline
+from ui.paged_web_ui import PagedWebUI
+from ui.server_ui import ServerUI
+from ui.virtual_web_ui import VirtualWebUI
 from ui.web_ui import WebUI
+from utils.artifacts import ArtifactPipeline
+from utils.instrumentation import metrics
+from utils.memory_budget import MemoryBudget, estimate_load_bytes, parse_bytes
+
+
+def load_project(storage: StorageInterface) -> Dict[str, Any]:
+    return {name: getattr(storage, f"load_{name}")() for name in COLLECTIONS}
+
+
+def stream_project(storage: StorageInterface) -> Dict[str, Any]:
+    # Itérateurs paresseux (iter_*) quand le stockage les fournit, sinon listes.
+    project: Dict[str, Any] = {}
+    for name in COLLECTIONS:
+        loader = getattr(storage, f"iter_{name}", None) or getattr(storage, f"load_{name}")
+        project[name] = loader()
+    return project
+
 
+def run_application(
+    storage: StorageInterface,
+    ui: UIInterface,
+    stream: bool = False,
+    concurrent: bool = False,
+    budget: Optional[MemoryBudget] = None,
+) -> None:
+    if budget is not None and not stream:
+        # Trop gros pour être chargé en entier : lecture au fil de l'eau (iter_*).
+        estimate = estimate_load_bytes(storage, COLLECTIONS)
+        if estimate is not None and budget.would_exceed(estimate):
+            budget.switch("load", f"~{estimate} octets prévus au chargement")
+            stream = True
+    if stream:
+        project = stream_project(storage)
+    elif concurrent:
+        # Chargement en arrière-plan : son temps se retrouve dans les étapes de l'UI.
+        with ConcurrentStorage(storage) as loader, metrics.stage("dashboard"):
+            ui.show_dashboard(loader.project())
+        return
+    else:
+        with metrics.stage("load") as st:
+            project = load_project(storage)
+            st.add_rows(sum(len(records) for records in project.values()))
+    with metrics.stage("dashboard"):
+        ui.show_dashboard(project)
 
-def run_application(storage: StorageInterface, ui: UIInterface) -> None:
-    members = storage.load_members()
-    events = storage.load_events()
-    subscriptions = storage.load_subscriptions()
-    donations = storage.load_donations()
 
-    project: Dict[str, Any] = {
-        "members": members,
-        "events": events,
-        "subscriptions": subscriptions,
-        "donations": donations,
-    }
+def _write_atomic(out_file: Path, html: str) -> None:
+    # Le navigateur ne doit jamais recharger un fichier à moitié écrit.
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_file.with_suffix(out_file.suffix + ".tmp")
+    tmp.write_text(html, encoding="utf-8")
+    os.replace(tmp, out_file)
 
-    ui.show_dashboard(project)
+
+def publish_artifacts(artifacts: ArtifactPipeline, out_file: Path) -> List[str]:
+    with metrics.stage("publish_artifacts"):
+        artifacts.publish(out_file)
+        return artifacts.write_manifest()
+
+
+def watch_application(
+    storage: StorageInterface,
+    out_file: Path,
+    watcher: DataWatcher,
+    stop: Optional[threading.Event] = None,
+    open_browser: bool = True,
+    artifacts: Optional[ArtifactPipeline] = None,
+) -> DashboardPipeline:
+    """Génère le tableau de bord puis le régénère à chaque lot de modifications
+    de ``data/`` : seules les collections modifiées sont relues et seuls les
+    onglets qui en dépendent sont re-rendus."""
+    pipeline = DashboardPipeline()
+    pipeline.update_project(load_project(storage))
+    _write_atomic(out_file, pipeline.render())
+    if artifacts is not None:
+        publish_artifacts(artifacts, out_file)
+    if open_browser:
+        try:
+            webbrowser.open(out_file.resolve().as_uri())
+        except Exception:
+            pass
+    print(f"Surveillance de {', '.join(COLLECTIONS)} (Ctrl+C pour arrêter)")
+    try:
+        while True:
+            changed = watcher.wait(stop)
+            if not changed:
+                break
+            for name in COLLECTIONS:
+                if name in changed:
+                    pipeline.update(name, getattr(storage, f"load_{name}")())
+            _write_atomic(out_file, pipeline.render())
+            if artifacts is not None:
+                publish_artifacts(artifacts, out_file)
+            print(f"Modifié : {', '.join(sorted(changed))} -> recalculé : {', '.join(pipeline.last_computed)}")
+            if "subscriptions" in changed:
+                arrears = pipeline.arrears()
+                print(f"Impayés : {len(arrears)} étudiant(s), {sum(owed for _sid, owed in arrears):.2f}")
+    except KeyboardInterrupt:
+        pass
+    return pipeline
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère le tableau de bord Madrassa.")
+    parser.add_argument("--stream", action="store_true", help="écrit le HTML au fil de la lecture des données")
+    parser.add_argument("--concurrent", action="store_true", help="charge les quatre collections en parallèle")
+    parser.add_argument("--workers", type=int, default=1, help="processus de rendu (0 = un par cœur, 1 = série)")
+    parser.add_argument("--virtual", action="store_true", help="lignes en JSON rendues par le navigateur (gros effectifs)")
+    parser.add_argument("--paged", action="store_true", help="un index et des pages statiques par onglet dans site/pages/")
+    parser.add_argument("--page-size", type=int, default=500, help="lignes par page avec --paged")
+    parser.add_argument("--serve", action="store_true", help="sert le tableau de bord en HTTP au lieu d'écrire le fichier")
+    parser.add_argument("--host", default="127.0.0.1", help="adresse d'écoute avec --serve")
+    parser.add_argument("--port", type=int, default=8000, help="port d'écoute avec --serve")
+    parser.add_argument("--watch", action="store_true", help="régénère le tableau de bord à chaque modification de data/")
+    parser.add_argument("--debounce", type=float, default=0.3, help="secondes de calme avant de régénérer avec --watch")
+    parser.add_argument("--artifacts", type=Path, help="copie déployable dans ce dossier : assets hachés, .gz/.br, manifest.json")
+    parser.add_argument("--metrics", type=Path, help="écrit les mesures par étape (JSON, ou Prometheus si .prom)")
+    parser.add_argument("--memory-budget", type=parse_bytes, help="ex: 512M ; passe en mode flux plutôt que de dépasser")
+    parser.add_argument("--memory-profile", action="store_true", help="pic tracemalloc et principaux sites d'allocation par étape")
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.enable()
+    budget: Optional[MemoryBudget] = None
+    if args.memory_budget or args.memory_profile:
+        budget = MemoryBudget(args.memory_budget, top=10 if args.memory_profile else 0)
+        budget.start()
+        metrics.attach_memory(budget)
+
     base_dir = Path(__file__).parent
     data_dir = base_dir / "data"
     out_file = base_dir / "site" / "madrassa.html"
 
-    storage: StorageInterface = JSONStorage(data_dir)
-    ui: UIInterface = WebUI(out_file)
-
-    run_application(storage, ui)
+    artifacts = ArtifactPipeline(args.artifacts) if args.artifacts else None
+    json_storage = JSONStorage(data_dir)
+    storage: StorageInterface = json_storage if args.stream else SnapshotStorage(json_storage, data_dir)
+    if args.watch:
+        watcher = DataWatcher(json_storage.stamp, debounce=args.debounce)
+        watch_application(storage, out_file, watcher, artifacts=artifacts)
+    elif args.serve:
+        # Le serveur garde les données en mémoire et relit lui-même ce qui change.
+        ui: UIInterface = ServerUI(storage, host=args.host, port=args.port)
+        run_application(storage, ui, concurrent=args.concurrent)
+    elif args.virtual:
+        ui = VirtualWebUI(out_file)
+        run_application(storage, ui, concurrent=args.concurrent)
+    elif args.paged:
+        ui = PagedWebUI(out_file.parent / "pages", page_size=args.page_size)
+        run_application(storage, ui, concurrent=args.concurrent)
+    else:
+        ui = WebUI(out_file, streaming=args.stream, workers=args.workers, budget=budget)
+        run_application(storage, ui, stream=args.stream, concurrent=args.concurrent, budget=budget)
+    if artifacts is not None and not (args.watch or args.serve):
+        written = publish_artifacts(artifacts, out_file)
+        print(f"Artefacts : {args.artifacts} ({', '.join(written) or 'inchangés'})")
+    if args.metrics:
+        metrics.write(args.metrics)
+    if budget is not None:
+        report = budget.to_dict()
+        print(f"Pic mémoire (tracemalloc) : {report['peak_bytes'] / 2**20:.1f} Mo")
+        for switch in report["switches"]:
+            print(f"Budget : mode flux à l'étape {switch['stage']} ({switch['reason']})")
+        if args.memory_profile:
+            for name, stage in report["stages"].items():
+                if stage["top_sites"]:
+                    print(f"Étape {name} : pic +{stage['peak_increase_bytes'] / 2**20:.1f} Mo")
+                    for site in stage["top_sites"]:
+                        print(f"  {site['bytes'] / 2**10:10.1f} Ko  {site['blocks']:8d} blocs  {site['site']}")
+        budget.stop()
@@ -14,7 +14,7 @@ class EventManager:
                 "description": e.description,
                 "event_date": e.event_date.isoformat(),
                 # On stocke des IDs simples pour rester sérialisable
-                "organizer_ids": [getattr(o, "teacher_id", None) for o in e.organizers],
-                "participant_ids": [getattr(s, "student_id", None) for s in e.participants],
+                "organizer_ids": e.organizers.ids("teacher_id"),
+                "participant_ids": e.participants.ids("student_id"),
             })
         self._storage.save_events(payload)
@@ -0,0 +1,223 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np  # optionnel : pip install numpy
+except ImportError:
+    np = None
+
+from models.annual_subscription import AnnualSubscription
+from models.monthly_subscription import MonthlySubscription
+
+
+KIND_BASE, KIND_MONTHLY, KIND_ANNUAL = 0, 1, 2
+KIND_LABELS = ("base", "monthly", "annual")
+_KIND_CODES = {"monthly": KIND_MONTHLY, "annual": KIND_ANNUAL}
+_NO_STUDENT = -1
+
+
+def _date_str(value: Any) -> str:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return "" if value is None else str(value)
+
+
+def _int_or(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _group_sum(keys: np.ndarray, values: np.ndarray) -> Dict[Any, float]:
+    if keys.size == 0:
+        return {}
+    labels, inverse = np.unique(keys, return_inverse=True)
+    sums = np.bincount(inverse, weights=values, minlength=labels.size)
+    return {label.item(): float(total) for label, total in zip(labels, sums)}
+
+
+class FinanceAnalytics:
+    """Abonnements et dons chargés une fois dans des tableaux NumPy.
+
+    ``due`` suit ``total_amount()`` des modèles : montant × ``months`` pour un
+    abonnement mensuel, montant × 12 × (1 - ``discount_rate``) pour un annuel,
+    montant brut sinon. ``amount`` garde le montant saisi (celui du tableau de bord).
+    """
+
+    def __init__(
+        self,
+        student_ids: np.ndarray,
+        amounts: np.ndarray,
+        due: np.ndarray,
+        kinds: np.ndarray,
+        paid: np.ndarray,
+        months: np.ndarray,
+        don_amounts: np.ndarray,
+        don_months: np.ndarray,
+        don_sources: np.ndarray,
+        don_purposes: np.ndarray,
+    ) -> None:
+        self.student_ids = student_ids
+        self.amounts = amounts
+        self.due = due
+        self.kinds = kinds
+        self.paid = paid
+        self.months = months
+        self.don_amounts = don_amounts
+        self.don_months = don_months
+        self.don_sources = don_sources
+        self.don_purposes = don_purposes
+
+    @classmethod
+    def from_records(
+        cls,
+        subscriptions: Iterable[Dict[str, Any]],
+        donations: Iterable[Dict[str, Any]] = (),
+    ) -> "FinanceAnalytics":
+        sids: List[int] = []
+        amounts: List[float] = []
+        kinds: List[int] = []
+        n_months: List[int] = []
+        discounts: List[float] = []
+        statuses: List[str] = []
+        dates: List[str] = []
+        for sub in subscriptions:
+            sids.append(_int_or(sub.get("student_id"), _NO_STUDENT))
+            amounts.append(float(sub.get("amount", 0.0)))
+            kinds.append(_KIND_CODES.get(str(sub.get("kind", "base")).lower(), KIND_BASE))
+            n_months.append(_int_or(sub.get("months", 1), 1))
+            discounts.append(float(sub.get("discount_rate", 0.10)))
+            statuses.append(str(sub.get("status", "unpaid")))
+            dates.append(_date_str(sub.get("date")))
+        don = cls._donation_columns(donations)
+        return cls._build(sids, amounts, kinds, n_months, discounts, statuses, dates, *don)
+
+    @classmethod
+    def from_models(cls, subscriptions: Iterable[Any], donations: Iterable[Any] = ()) -> "FinanceAnalytics":
+        sids: List[int] = []
+        amounts: List[float] = []
+        kinds: List[int] = []
+        n_months: List[int] = []
+        discounts: List[float] = []
+        statuses: List[str] = []
+        dates: List[str] = []
+        for sub in subscriptions:
+            sids.append(_int_or(sub.student_id, _NO_STUDENT))
+            amounts.append(float(sub.amount))
+            if isinstance(sub, MonthlySubscription):
+                kinds.append(KIND_MONTHLY)
+            elif isinstance(sub, AnnualSubscription):
+                kinds.append(KIND_ANNUAL)
+            else:
+                kinds.append(KIND_BASE)
+            n_months.append(getattr(sub, "months", 1))
+            discounts.append(getattr(sub, "discount_rate", 0.10))
+            statuses.append(sub.status)
+            dates.append(_date_str(sub.date))
+        records = (
+            {"amount": d.amount, "date": d.date, "source": getattr(d, "source", ""), "purpose": getattr(d, "purpose", "")}
+            for d in donations
+        )
+        don = cls._donation_columns(records)
+        return cls._build(sids, amounts, kinds, n_months, discounts, statuses, dates, *don)
+
+    @staticmethod
+    def _donation_columns(donations: Iterable[Dict[str, Any]]) -> Tuple[List[float], List[str], List[str], List[str]]:
+        amounts: List[float] = []
+        dates: List[str] = []
+        sources: List[str] = []
+        purposes: List[str] = []
+        for d in donations:
+            amounts.append(float(d.get("amount", 0.0)))
+            dates.append(_date_str(d.get("date")))
+            sources.append(str(d.get("source", "") or ""))
+            purposes.append(str(d.get("purpose", "") or ""))
+        return amounts, dates, sources, purposes
+
+    @classmethod
+    def _build(
+        cls,
+        sids: List[int],
+        amounts: List[float],
+        kinds: List[int],
+        n_months: List[int],
+        discounts: List[float],
+        statuses: List[str],
+        dates: List[str],
+        don_amounts: List[float],
+        don_dates: List[str],
+        don_sources: List[str],
+        don_purposes: List[str],
+    ) -> "FinanceAnalytics":
+        if np is None:
+            raise RuntimeError("numpy n'est pas installé (pip install numpy) : requis par FinanceAnalytics")
+        amount_arr = np.asarray(amounts, dtype=np.float64)
+        kind_arr = np.asarray(kinds, dtype=np.int8)
+        due = np.select(
+            [kind_arr == KIND_MONTHLY, kind_arr == KIND_ANNUAL],
+            [
+                amount_arr * np.asarray(n_months, dtype=np.float64),
+                amount_arr * 12 * (1 - np.asarray(discounts, dtype=np.float64)),
+            ],
+            default=amount_arr,
+        )
+        paid = np.char.lower(np.asarray(statuses, dtype=str)) == "paid" if statuses else np.zeros(0, dtype=bool)
+        return cls(
+            student_ids=np.asarray(sids, dtype=np.int64),
+            amounts=amount_arr,
+            due=due,
+            kinds=kind_arr,
+            paid=np.asarray(paid, dtype=bool),
+            # « AAAA-MM-JJ » tronqué à « AAAA-MM » : clé de mois sans parser les dates.
+            months=np.asarray(dates, dtype="U7"),
+            don_amounts=np.asarray(don_amounts, dtype=np.float64),
+            don_months=np.asarray(don_dates, dtype="U7"),
+            don_sources=np.asarray(don_sources, dtype=str),
+            don_purposes=np.asarray(don_purposes, dtype=str),
+        )
+
+    def _values(self, value: str) -> np.ndarray:
+        if value == "due":
+            return self.due
+        if value == "amount":
+            return self.amounts
+        raise ValueError(f"unknown value column: {value!r}")
+
+    def totals(self, value: str = "due") -> Dict[str, float]:
+        v = self._values(value)
+        return {
+            "expected": float(v.sum()),
+            "paid": float(v[self.paid].sum()),
+            "unpaid": float(v[~self.paid].sum()),
+            "donations": float(self.don_amounts.sum()),
+        }
+
+    def by_month(self, value: str = "due") -> Dict[str, Dict[str, float]]:
+        v = self._values(value)
+        return {
+            "expected": _group_sum(self.months, v),
+            "paid": _group_sum(self.months[self.paid], v[self.paid]),
+            "unpaid": _group_sum(self.months[~self.paid], v[~self.paid]),
+        }
+
+    def by_kind(self, value: str = "due") -> Dict[str, float]:
+        sums = np.bincount(self.kinds, weights=self._values(value), minlength=len(KIND_LABELS))
+        return {label: float(sums[i]) for i, label in enumerate(KIND_LABELS)}
+
+    def by_status(self, value: str = "due") -> Dict[str, float]:
+        v = self._values(value)
+        return {"paid": float(v[self.paid].sum()), "unpaid": float(v[~self.paid].sum())}
+
+    def outstanding_by_student(self) -> Dict[int, float]:
+        mask = ~self.paid & (self.student_ids != _NO_STUDENT)
+        return _group_sum(self.student_ids[mask], self.due[mask])
+
+    def donations_by_source(self) -> Dict[str, float]:
+        return _group_sum(self.don_sources, self.don_amounts)
+
+    def donations_by_purpose(self) -> Dict[str, float]:
+        return _group_sum(self.don_purposes, self.don_amounts)
+
+    def donations_by_month(self) -> Dict[str, float]:
+        return _group_sum(self.don_months, self.don_amounts)
@@ -1,5 +1,7 @@
-from typing import Iterable
+from typing import Any, Dict, Iterable
 from interfaces.payable import Payable
+from managers.finance_analytics import FinanceAnalytics, np
+from models.subscription import Subscription
 
 class FinanceManager:
     def total_payments(self, items: Iterable[Payable]) -> float:
@@ -8,3 +10,19 @@ class FinanceManager:
             if hasattr(it, "amount"):
                 total += it.amount
         return total
+
+    def totals(self, subscriptions: Iterable[Subscription], donations: Iterable[Any] = ()) -> Dict[str, float]:
+        """Attendu / payé / impayé selon ``total_amount()``, plus le total des dons.
+
+        Calculé par FinanceAnalytics (NumPy) s'il est installé, sinon en Python.
+        """
+        if np is not None:
+            return FinanceAnalytics.from_models(subscriptions, donations).totals()
+        totals = {"expected": 0.0, "paid": 0.0, "unpaid": 0.0, "donations": 0.0}
+        for sub in subscriptions:
+            due = sub.total_amount()
+            totals["expected"] += due
+            totals["paid" if str(sub.status).lower() == "paid" else "unpaid"] += due
+        for d in donations:
+            totals["donations"] += d.amount
+        return totals
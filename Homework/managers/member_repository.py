@@ -1,5 +1,7 @@
+from dataclasses import asdict
 from typing import List
 from models.member import Member
+from models.member_store import MemberStore
 from interfaces.storage import Storage
 
 class MemberRepository:
@@ -7,9 +9,16 @@ class MemberRepository:
         self._storage = storage
 
     def save_all(self, members: List[Member]) -> None:
-        data = [m.__dict__ for m in members]
+        data = [asdict(m) for m in members]
         self._storage.save_members(data)
 
     def load_all(self) -> List[Member]:
         records = self._storage.load_members()
         return [Member(**r) for r in records]
+
+    def load_store(self) -> MemberStore:
+        # Version compacte (colonnes) pour les gros volumes : pas d'objet par membre.
+        return MemberStore.from_records(self._storage.load_members())
+
+    def save_store(self, store: MemberStore) -> None:
+        self._storage.save_members(list(store.iter_dicts()))
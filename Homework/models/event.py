@@ -1,22 +1,48 @@
 from dataclasses import dataclass, field
 from datetime import date
-from typing import List
+from typing import Iterable
+
+from .observable import Observable
+from .participant_set import ParticipantSet
 
 @dataclass
-class Event:
+class Event(Observable):
     event_name: str
     description: str
     event_date: date
-    organizers: List['Teacher'] = field(default_factory=list)
-    participants: List['Student'] = field(default_factory=list)
+    organizers: ParticipantSet = field(default_factory=ParticipantSet)
+    participants: ParticipantSet = field(default_factory=ParticipantSet)
+
+    def __post_init__(self) -> None:
+        # Accepte encore des listes en entrée (Event(..., participants=[...])).
+        if not isinstance(self.organizers, ParticipantSet):
+            self.organizers = ParticipantSet(self.organizers)
+        if not isinstance(self.participants, ParticipantSet):
+            self.participants = ParticipantSet(self.participants)
 
     def display(self) -> str:
         return f"{self.event_name} | {self.event_date.isoformat()}"
 
     def add_participant(self, s: 'Student') -> None:
-        if s not in self.participants:
-            self.participants.append(s)
+        if self.participants.add(s):
+            self._notify("add_participant", s)
 
     def remove_participant(self, s: 'Student') -> None:
-        if s in self.participants:
-            self.participants.remove(s)
+        if self.participants.discard(s):
+            self._notify("remove_participant", s)
+
+    def add_participants(self, students: Iterable['Student']) -> None:
+        for s in students:
+            self.add_participant(s)
+
+    def remove_participants(self, students: Iterable['Student']) -> None:
+        for s in students:
+            self.remove_participant(s)
+
+    def add_organizer(self, t: 'Teacher') -> None:
+        if self.organizers.add(t):
+            self._notify("add_organizer", t)
+
+    def remove_organizer(self, t: 'Teacher') -> None:
+        if self.organizers.discard(t):
+            self._notify("remove_organizer", t)
@@ -2,8 +2,10 @@ from dataclasses import dataclass, field
 from datetime import date
 from typing import List, Optional
 
-@dataclass
-class Member:
+from .observable import Observable
+
+@dataclass(slots=True)
+class Member(Observable):
     full_name: str
     email: str
     phone: str
@@ -19,11 +21,13 @@ class Member:
         s = skill.strip()
         if s and s not in self.skills:
             self.skills.append(s)
+            self._notify("add_skill", s)
 
     def add_interest(self, interest: str) -> None:
         i = interest.strip()
         if i and i not in self.interests:
             self.interests.append(i)
+            self._notify("add_interest", i)
 
     def update_contact(self, email: Optional[str] = None, phone: Optional[str] = None, address: Optional[str] = None) -> None:
         if email is not None:
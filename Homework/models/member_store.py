@@ -0,0 +1,262 @@
+from __future__ import annotations
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union, overload
+
+
+STUDENT, TEACHER, OTHER = 0, 1, 2
+
+_COMMON_FIELDS = ("full_name", "email", "phone", "address", "join_date")
+_STUDENT_FIELDS = ("student_id", *_COMMON_FIELDS, "groupe", "subscription_status", "skills", "interests")
+_TEACHER_FIELDS = ("teacher_id", *_COMMON_FIELDS, "skills", "interests")
+_FIELDS_BY_KIND = {
+    STUDENT: frozenset(_STUDENT_FIELDS),
+    TEACHER: frozenset(_TEACHER_FIELDS),
+    OTHER: frozenset(_COMMON_FIELDS),
+}
+
+
+def _intern(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(_intern(v) for v in value)
+    return value
+
+
+class _InternedColumn:
+    """Colonne dictionnaire : chaque valeur distincte n'est stockée qu'une fois,
+    chaque ligne ne garde qu'un code entier (4 octets)."""
+
+    __slots__ = ("values", "_index", "codes")
+
+    def __init__(self) -> None:
+        self.values: List[Any] = []
+        self._index: Dict[Any, int] = {}
+        self.codes = array("I")
+
+    def append(self, value: Any) -> None:
+        value = _intern(value)
+        try:
+            code = self._index.get(value)
+        except TypeError:
+            code = None
+            hashable = False
+        else:
+            hashable = True
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            if hashable:
+                self._index[value] = code
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[self.codes[row]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class MemberRow(Mapping):
+    """Vue légère (deux slots) sur une ligne du ``MemberStore`` ; se lit comme
+    le dict normalisé produit par ``ui.web_ui._split_members`` (les listes de
+    compétences et d'intérêts sont rendues en tuples partagés)."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "MemberStore", row: int) -> None:
+        self._store = store
+        self._row = row
+
+    @property
+    def kind(self) -> int:
+        return self._store._kinds[self._row]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._store._value(self._row, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._store._value(self._row, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store._keys(self._row))
+
+    def __len__(self) -> int:
+        return len(self._store._keys(self._row))
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {k: self[k] for k in self._store._keys(self._row)}
+        for k in ("skills", "interests"):
+            if isinstance(out.get(k), tuple):
+                out[k] = list(out[k])
+        return out
+
+    def __repr__(self) -> str:
+        return f"MemberRow({self.to_dict()!r})"
+
+
+_MISSING = object()
+
+
+class MemberRows(Sequence):
+    """Séquence de vues sur un sous-ensemble de lignes (étudiants ou professeurs).
+
+    Les vues sont créées à la demande ; un indice renvoie un ``MemberRow``, une
+    tranche un autre ``MemberRows``. ``to_dicts()`` copie en dicts simples,
+    pour envoyer des lignes à un autre processus."""
+
+    __slots__ = ("_store", "_rows")
+
+    def __init__(self, store: "MemberStore", rows: array) -> None:
+        self._store = store
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[MemberRow]:
+        store = self._store
+        for i in self._rows:
+            yield MemberRow(store, i)
+
+    @overload
+    def __getitem__(self, index: int) -> MemberRow: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "MemberRows": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[MemberRow, "MemberRows"]:
+        if isinstance(index, slice):
+            return MemberRows(self._store, self._rows[index])
+        return MemberRow(self._store, self._rows[index])
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [MemberRow(self._store, i).to_dict() for i in self._rows]
+
+
+class MemberStore:
+    """Stockage en colonnes des membres : un tableau typé par champ, chaînes
+    répétitives (adresse, statut, groupe, compétences...) internées et codées.
+
+    Remplace une liste de dicts (plusieurs centaines d'octets par membre) par
+    quelques entiers par membre plus les chaînes réellement distinctes.
+    """
+
+    def __init__(self) -> None:
+        self._kinds = array("b")
+        self._ids = array("q")
+        self._odd_ids: Dict[int, Any] = {}
+        self._full_name: List[str] = []
+        self._email: List[str] = []
+        self._phone: List[str] = []
+        self._address = _InternedColumn()
+        self._join_date = _InternedColumn()
+        self._groupe = _InternedColumn()
+        self._status = _InternedColumn()
+        self._skills = _InternedColumn()
+        self._interests = _InternedColumn()
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        self._students = array("I")
+        self._teachers = array("I")
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "MemberStore":
+        store = cls()
+        for r in records:
+            store.append(r)
+        return store
+
+    def append(self, r: Dict[str, Any]) -> int:
+        row = len(self._kinds)
+        if "student_id" in r:
+            kind, raw_id = STUDENT, r["student_id"]
+            self._students.append(row)
+        elif "teacher_id" in r:
+            kind, raw_id = TEACHER, r["teacher_id"]
+            self._teachers.append(row)
+        else:
+            kind, raw_id = OTHER, None
+        self._kinds.append(kind)
+        if type(raw_id) is int and -(2 ** 63) <= raw_id < 2 ** 63:
+            self._ids.append(raw_id)
+        else:
+            self._ids.append(0)
+            self._odd_ids[row] = raw_id
+
+        # Mêmes valeurs par défaut que ui.web_ui._normalize_member.
+        self._full_name.append(r.get("full_name", r.get("name", "")))
+        self._email.append(r.get("email", ""))
+        self._phone.append(r.get("phone", ""))
+        self._address.append(r.get("address", ""))
+        self._join_date.append(r.get("join_date", ""))
+        self._groupe.append(r.get("groupe", "") if kind == STUDENT else "")
+        self._status.append(r.get("subscription_status", "Pending") if kind == STUDENT else "")
+        self._skills.append(r.get("skills", []))
+        self._interests.append(r.get("interests", []))
+
+        fields = _FIELDS_BY_KIND[kind]
+        extras = {k: v for k, v in r.items() if k not in fields}
+        if extras:
+            self._extras[row] = extras
+        return row
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    def __iter__(self) -> Iterator[MemberRow]:
+        for i in range(len(self._kinds)):
+            yield MemberRow(self, i)
+
+    def row(self, index: int) -> MemberRow:
+        if not 0 <= index < len(self._kinds):
+            raise IndexError(index)
+        return MemberRow(self, index)
+
+    def students(self) -> MemberRows:
+        return MemberRows(self, self._students)
+
+    def teachers(self) -> MemberRows:
+        return MemberRows(self, self._teachers)
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        for row in self:
+            yield row.to_dict()
+
+    def _id(self, row: int) -> Any:
+        return self._odd_ids[row] if row in self._odd_ids else self._ids[row]
+
+    def _keys(self, row: int) -> Tuple[str, ...]:
+        kind = self._kinds[row]
+        base = _STUDENT_FIELDS if kind == STUDENT else _TEACHER_FIELDS if kind == TEACHER else _COMMON_FIELDS
+        extras = self._extras.get(row)
+        return base + tuple(extras) if extras else base
+
+    def _value(self, row: int, key: str, default: Any) -> Any:
+        kind = self._kinds[row]
+        if key not in _FIELDS_BY_KIND[kind]:
+            extras = self._extras.get(row)
+            return extras.get(key, default) if extras else default
+        if key == "full_name":
+            return self._full_name[row]
+        if key == "email":
+            return self._email[row]
+        if key == "phone":
+            return self._phone[row]
+        if key == "address":
+            return self._address[row]
+        if key == "join_date":
+            return self._join_date[row]
+        if key in ("student_id", "teacher_id"):
+            return self._id(row)
+        if key == "groupe":
+            return self._groupe[row]
+        if key == "subscription_status":
+            return self._status[row]
+        if key == "skills":
+            return self._skills[row]
+        return self._interests[row]
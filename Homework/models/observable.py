@@ -0,0 +1,51 @@
+from __future__ import annotations
+import weakref
+from typing import Any, Callable, ClassVar, List
+
+
+Callback = Callable[[Any, str, Any], None]
+
+
+def _ref(callback: Callback) -> Callable[[], Any]:
+    # Méthode liée (index.track()) : référence faible, un index abandonné sans
+    # untrack() est libéré et cesse d'être prévenu. Fonction simple : gardée
+    # telle quelle (une lambda passée en argument n'a pas d'autre référence).
+    if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+        return weakref.WeakMethod(callback)
+    return lambda: callback
+
+
+class Observable:
+    """Abonnés de classe prévenus à chaque changement effectif : (objet, action, valeur).
+
+    Chaque sous-classe directe a sa propre liste, partagée avec ses sous-classes
+    (``Member.subscribe`` reçoit aussi les ``Student`` et ``Teacher``).
+    """
+
+    __slots__ = ()
+
+    _observers: ClassVar[List[Callable[[], Any]]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if Observable in cls.__bases__:
+            cls._observers = []
+
+    @classmethod
+    def subscribe(cls, callback: Callback) -> None:
+        cls._observers.append(_ref(callback))
+
+    @classmethod
+    def unsubscribe(cls, callback: Callback) -> None:
+        cls._observers[:] = [r for r in cls._observers if r() is not None and r() != callback]
+
+    def _notify(self, action: str, value: Any) -> None:
+        dead = False
+        for ref in tuple(self._observers):
+            callback = ref()
+            if callback is None:
+                dead = True
+            else:
+                callback(self, action, value)
+        if dead:
+            self._observers[:] = [r for r in self._observers if r() is not None]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from typing import Any, Dict, Hashable, Iterable, Iterator, List
+
+
+def member_key(member: Any) -> Hashable:
+    # student_id / teacher_id quand ils sont renseignés (0 = valeur par défaut
+    # des modèles, donc "non attribué") ; sinon l'identité de l'objet.
+    sid = getattr(member, "student_id", None)
+    if sid:
+        return ("student", sid)
+    tid = getattr(member, "teacher_id", None)
+    if tid:
+        return ("teacher", tid)
+    return ("object", id(member))
+
+
+class ParticipantSet:
+    """Collection ordonnée (ordre d'insertion) indexée par ``member_key`` :
+    ajout, retrait et test d'appartenance en O(1), contre O(n) pour une liste.
+
+    C'est un ensemble, pas une liste : un membre déjà présent n'est pas ajouté
+    une seconde fois et il n'y a pas d'accès par indice (itérer, ou ``list()``).
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, members: Iterable[Any] = ()) -> None:
+        self._items: Dict[Hashable, Any] = {}
+        for m in members:
+            self.add(m)
+
+    def add(self, member: Any) -> bool:
+        key = member_key(member)
+        if key in self._items:
+            return False
+        self._items[key] = member
+        return True
+
+    def discard(self, member: Any) -> bool:
+        return self._items.pop(member_key(member), None) is not None
+
+    # Compatibilité avec l'ancienne liste.
+    def append(self, member: Any) -> None:
+        self.add(member)
+
+    def remove(self, member: Any) -> None:
+        if not self.discard(member):
+            raise ValueError(f"{member!r} not in participants")
+
+    def ids(self, attr: str) -> List[Any]:
+        return [getattr(m, attr, None) for m in self._items.values()]
+
+    def __contains__(self, member: Any) -> bool:
+        return member_key(member) in self._items
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ParticipantSet):
+            return list(self._items.values()) == list(other._items.values())
+        if isinstance(other, list):
+            return list(self._items.values()) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ParticipantSet({list(self._items.values())!r})"
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import date
 from .member import Member
 
-@dataclass
+@dataclass(slots=True)
 class Student(Member):
     student_id: int = 0
     groupe: int = 0
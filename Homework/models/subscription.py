@@ -2,16 +2,27 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date
 
+from .observable import Observable
+
 
 @dataclass
-class Subscription:
+class Subscription(Observable):
     student_id: int
     amount: float
     date: date
     status: str = "unpaid"
 
+    def total_amount(self) -> float:
+        return self.amount
+
     def mark_paid(self) -> None:
+        old = self.status
         self.status = "paid"
+        if old != self.status:
+            self._notify("mark_paid", old)
 
     def mark_unpaid(self) -> None:
+        old = self.status
         self.status = "unpaid"
+        if old != self.status:
+            self._notify("mark_unpaid", old)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 from .member import Member
 
+if TYPE_CHECKING:
+    from services.group_roster import GroupRoster
 
-@dataclass
+
+@dataclass(slots=True)
 class Teacher(Member):
     teacher_id: int = 0
 
@@ -12,10 +16,13 @@ class Teacher(Member):
         return f"Teacher #{self.teacher_id} | {self.full_name}"
 
 
-    def display_group(self) -> str:
-        return f"Groups of {self.full_name}"
+    def display_group(self, roster: "GroupRoster") -> str:
+        groups = ", ".join(roster.groups_of_teacher(self.full_name)) or "-"
+        return f"Groups of {self.full_name}: {groups}"
 
 
-    def assign_group(self, student: "Student") -> None:
-        # kept simple – actual grouping logic can live in a GroupManager later
-        _ = student
\ No newline at end of file
+    def link_student_group(self, student: "Student", roster: "GroupRoster") -> None:
+        # Rattache le professeur au groupe actuel de l'étudiant (sans le changer).
+        if roster.group_of(student.full_name) is None:
+            roster.add_student(student.full_name, student.groupe)
+        roster.add_teacher(student.groupe, self.full_name)
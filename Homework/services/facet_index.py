@@ -0,0 +1,181 @@
+# services/facet_index.py
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+from models.member import Member
+
+
+FACETS = ("skills", "interests", "groupe", "subscription_status")
+_MULTI_VALUED = ("skills", "interests")
+
+Terms = Mapping[str, Union[Any, Iterable[Any]]]
+
+
+def _norm(value: Any) -> str:
+    return str(value).strip().casefold()
+
+
+def _values(value: Any) -> List[Any]:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+class FacetIndex:
+    """Index inversé compétences / intérêts / groupe / statut d'abonnement.
+
+    Chaque terme (facette, valeur normalisée) reçoit un id entier et une liste
+    de postings (ensemble d'ids internes de membres). Les requêtes ET / OU /
+    SAUF sont des opérations d'ensembles qui ne touchent que les termes cités.
+    """
+
+    def __init__(self, id_field: str = "student_id") -> None:
+        self._id_field = id_field
+        self._term_ids: Dict[Tuple[str, str], int] = {}
+        self._terms: List[Tuple[str, str]] = []
+        self._labels: List[str] = []
+        self._postings: List[Set[int]] = []
+        self._doc_ids: Dict[Any, int] = {}
+        self._docs: List[Any] = []
+        self._doc_terms: List[Set[int]] = []
+        self._live: Set[int] = set()
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]], id_field: str = "student_id") -> "FacetIndex":
+        index = cls(id_field)
+        for r in records:
+            index.add_record(r)
+        return index
+
+    # -- alimentation -------------------------------------------------------------
+
+    def _term(self, facet: str, value: Any) -> int:
+        key = (facet, _norm(value))
+        term = self._term_ids.get(key)
+        if term is None:
+            term = len(self._terms)
+            self._term_ids[key] = term
+            self._terms.append(key)
+            self._labels.append(str(value).strip())
+            self._postings.append(set())
+        return term
+
+    def _doc(self, member_id: Any) -> int:
+        doc = self._doc_ids.get(member_id)
+        if doc is None:
+            doc = len(self._docs)
+            self._doc_ids[member_id] = doc
+            self._docs.append(member_id)
+            self._doc_terms.append(set())
+        self._live.add(doc)
+        return doc
+
+    def add_term(self, member_id: Any, facet: str, value: Any) -> None:
+        if value is None or value == "":
+            return
+        doc = self._doc(member_id)
+        term = self._term(facet, value)
+        self._postings[term].add(doc)
+        self._doc_terms[doc].add(term)
+
+    def remove_term(self, member_id: Any, facet: str, value: Any) -> None:
+        doc = self._doc_ids.get(member_id)
+        term = self._term_ids.get((facet, _norm(value)))
+        if doc is None or term is None:
+            return
+        self._postings[term].discard(doc)
+        self._doc_terms[doc].discard(term)
+
+    def add_record(self, record: Mapping[str, Any]) -> None:
+        member_id = record.get(self._id_field)
+        if member_id is None:
+            return
+        self._doc(member_id)
+        for facet in FACETS:
+            if facet not in record:
+                continue
+            values = _values(record[facet]) if facet in _MULTI_VALUED else [record[facet]]
+            for v in values:
+                self.add_term(member_id, facet, v)
+
+    def add_member(self, member: Member) -> None:
+        self.add_record({f: getattr(member, f) for f in (self._id_field, *FACETS) if hasattr(member, f)})
+
+    def remove(self, member_id: Any) -> None:
+        doc = self._doc_ids.get(member_id)
+        if doc is None:
+            return
+        for term in self._doc_terms[doc]:
+            self._postings[term].discard(doc)
+        self._doc_terms[doc].clear()
+        self._live.discard(doc)
+
+    def update_record(self, record: Mapping[str, Any]) -> None:
+        self.remove(record.get(self._id_field))
+        self.add_record(record)
+
+    # -- suivi des modèles --------------------------------------------------------
+
+    def _on_member_change(self, member: Member, action: str, value: Any) -> None:
+        member_id = getattr(member, self._id_field, None)
+        if member_id is None:
+            return
+        if action == "add_skill":
+            self.add_term(member_id, "skills", value)
+        elif action == "add_interest":
+            self.add_term(member_id, "interests", value)
+
+    def track(self) -> None:
+        Member.subscribe(self._on_member_change)
+
+    def untrack(self) -> None:
+        Member.unsubscribe(self._on_member_change)
+
+    # -- requêtes ------------------------------------------------------------------
+
+    def _postings_for(self, terms: Terms) -> List[Set[int]]:
+        out: List[Set[int]] = []
+        for facet, value in terms.items():
+            for v in _values(value):
+                term = self._term_ids.get((facet, _norm(v)))
+                out.append(self._postings[term] if term is not None else set())
+        return out
+
+    def search(
+        self,
+        all_of: Optional[Terms] = None,
+        any_of: Optional[Terms] = None,
+        none_of: Optional[Terms] = None,
+    ) -> List[Any]:
+        """Ids des membres ayant tous les termes de ``all_of``, au moins un de
+        ``any_of`` et aucun de ``none_of`` ; ex. ``search(all_of={"skills":
+        "Tajwid", "interests": "Memorisation"})``."""
+        result: Optional[Set[int]] = None
+        if all_of:
+            # Intersection en partant de la plus petite liste.
+            for postings in sorted(self._postings_for(all_of), key=len):
+                result = set(postings) if result is None else result & postings
+                if not result:
+                    return []
+        if any_of:
+            union: Set[int] = set().union(*self._postings_for(any_of))
+            result = union if result is None else result & union
+        if result is None:
+            result = set(self._live)
+        if none_of:
+            result -= set().union(*self._postings_for(none_of))
+        return [self._docs[d] for d in sorted(result)]
+
+    def facet_counts(self, facet: str, member_ids: Optional[Iterable[Any]] = None) -> Dict[str, int]:
+        docs: Optional[Set[int]] = None
+        if member_ids is not None:
+            docs = {self._doc_ids[m] for m in member_ids if m in self._doc_ids}
+        counts: Dict[str, int] = {}
+        for term, (f, _value) in enumerate(self._terms):
+            if f != facet:
+                continue
+            postings = self._postings[term]
+            n = len(postings) if docs is None else len(postings & docs)
+            if n:
+                counts[self._labels[term]] = n
+        return counts
@@ -0,0 +1,128 @@
+# services/group_roster.py
+from __future__ import annotations
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+NO_GROUP = "-"
+
+
+def group_key(groupe: Any) -> str:
+    return str(groupe or NO_GROUP)
+
+
+class GroupRoster:
+    """Groupes -> étudiants et groupes -> professeurs, construits en un passage.
+
+    Les professeurs d'un groupe sont les organisateurs des évènements auxquels
+    participe au moins un de ses étudiants (règle de l'onglet Groups), gardés
+    dans un dict-ensemble ordonné : ordre de première apparition, sans test
+    ``in`` sur une liste.
+    """
+
+    def __init__(self) -> None:
+        self._students: Dict[str, List[str]] = {}
+        self._teachers: Dict[str, Dict[str, None]] = {}
+        self._name_to_group: Dict[str, str] = {}
+
+    @classmethod
+    def from_records(
+        cls,
+        students: Iterable[Dict[str, Any]],
+        events: Iterable[Dict[str, Any]] = (),
+    ) -> "GroupRoster":
+        """``students`` normalisés et ``events`` déjà résolus en noms (``_parse_events``)."""
+        roster = cls()
+        for s in students:
+            roster.add_student(s.get("full_name", ""), s.get("groupe", ""))
+        for e in events:
+            roster.link_event(e.get("organizers", []), e.get("participants", []))
+        return roster
+
+    # -- construction ------------------------------------------------------------
+
+    def add_student(self, name: str, groupe: Any) -> None:
+        if not name:
+            return
+        g = group_key(groupe)
+        self._name_to_group[name] = g
+        self._students.setdefault(g, []).append(name)
+
+    def add_teacher(self, groupe: Any, teacher_name: str) -> None:
+        self._teachers.setdefault(group_key(groupe), {})[teacher_name] = None
+
+    def link_event(self, organizers: Iterable[str], participants: Iterable[str]) -> None:
+        # Groupes touchés d'abord (O(participants)), puis les organisateurs une
+        # fois par groupe : plus de produit participants x organisateurs.
+        groups: Dict[str, None] = {}
+        for p in participants:
+            g = self._name_to_group.get(p)
+            if g:
+                groups[g] = None
+        if not groups:
+            return
+        orgs = list(organizers)
+        for g in groups:
+            bucket = self._teachers.setdefault(g, {})
+            for org in orgs:
+                bucket[org] = None
+
+    # -- lecture -------------------------------------------------------------------
+
+    def group_of(self, student_name: str) -> Optional[str]:
+        return self._name_to_group.get(student_name)
+
+    def groups(self) -> List[str]:
+        return sorted(self._students)
+
+    def students_of(self, groupe: Any) -> List[str]:
+        return list(self._students.get(group_key(groupe), []))
+
+    def teachers_of(self, groupe: Any) -> List[str]:
+        return list(self._teachers.get(group_key(groupe), {}))
+
+    def groups_of_teacher(self, teacher_name: str) -> List[str]:
+        return sorted(g for g, teachers in self._teachers.items() if teacher_name in teachers)
+
+    def rows(self) -> Iterable[Tuple[str, List[str], List[str]]]:
+        for g in self.groups():
+            yield g, self._students[g], list(self._teachers.get(g, {}))
+
+    # -- répartition automatique ---------------------------------------------
+
+    def auto_assign(self, students: Iterable[Any], capacity: int) -> Dict[str, str]:
+        """Place chaque étudiant dans le groupe le moins rempli encore sous
+        ``capacity`` (tas min sur les effectifs) ; ouvre un nouveau groupe quand
+        tous sont pleins. Met à jour ``groupe`` sur les modèles ou les dicts.
+        Le groupe « - » (sans groupe) n'est jamais candidat."""
+        capacity = max(1, capacity)
+        candidates = sorted((g, names) for g, names in self._students.items() if g != NO_GROUP)
+        heap: List[Tuple[int, int, str]] = [(len(names), order, g) for order, (g, names) in enumerate(candidates)]
+        heapq.heapify(heap)
+        numeric = [int(g) for g in self._students if g.isdigit()]
+        next_group = max(numeric, default=0) + 1
+        order = len(heap)
+        placed: Dict[str, str] = {}
+        for s in students:
+            if heap and heap[0][0] < capacity:
+                count, o, g = heapq.heappop(heap)
+            else:
+                count, o, g = 0, order, str(next_group)
+                order += 1
+                next_group += 1
+            name = s.get("full_name", "") if isinstance(s, dict) else s.full_name
+            previous = self._name_to_group.get(name)
+            if previous is not None:
+                # Sorti de son ancien groupe (« - » compris) avant d'être placé.
+                self._students[previous].remove(name)
+                if not self._students[previous]:
+                    del self._students[previous]
+            self.add_student(name, g)
+            value: Any = int(g) if g.isdigit() else g
+            if isinstance(s, dict):
+                s["groupe"] = value
+            else:
+                s.groupe = value
+            placed[name] = g
+            heapq.heappush(heap, (count + 1, o, g))
+        return placed
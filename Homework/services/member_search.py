@@ -0,0 +1,197 @@
+# services/member_search.py
+from __future__ import annotations
+import marshal
+import os
+import unicodedata
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+SEARCH_FIELDS = ("full_name", "email", "phone", "address")
+_FORMAT_VERSION = 1
+# Au-delà, un trigramme trop fréquent (« com » des emails...) n'est plus
+# parcouru pour trouver les candidats ; il sert seulement au classement.
+_CANDIDATE_BUDGET = 100_000
+_RERANK_LIMIT = 200
+
+
+def fold(text: Any) -> str:
+    """Minuscules sans accents, ponctuation -> espaces : « Bouzaréah » -> « bouzareah »."""
+    decomposed = unicodedata.normalize("NFKD", "" if text is None else str(text))
+    out = []
+    for ch in decomposed:
+        if unicodedata.combining(ch):
+            continue
+        out.append(ch if ch.isalnum() else " ")
+    return " ".join("".join(out).casefold().split())
+
+
+def trigrams(folded: str) -> Set[str]:
+    grams: Set[str] = set()
+    for token in folded.split():
+        padded = f" {token} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class MemberSearchIndex:
+    """Recherche approchée (trigrammes) sur nom, email, téléphone et adresse.
+
+    Les postings sont des ``array('I')`` d'ids de documents triés ; le fichier
+    persistant (marshal) se recharge sans reconstruire l'index.
+    """
+
+    def __init__(self) -> None:
+        self._keys: List[Tuple[str, Any]] = []
+        self._fields: Dict[str, List[str]] = {f: [] for f in SEARCH_FIELDS}
+        # Textes déjà repliés, pour classer les candidats sans refaire fold().
+        self._folded: Dict[str, List[str]] = {f: [] for f in SEARCH_FIELDS}
+        self._postings: Dict[str, array] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "MemberSearchIndex":
+        index = cls()
+        for r in records:
+            index.add(r)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        if "student_id" in record:
+            key: Tuple[str, Any] = ("student_id", record["student_id"])
+        elif "teacher_id" in record:
+            key = ("teacher_id", record["teacher_id"])
+        else:
+            return
+        doc = len(self._keys)
+        self._keys.append(key)
+        grams: Set[str] = set()
+        for f in SEARCH_FIELDS:
+            # Même repli que _split_members pour le nom.
+            value = record.get(f, record.get("name", "")) if f == "full_name" else record.get(f, "")
+            text = "" if value is None else str(value)
+            folded = fold(text)
+            self._fields[f].append(text)
+            self._folded[f].append(folded)
+            grams |= trigrams(folded)
+        for g in grams:
+            postings = self._postings.get(g)
+            if postings is None:
+                postings = self._postings[g] = array("I")
+            postings.append(doc)
+
+    # -- recherche -----------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.3) -> List[Dict[str, Any]]:
+        q = fold(query)
+        q_grams = trigrams(q)
+        if not q_grams:
+            return []
+        known = sorted((g for g in q_grams if g in self._postings), key=lambda g: len(self._postings[g]))
+        if not known:
+            return []
+
+        hits: Counter = Counter()
+        spent = 0
+        for i, g in enumerate(known):
+            postings = self._postings[g]
+            if i and spent + len(postings) > _CANDIDATE_BUDGET:
+                break
+            spent += len(postings)
+            hits.update(postings)
+
+        # Les fautes de frappe font perdre quelques trigrammes : on garde les
+        # documents les mieux couverts, puis on classe sur le texte complet.
+        candidates = [doc for doc, _n in hits.most_common(_RERANK_LIMIT)]
+        scored: List[Tuple[float, int, str]] = []
+        for doc in candidates:
+            score, field = self._score(doc, q, q_grams)
+            if score >= min_score:
+                scored.append((score, doc, field))
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [self._result(doc, score, field) for score, doc, field in scored[:limit]]
+
+    def _score(self, doc: int, q: str, q_grams: Set[str]) -> Tuple[float, str]:
+        best, best_field = 0.0, SEARCH_FIELDS[0]
+        for f in SEARCH_FIELDS:
+            text = self._folded[f][doc]
+            if not text:
+                continue
+            f_grams = trigrams(text)
+            common = len(q_grams & f_grams)
+            # Couverture de la requête (recherche partielle) + Dice pour départager.
+            score = 0.7 * common / len(q_grams) + 0.3 * 2 * common / (len(q_grams) + len(f_grams))
+            if q in text:
+                score += 0.5
+            if score > best:
+                best, best_field = score, f
+        return best, best_field
+
+    def _result(self, doc: int, score: float, field: str) -> Dict[str, Any]:
+        id_field, member_id = self._keys[doc]
+        out: Dict[str, Any] = {id_field: member_id}
+        for f in SEARCH_FIELDS:
+            out[f] = self._fields[f][doc]
+        out["score"] = round(score, 4)
+        out["matched_field"] = field
+        return out
+
+    # -- persistance ---------------------------------------------------------------
+
+    def save(self, path: Path, source_stamp: Optional[Tuple[int, int]] = None) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": _FORMAT_VERSION,
+            "stamp": source_stamp,
+            "keys": self._keys,
+            "fields": self._fields,
+            "folded": self._folded,
+            "postings": {g: p.tobytes() for g, p in self._postings.items()},
+        }
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with tmp.open("wb") as fh:
+            marshal.dump(payload, fh)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, source_stamp: Optional[Tuple[int, int]] = None) -> Optional["MemberSearchIndex"]:
+        try:
+            # Même lecture en un bloc que SnapshotStorage._read_payload.
+            payload = marshal.loads(Path(path).read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != _FORMAT_VERSION:
+            return None
+        if source_stamp is not None and payload.get("stamp") != source_stamp:
+            return None
+        index = cls()
+        index._keys = [tuple(k) for k in payload["keys"]]
+        index._fields = payload["fields"]
+        index._folded = payload["folded"]
+        for g, raw in payload["postings"].items():
+            postings = array("I")
+            postings.frombytes(raw)
+            index._postings[g] = postings
+        return index
+
+    @classmethod
+    def load_or_build(
+        cls,
+        path: Path,
+        source_file: Path,
+        records_loader: Callable[[], Iterable[Dict[str, Any]]],
+    ) -> "MemberSearchIndex":
+        # Reconstruit l'index si members.json a changé (taille ou mtime).
+        st = Path(source_file).stat()
+        stamp = (st.st_size, st.st_mtime_ns)
+        index = cls.load(path, stamp)
+        if index is None:
+            index = cls.from_records(records_loader())
+            index.save(path, stamp)
+        return index
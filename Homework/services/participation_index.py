@@ -0,0 +1,178 @@
+# services/participation_index.py
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional
+
+from models.event import Event
+
+
+def _norm_id(raw: Any) -> Any:
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return raw
+
+
+def _add(index: Dict[Any, Dict[Any, None]], key: Any, value: Any) -> None:
+    # dict utilisé comme ensemble ordonné : O(1) et ordre d'insertion conservé.
+    index.setdefault(key, {})[value] = None
+
+
+def _discard(index: Dict[Any, Dict[Any, None]], key: Any, value: Any) -> None:
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(value, None)
+        if not bucket:
+            del index[key]
+
+
+class ParticipationIndex:
+    """Index inversé membres <-> évènements, construit en un seul passage.
+
+    Clés : ``student_id`` / ``teacher_id`` côté membres, ``event_name`` côté
+    évènements (comme ``EventManager.save_all``). ``track()`` branche l'index
+    sur ``Event.add_participant`` / ``remove_participant``.
+    """
+
+    def __init__(self) -> None:
+        self._student_events: Dict[Any, Dict[str, None]] = {}
+        self._teacher_events: Dict[Any, Dict[str, None]] = {}
+        self._event_students: Dict[str, Dict[Any, None]] = {}
+        self._event_teachers: Dict[str, Dict[Any, None]] = {}
+        self._student_group: Dict[Any, str] = {}
+        self._group_students: Dict[str, Dict[Any, None]] = {}
+
+    # -- construction ------------------------------------------------------------
+
+    @classmethod
+    def from_records(
+        cls,
+        events: Iterable[Dict[str, Any]],
+        members: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> "ParticipationIndex":
+        index = cls()
+        for m in members or ():
+            if "student_id" in m:
+                index.set_group(m["student_id"], m.get("groupe", ""))
+        for e in events:
+            index.add_event(
+                e.get("event_name", e.get("name", "")),
+                e.get("organizer_ids") or e.get("organizers_ids") or [],
+                e.get("participant_ids") or e.get("participants_ids") or [],
+            )
+        return index
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event]) -> "ParticipationIndex":
+        index = cls()
+        for e in events:
+            index.add_event(
+                e.event_name,
+                [getattr(o, "teacher_id", None) for o in e.organizers],
+                [getattr(s, "student_id", None) for s in e.participants],
+            )
+        return index
+
+    def set_group(self, student_id: Any, groupe: Any) -> None:
+        sid = _norm_id(student_id)
+        old = self._student_group.get(sid)
+        if old is not None:
+            _discard(self._group_students, old, sid)
+        g = str(groupe or "-")
+        self._student_group[sid] = g
+        _add(self._group_students, g, sid)
+
+    def add_event(self, event_name: str, organizer_ids: Iterable[Any], participant_ids: Iterable[Any]) -> None:
+        self._event_students.setdefault(event_name, {})
+        self._event_teachers.setdefault(event_name, {})
+        for tid in organizer_ids:
+            self.add_organizer(event_name, tid)
+        for sid in participant_ids:
+            self.add_participant(event_name, sid)
+
+    def remove_event(self, event_name: str) -> None:
+        for sid in self._event_students.pop(event_name, {}):
+            _discard(self._student_events, sid, event_name)
+        for tid in self._event_teachers.pop(event_name, {}):
+            _discard(self._teacher_events, tid, event_name)
+
+    def add_participant(self, event_name: str, student_id: Any) -> None:
+        if student_id is None:
+            return
+        sid = _norm_id(student_id)
+        _add(self._event_students, event_name, sid)
+        _add(self._student_events, sid, event_name)
+
+    def remove_participant(self, event_name: str, student_id: Any) -> None:
+        sid = _norm_id(student_id)
+        _discard(self._event_students, event_name, sid)
+        _discard(self._student_events, sid, event_name)
+
+    def add_organizer(self, event_name: str, teacher_id: Any) -> None:
+        if teacher_id is None:
+            return
+        tid = _norm_id(teacher_id)
+        _add(self._event_teachers, event_name, tid)
+        _add(self._teacher_events, tid, event_name)
+
+    def remove_organizer(self, event_name: str, teacher_id: Any) -> None:
+        tid = _norm_id(teacher_id)
+        _discard(self._event_teachers, event_name, tid)
+        _discard(self._teacher_events, tid, event_name)
+
+    # -- mise à jour incrémentale depuis les modèles ----------------------------
+
+    def _on_event_change(self, event: Event, action: str, member: Any) -> None:
+        if action == "add_participant":
+            self.add_participant(event.event_name, getattr(member, "student_id", None))
+        elif action == "remove_participant":
+            self.remove_participant(event.event_name, getattr(member, "student_id", None))
+        elif action == "add_organizer":
+            self.add_organizer(event.event_name, getattr(member, "teacher_id", None))
+        elif action == "remove_organizer":
+            self.remove_organizer(event.event_name, getattr(member, "teacher_id", None))
+
+    def track(self) -> None:
+        Event.subscribe(self._on_event_change)
+
+    def untrack(self) -> None:
+        Event.unsubscribe(self._on_event_change)
+
+    # -- requêtes ------------------------------------------------------------------
+
+    def events_for_student(self, student_id: Any) -> List[str]:
+        return list(self._student_events.get(_norm_id(student_id), ()))
+
+    def events_organized_by(self, teacher_id: Any) -> List[str]:
+        return list(self._teacher_events.get(_norm_id(teacher_id), ()))
+
+    def participants_of(self, event_name: str) -> List[Any]:
+        return list(self._event_students.get(event_name, ()))
+
+    def organizers_of(self, event_name: str) -> List[Any]:
+        return list(self._event_teachers.get(event_name, ()))
+
+    def co_participants(self, student_id: Any) -> List[Any]:
+        sid = _norm_id(student_id)
+        seen: Dict[Any, None] = {}
+        for name in self._student_events.get(sid, ()):
+            for other in self._event_students.get(name, ()):
+                if other != sid:
+                    seen[other] = None
+        return list(seen)
+
+    def teachers_of_group(self, groupe: Any) -> List[Any]:
+        # Même règle que l'onglet Groups : organisateurs des évènements
+        # auxquels participe au moins un étudiant du groupe.
+        teachers: Dict[Any, None] = {}
+        for sid in self._group_students.get(str(groupe or "-"), ()):
+            for name in self._student_events.get(sid, ()):
+                for tid in self._event_teachers.get(name, ()):
+                    teachers[tid] = None
+        return list(teachers)
+
+    def events_organized_by_group_teachers(self, groupe: Any) -> List[str]:
+        events: Dict[str, None] = {}
+        for tid in self.teachers_of_group(groupe):
+            for name in self._teacher_events.get(tid, ()):
+                events[name] = None
+        return list(events)
@@ -1,10 +1,14 @@
 # services/report_generator.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from html import escape
 import webbrowser
 
+from utils.instrumentation import metrics
+from utils.memory_budget import RENDER_BYTES_PER_ROW, MemoryBudget
+from utils.render_kernel import Column, RowFormatter, cells_template
+
 def coerce_date_str(d: Any) -> str:
     if hasattr(d, "isoformat"):
         return d.isoformat()
@@ -63,50 +67,30 @@ def parse_events(records: List[Dict[str, Any]],
         })
     return parsed
 
-def render_table(headers: List[str], rows: List[List[str]]) -> str:
+def _generic_formatter(n: int) -> RowFormatter:
+    return RowFormatter(cells_template(n), [Column(lambda r, i=i: str(r[i])) for i in range(n)])
+
+def iter_table(headers: List[str], rows: Iterable[Any], formatter: Optional[RowFormatter] = None) -> Iterator[str]:
+    # Sans formateur : lignes = listes de cellules, toutes échappées par colonne.
+    if formatter is None:
+        formatter = _generic_formatter(len(headers))
     thead = "".join(f"<th>{escape(h)}</th>" for h in headers)
-    trs = []
-    for r in rows:
-        tds = "".join(f"<td>{escape(str(c))}</td>" for c in r)
-        trs.append(f"<tr>{tds}</tr>")
-    tbody = "".join(trs) if trs else f"<tr><td colspan='{len(headers)}' style='text-align:center;opacity:.7'>Aucune donnée</td></tr>"
-    return f"""
-<table class="table table-striped table-hover table-sm align-middle">
+    yield f"""<table class="table table-striped table-hover table-sm align-middle">
   <thead class="table-light"><tr>{thead}</tr></thead>
-  <tbody>{tbody}</tbody>
-</table>
-""".strip()
+  <tbody>"""
+    empty = True
+    for row in formatter.rows(rows):
+        empty = False
+        yield row
+    if empty:
+        yield f"<tr><td colspan='{len(headers)}' style='text-align:center;opacity:.7'>Aucune donnée</td></tr>"
+    yield """</tbody>
+</table>"""
 
-def build_html(students, teachers, events) -> str:
-    student_rows = [[
-        s.get("student_id",""),
-        s.get("full_name",""),
-        s.get("email",""),
-        s.get("phone",""),
-        s.get("address",""),
-        s.get("subscription_status",""),
-        s.get("groupe",""),
-        s.get("join_date","")
-    ] for s in students]
-
-    teacher_rows = [[
-        t.get("teacher_id",""),
-        t.get("full_name",""),
-        t.get("email",""),
-        t.get("phone",""),
-        t.get("address",""),
-        t.get("join_date","")
-    ] for t in teachers]
-
-    event_rows = [[
-        e.get("event_name",""),
-        e.get("event_date",""),
-        ", ".join(e.get("organizers",[])),
-        ", ".join(e.get("participants",[])),
-        e.get("description","")
-    ] for e in events]
-
-    html = f"""<!DOCTYPE html>
+def render_table(headers: List[str], rows: List[List[str]]) -> str:
+    return "".join(iter_table(headers, rows))
+
+_HEAD = """<!DOCTYPE html>
 <html lang="fr">
 <head>
 <meta charset="utf-8" />
@@ -114,11 +98,11 @@ def build_html(students, teachers, events) -> str:
 <title>Madrassa — Tableau de bord</title>
 <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css" rel="stylesheet">
 <style>
-  body {{ background:#f7f8fb; }}
-  .container {{ max-width: 1100px; }}
-  .card {{ border-radius: 1rem; box-shadow: 0 6px 24px rgba(0,0,0,.06); }}
-  h1,h2 {{ font-weight: 700; }}
-  .badge-pill {{ border-radius: 999px; }}
+  body { background:#f7f8fb; }
+  .container { max-width: 1100px; }
+  .card { border-radius: 1rem; box-shadow: 0 6px 24px rgba(0,0,0,.06); }
+  h1,h2 { font-weight: 700; }
+  .badge-pill { border-radius: 999px; }
 </style>
 </head>
 <body>
@@ -137,10 +121,9 @@ def build_html(students, teachers, events) -> str:
       <div class="card">
         <div class="card-body">
           <h2 class="h4 mb-3">Événements</h2>
-          {render_table(
-            ["Nom", "Date", "Organisateurs", "Participants", "Description"],
-            event_rows
-          )}
+          """
+
+_BETWEEN_EVENTS_STUDENTS = """
         </div>
       </div>
     </div>
@@ -149,10 +132,9 @@ def build_html(students, teachers, events) -> str:
       <div class="card">
         <div class="card-body">
           <h2 class="h4 mb-3">Étudiants</h2>
-          {render_table(
-            ["ID", "Nom", "Email", "Téléphone", "Adresse", "Abonnement", "Groupe", "Inscription"],
-            student_rows
-          )}
+          """
+
+_BETWEEN_STUDENTS_TEACHERS = """
         </div>
       </div>
     </div>
@@ -161,10 +143,9 @@ def build_html(students, teachers, events) -> str:
       <div class="card">
         <div class="card-body">
           <h2 class="h4 mb-3">Professeurs</h2>
-          {render_table(
-            ["ID", "Nom", "Email", "Téléphone", "Adresse", "Inscription"],
-            teacher_rows
-          )}
+          """
+
+_TAIL = """
         </div>
       </div>
     </div>
@@ -177,19 +158,81 @@ def build_html(students, teachers, events) -> str:
 </body>
 </html>
 """
-    return html
+
+def _get(key: str):
+    return lambda r: str(r.get(key, ""))
+
+# Colonnes des trois tableaux, compilées une fois (utils.render_kernel) ; statut,
+# groupe et date d'inscription ont peu de valeurs distinctes -> cache d'échappement.
+_STUDENT_TABLE = RowFormatter(cells_template(8), [
+    Column(_get("student_id")),
+    Column(_get("full_name")),
+    Column(_get("email")),
+    Column(_get("phone")),
+    Column(_get("address")),
+    Column(_get("subscription_status"), "cached"),
+    Column(_get("groupe"), "cached"),
+    Column(_get("join_date"), "cached"),
+])
+
+_TEACHER_TABLE = RowFormatter(cells_template(6), [
+    Column(_get("teacher_id")),
+    Column(_get("full_name")),
+    Column(_get("email")),
+    Column(_get("phone")),
+    Column(_get("address")),
+    Column(_get("join_date"), "cached"),
+])
+
+_EVENT_TABLE = RowFormatter(cells_template(5), [
+    Column(_get("event_name")),
+    Column(_get("event_date"), "cached"),
+    Column(lambda e: ", ".join(e.get("organizers", []))),
+    Column(lambda e: ", ".join(e.get("participants", []))),
+    Column(_get("description")),
+])
+
+def iter_html(students, teachers, events) -> Iterator[str]:
+    # Morceaux successifs de la page : build_html les assemble, build_and_save
+    # peut aussi les écrire un à un quand la page entière ne tient pas en mémoire.
+    yield _HEAD
+    yield from iter_table(["Nom", "Date", "Organisateurs", "Participants", "Description"], events, _EVENT_TABLE)
+    yield _BETWEEN_EVENTS_STUDENTS
+    yield from iter_table(["ID", "Nom", "Email", "Téléphone", "Adresse", "Abonnement", "Groupe", "Inscription"], students, _STUDENT_TABLE)
+    yield _BETWEEN_STUDENTS_TEACHERS
+    yield from iter_table(["ID", "Nom", "Email", "Téléphone", "Adresse", "Inscription"], teachers, _TEACHER_TABLE)
+    yield _TAIL
+
+def build_html(students, teachers, events) -> str:
+    return "".join(iter_html(students, teachers, events))
 
 class ReportGenerator:
-    def __init__(self, base_dir: Path) -> None:
+    def __init__(self, base_dir: Path, budget: Optional[MemoryBudget] = None) -> None:
         self.base_dir = Path(base_dir)
         self.out_file = self.base_dir / "index.html"   # plus de dossier 'site'
+        self._budget = budget
 
     def build_and_save(self, members: List[Dict[str, Any]], events_raw: List[Dict[str, Any]]) -> Path:
-        students, teachers = split_members(members)
+        with metrics.stage("report_split_members"):
+            students, teachers = split_members(members)
         s_map, t_map = build_member_maps(students, teachers)
-        events = parse_events(events_raw, s_map, t_map)
-        html = build_html(students, teachers, events)
-        self.out_file.write_text(html, encoding="utf-8")
+        with metrics.stage("report_parse_events"):
+            events = parse_events(events_raw, s_map, t_map)
+        rows = len(students) + len(teachers) + len(events)
+        if self._budget is not None and (
+            self._budget.streaming or self._budget.would_exceed(rows * RENDER_BYTES_PER_ROW)
+        ):
+            if not self._budget.streaming:
+                self._budget.switch("report_render", f"{rows} lignes à rendre")
+            # Page écrite morceau par morceau : jamais entière en mémoire.
+            with metrics.stage("report_render_write_stream"), self.out_file.open("w", encoding="utf-8") as fh:
+                for chunk in iter_html(students, teachers, events):
+                    fh.write(chunk)
+            return self.out_file
+        with metrics.stage("report_render"):
+            html = build_html(students, teachers, events)
+        with metrics.stage("report_write"):
+            self.out_file.write_text(html, encoding="utf-8")
         return self.out_file
 
     def open_in_browser(self, out_file: Path | None = None) -> None:
@@ -0,0 +1,315 @@
+# services/revenue_ledger.py
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from models.annual_subscription import AnnualSubscription
+from models.monthly_subscription import MonthlySubscription
+from models.subscription import Subscription
+
+
+DIMENSIONS = ("month", "kind", "group")
+VALUES = ("due", "amount")
+_NO_GROUP = "-"
+
+
+def _norm_id(raw: Any) -> Any:
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return raw
+
+
+def _month(value: Any) -> str:
+    # « AAAA-MM-JJ » tronqué à « AAAA-MM », comme FinanceAnalytics.
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    return "" if value is None else str(value)[:7]
+
+
+def _kind(sub: Subscription) -> str:
+    if isinstance(sub, MonthlySubscription):
+        return "monthly"
+    if isinstance(sub, AnnualSubscription):
+        return "annual"
+    return "base"
+
+
+def _cents(value: float) -> int:
+    return int(round(value * 100))
+
+
+def subscription_from_record(record: Dict[str, Any]) -> Subscription:
+    """Abonnement JSON (``kind``, ``months``, ``discount_rate``) -> modèle."""
+    fields = dict(
+        student_id=record.get("student_id"),
+        amount=float(record.get("amount", 0.0)),
+        date=record.get("date"),
+        status=str(record.get("status", "unpaid")),
+    )
+    kind = str(record.get("kind", "base")).lower()
+    if kind == "monthly":
+        return MonthlySubscription(**fields, months=int(record.get("months", 1) or 1))
+    if kind == "annual":
+        year = record.get("year")
+        if year is None:
+            return AnnualSubscription(**fields, discount_rate=float(record.get("discount_rate", 0.10)))
+        return AnnualSubscription(**fields, year=int(year), discount_rate=float(record.get("discount_rate", 0.10)))
+    return Subscription(**fields)
+
+
+class _Rollup:
+    __slots__ = ("expected", "paid", "count", "paid_count")
+
+    def __init__(self) -> None:
+        self.expected = 0
+        self.paid = 0
+        self.count = 0
+        self.paid_count = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "expected": self.expected / 100,
+            "paid": self.paid / 100,
+            "unpaid": (self.expected - self.paid) / 100,
+            "count": self.count,
+            "paid_count": self.paid_count,
+        }
+
+
+class RevenueLedger:
+    """Cumuls attendu / payé / impayé des abonnements, par mois, type et groupe.
+
+    Chaque abonnement compte pour ``total_amount()`` (montant × ``months``,
+    montant × 12 × (1 - ``discount_rate``), ou montant brut). Les cumuls sont
+    tenus à jour à l'ajout, au retrait et, après ``track()``, à chaque
+    ``mark_paid`` / ``mark_unpaid`` : une vue mensuelle ou la liste des
+    impayés ne relit jamais tous les abonnements. Montants tenus en centimes
+    entiers : ajouts et retraits répétés ne dérivent pas.
+
+    ``value="amount"`` compte le montant saisi (celui du tableau de bord),
+    comme le paramètre ``value`` de FinanceAnalytics.
+    """
+
+    def __init__(self, value: str = "due") -> None:
+        if value not in VALUES:
+            raise ValueError(f"unknown value column: {value!r}")
+        self.value = value
+        # id(abonnement) -> (abonnement, étudiant, mois, type, groupe, centimes dus, payé) :
+        # valeurs figées à l'ajout, retirées telles quelles même si le modèle a changé.
+        self._entries: Dict[int, Tuple[Subscription, Any, str, str, str, int, bool]] = {}
+        self._rollups: Dict[str, Dict[str, _Rollup]] = {d: {} for d in DIMENSIONS}
+        self._total = _Rollup()
+        self._student_group: Dict[Any, str] = {}
+        self._student_entries: Dict[Any, Dict[int, None]] = {}
+        self._outstanding: Dict[Any, int] = {}
+        self._changes: Dict[str, Set[str]] = {d: set() for d in DIMENSIONS}
+
+    # -- construction ------------------------------------------------------------
+
+    @classmethod
+    def from_models(
+        cls,
+        subscriptions: Iterable[Subscription],
+        students: Iterable[Any] = (),
+        value: str = "due",
+    ) -> "RevenueLedger":
+        ledger = cls(value)
+        for s in students:
+            ledger.set_group(s.student_id, getattr(s, "groupe", ""))
+        ledger.add_many(subscriptions)
+        ledger.pop_changes()
+        return ledger
+
+    @classmethod
+    def from_records(
+        cls,
+        subscriptions: Iterable[Dict[str, Any]],
+        members: Optional[Iterable[Dict[str, Any]]] = None,
+        value: str = "due",
+    ) -> "RevenueLedger":
+        students = [m for m in members or () if "student_id" in m]
+        ledger = cls(value)
+        for m in students:
+            ledger.set_group(m["student_id"], m.get("groupe", ""))
+        ledger.add_many(subscription_from_record(r) for r in subscriptions)
+        ledger.pop_changes()
+        return ledger
+
+    # -- alimentation --------------------------------------------------------------
+
+    def _due(self, sub: Subscription) -> int:
+        return _cents(sub.total_amount() if self.value == "due" else float(sub.amount))
+
+    def _group(self, student_id: Any) -> str:
+        return self._student_group.get(student_id, _NO_GROUP)
+
+    def _apply(self, month: str, kind: str, group: str, due: int, paid: bool, sign: int, count: int = 1) -> None:
+        for dimension, key in (("month", month), ("kind", kind), ("group", group)):
+            rollups = self._rollups[dimension]
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollup = rollups[key] = _Rollup()
+            self._bump(rollup, due, paid, sign, count)
+            if rollup.count == 0:
+                del rollups[key]
+            self._changes[dimension].add(key)
+        self._bump(self._total, due, paid, sign, count)
+
+    @staticmethod
+    def _bump(rollup: _Rollup, due: int, paid: bool, sign: int, count: int) -> None:
+        rollup.expected += sign * due
+        rollup.count += sign * count
+        if paid:
+            rollup.paid += sign * due
+            rollup.paid_count += sign * count
+
+    def _owe(self, student_id: Any, cents: int) -> None:
+        if student_id is None:
+            return
+        left = self._outstanding.get(student_id, 0) + cents
+        if left:
+            self._outstanding[student_id] = left
+        else:
+            self._outstanding.pop(student_id, None)
+
+    def add(self, sub: Subscription) -> None:
+        key = id(sub)
+        if key in self._entries:
+            return
+        sid = _norm_id(sub.student_id)
+        month, kind, group = _month(sub.date), _kind(sub), self._group(sid)
+        due = self._due(sub)
+        paid = str(sub.status).lower() == "paid"
+        self._entries[key] = (sub, sid, month, kind, group, due, paid)
+        self._student_entries.setdefault(sid, {})[key] = None
+        self._apply(month, kind, group, due, paid, +1)
+        if not paid:
+            self._owe(sid, due)
+
+    def add_many(self, subs: Iterable[Subscription]) -> None:
+        # Chargement initial : mêmes cumuls que add(), regroupés en un passage
+        # par clé plutôt que trois _apply par abonnement.
+        entries = self._entries
+        student_entries = self._student_entries
+        groups = self._student_group
+        pending: Dict[Tuple[str, str, str, bool], List[int]] = {}
+        for sub in subs:
+            key = id(sub)
+            if key in entries:
+                continue
+            sid = _norm_id(sub.student_id)
+            month, kind, group = _month(sub.date), _kind(sub), groups.get(sid, _NO_GROUP)
+            due = self._due(sub)
+            paid = str(sub.status).lower() == "paid"
+            entries[key] = (sub, sid, month, kind, group, due, paid)
+            student_entries.setdefault(sid, {})[key] = None
+            cell = pending.get((month, kind, group, paid))
+            if cell is None:
+                pending[(month, kind, group, paid)] = [due, 1]
+            else:
+                cell[0] += due
+                cell[1] += 1
+            if not paid:
+                self._owe(sid, due)
+        for (month, kind, group, paid), (due, count) in pending.items():
+            self._apply(month, kind, group, due, paid, +1, count)
+
+    def remove(self, sub: Subscription) -> None:
+        entry = self._entries.pop(id(sub), None)
+        if entry is None:
+            return
+        _sub, sid, month, kind, group, due, paid = entry
+        bucket = self._student_entries.get(sid)
+        if bucket is not None:
+            bucket.pop(id(sub), None)
+            if not bucket:
+                del self._student_entries[sid]
+        self._apply(month, kind, group, due, paid, -1)
+        if not paid:
+            self._owe(sid, -due)
+
+    def refresh(self, sub: Subscription) -> None:
+        """À appeler après une modification directe (montant, date, statut...)."""
+        if id(sub) in self._entries:
+            self.remove(sub)
+            self.add(sub)
+
+    def set_group(self, student_id: Any, groupe: Any) -> None:
+        # Les abonnements déjà enregistrés changent de groupe avec l'étudiant.
+        sid = _norm_id(student_id)
+        group = str(groupe or _NO_GROUP)
+        if self._group(sid) == group:
+            return
+        entries = [self._entries[k] for k in self._student_entries.get(sid, ())]
+        for sub, *_rest in entries:
+            self.remove(sub)
+        self._student_group[sid] = group
+        for sub, *_rest in entries:
+            self.add(sub)
+
+    # -- mise à jour incrémentale depuis les modèles ----------------------------
+
+    def _on_subscription_change(self, sub: Subscription, action: str, old_status: Any) -> None:
+        entry = self._entries.get(id(sub))
+        if entry is None or action not in ("mark_paid", "mark_unpaid"):
+            return
+        _sub, sid, month, kind, group, due, was_paid = entry
+        paid = action == "mark_paid"
+        if paid == was_paid:
+            return
+        self._apply(month, kind, group, due, was_paid, -1)
+        self._apply(month, kind, group, due, paid, +1)
+        self._entries[id(sub)] = (sub, sid, month, kind, group, due, paid)
+        self._owe(sid, -due if paid else due)
+
+    def track(self) -> None:
+        Subscription.subscribe(self._on_subscription_change)
+
+    def untrack(self) -> None:
+        Subscription.unsubscribe(self._on_subscription_change)
+
+    # -- requêtes ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def totals(self) -> Dict[str, Any]:
+        return self._total.to_dict()
+
+    def rollup(self, dimension: str, key: Any) -> Dict[str, Any]:
+        if dimension not in self._rollups:
+            raise ValueError(f"unknown dimension: {dimension!r}")
+        if dimension == "month":
+            key = _month(key)
+        rollup = self._rollups[dimension].get(str(key))
+        return (rollup or _Rollup()).to_dict()
+
+    def month(self, month: Any) -> Dict[str, Any]:
+        """Cumuls d'un mois ; ``month`` : ``"AAAA-MM"``, date ou ``"AAAA-MM-JJ"``."""
+        return self.rollup("month", month)
+
+    def by_month(self) -> Dict[str, Dict[str, Any]]:
+        return {k: r.to_dict() for k, r in sorted(self._rollups["month"].items())}
+
+    def by_kind(self) -> Dict[str, Dict[str, Any]]:
+        return {k: r.to_dict() for k, r in self._rollups["kind"].items()}
+
+    def by_group(self) -> Dict[str, Dict[str, Any]]:
+        return {k: r.to_dict() for k, r in self._rollups["group"].items()}
+
+    def outstanding(self, student_id: Any) -> float:
+        return self._outstanding.get(_norm_id(student_id), 0) / 100
+
+    def arrears(self, min_amount: float = 0.0) -> List[Tuple[Any, float]]:
+        """Étudiants avec un impayé > ``min_amount``, du plus gros au plus petit."""
+        floor = _cents(min_amount)
+        owed = [(sid, c) for sid, c in self._outstanding.items() if c > floor]
+        owed.sort(key=lambda item: (-item[1], str(item[0])))
+        return [(sid, c / 100) for sid, c in owed]
+
+    def pop_changes(self) -> Dict[str, Set[str]]:
+        """Clés (mois, types, groupes) modifiées depuis le dernier appel :
+        seules ces lignes d'une vue financière sont à re-rendre."""
+        changes = self._changes
+        self._changes = {d: set() for d in DIMENSIONS}
+        return changes
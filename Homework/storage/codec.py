@@ -0,0 +1,18 @@
+from __future__ import annotations
+import json
+from datetime import date
+from typing import Any
+
+
+# Encodage JSON commun aux stockages (SQLite, journal, JSON Lines) : UTF-8
+# brut, dates en ISO 8601, tout autre objet inconnu en texte.
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(value: Any, **kwargs: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=json_default, **kwargs)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List
+
+from interfaces.storage_interface import COLLECTIONS, StorageInterface
+
+
+class PrefetchedProject(Mapping):
+    """Dictionnaire projet dont chaque collection n'est attendue qu'au premier accès.
+
+    Une UI qui traite ``members`` avant de lire ``events`` chevauche ainsi son
+    propre travail avec le chargement des collections restantes.
+    """
+
+    def __init__(self, futures: Dict[str, "Future[List[Dict[str, Any]]]"]) -> None:
+        self._futures = futures
+
+    def __getitem__(self, key: str) -> List[Dict[str, Any]]:
+        return self._futures[key].result()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._futures)
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+
+class ConcurrentStorage(StorageInterface):
+    """Charge les quatre collections de ``inner`` en parallèle (threads).
+
+    Les lectures sont surtout de l'attente I/O (disque ou partage réseau) :
+    le temps total tend vers celui de la collection la plus lente.
+    """
+
+    def __init__(self, inner: StorageInterface, max_workers: int = len(COLLECTIONS)) -> None:
+        self._inner = inner
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+        self._futures: Dict[str, "Future[List[Dict[str, Any]]]"] = {}
+
+    def _future(self, name: str) -> "Future[List[Dict[str, Any]]]":
+        if name not in self._futures:
+            self._futures[name] = self._pool.submit(getattr(self._inner, f"load_{name}"))
+        return self._futures[name]
+
+    def prefetch(self) -> "ConcurrentStorage":
+        for name in COLLECTIONS:
+            self._future(name)
+        return self
+
+    def project(self) -> PrefetchedProject:
+        self.prefetch()
+        return PrefetchedProject(dict(self._futures))
+
+    def refresh(self) -> None:
+        # Oublie les résultats : le prochain accès relit le stockage sous-jacent.
+        self._futures.clear()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "ConcurrentStorage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def load_members(self) -> List[Dict[str, Any]]:
+        return self._future("members").result()
+
+    def load_events(self) -> List[Dict[str, Any]]:
+        return self._future("events").result()
+
+    def load_subscriptions(self) -> List[Dict[str, Any]]:
+        return self._future("subscriptions").result()
+
+    def load_donations(self) -> List[Dict[str, Any]]:
+        return self._future("donations").result()
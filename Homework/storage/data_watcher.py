@@ -0,0 +1,63 @@
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from interfaces.storage_interface import COLLECTIONS
+
+
+StampFn = Callable[[str], Any]
+
+
+class DataWatcher:
+    """Surveille les collections par scrutation de leur ``stamp`` (taille, mtime).
+
+    ``wait()`` bloque jusqu'à un changement, puis attend que les écritures se
+    calment pendant ``debounce`` secondes avant de rendre l'ensemble des
+    collections modifiées : une rafale d'enregistrements = une reconstruction.
+    """
+
+    def __init__(
+        self,
+        stamp: StampFn,
+        names: Iterable[str] = COLLECTIONS,
+        interval: float = 0.5,
+        debounce: float = 0.3,
+    ) -> None:
+        self._stamp = stamp
+        self._names = tuple(names)
+        self._interval = interval
+        self._debounce = debounce
+        self._stamps: Dict[str, Any] = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {name: self._stamp(name) for name in self._names}
+
+    def _diff(self, current: Dict[str, Any]) -> Set[str]:
+        return {name for name in self._names if current[name] != self._stamps.get(name)}
+
+    def poll(self) -> Set[str]:
+        """Collections modifiées depuis le dernier appel (sans anti-rebond)."""
+        current = self._snapshot()
+        changed = self._diff(current)
+        self._stamps = current
+        return changed
+
+    def wait(self, stop: Optional[threading.Event] = None) -> Set[str]:
+        """Bloque jusqu'au prochain lot de changements ; ensemble vide si ``stop`` est levé."""
+        stop = stop or threading.Event()
+        changed: Set[str] = set()
+        quiet_since = 0.0
+        while not stop.is_set():
+            current = self._snapshot()
+            new = self._diff(current)
+            now = time.monotonic()
+            if new:
+                changed |= new
+                self._stamps = current
+                quiet_since = now
+            elif changed and now - quiet_since >= self._debounce:
+                return changed
+            # Scrutation plus serrée pendant l'anti-rebond.
+            stop.wait(min(self._interval, self._debounce) if changed else self._interval)
+        return set()
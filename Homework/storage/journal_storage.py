@@ -0,0 +1,308 @@
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+from interfaces.storage import Storage
+from interfaces.storage_interface import StorageInterface
+from storage.json_storage import JSONStorage
+from storage.codec import dumps, json_default
+
+
+Key = Tuple[Any, ...]
+
+JOURNALED = ("members", "events")
+_SYNC_BATCH = 64
+_SYNC_INTERVAL = 0.2
+_COMPACT_MIN_OPS = 1000
+
+
+def _normalized(record: Any) -> Any:
+    # Même forme qu'après un aller-retour JSON (dates -> texte, tuples -> listes).
+    return json.loads(dumps(record))
+
+
+def record_key(collection: str, record: Dict[str, Any]) -> Key:
+    """Clé d'upsert : student_id / teacher_id pour un membre, event_name pour un évènement.
+
+    Un enregistrement sans clé est identifié par son contenu."""
+    if collection == "members":
+        if record.get("student_id") not in (None, ""):
+            return ("student", record["student_id"])
+        if record.get("teacher_id") not in (None, ""):
+            return ("teacher", record["teacher_id"])
+    elif record.get("event_name", record.get("name")) not in (None, ""):
+        return ("event", record.get("event_name", record.get("name")))
+    return ("record", dumps(record, sort_keys=True))
+
+
+class _Journal:
+    """État fusionné (base + journal) d'une collection et son fichier JSON Lines."""
+
+    def __init__(self, base: Path, log: Path) -> None:
+        self.base = base
+        self.log = log
+        self.rotated = log.with_suffix(log.suffix + ".old")
+        self.state: Dict[Key, Dict[str, Any]] = {}
+        self.ops = 0
+        self.fh: Optional[IO[str]] = None
+
+
+class JournalStorage(StorageInterface, Storage):
+    """Membres et évènements : fichier de base JSON + journal ``<nom>.journal.jsonl``.
+
+    ``save_members`` / ``save_events`` comparent la liste reçue à l'état courant
+    et n'ajoutent au journal que les upserts et suppressions ; ``upsert_*`` et
+    ``delete_*`` écrivent une seule ligne. Les écritures sont fsync par lots
+    (``sync_batch`` lignes ou ``sync_interval`` secondes, ``sync()`` pour forcer).
+    Une lecture rejoue le journal sur la base ; au-delà de ``compact_ratio`` fois
+    la taille de la collection, un thread replie le journal dans la base.
+
+    Ordre des enregistrements : celui de la base, les nouvelles clés à la fin.
+    Abonnements et dons restent lus tels quels (``JSONStorage``).
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        sync_batch: int = _SYNC_BATCH,
+        sync_interval: float = _SYNC_INTERVAL,
+        compact_ratio: float = 0.5,
+        compact_min_ops: int = _COMPACT_MIN_OPS,
+    ) -> None:
+        self._base_dir = Path(base_dir)
+        self._files = JSONStorage(self._base_dir)
+        self._sync_batch = max(1, sync_batch)
+        self._sync_interval = sync_interval
+        self._compact_ratio = compact_ratio
+        self._compact_min_ops = compact_min_ops
+        self._lock = threading.RLock()
+        self._journals: Dict[str, _Journal] = {}
+        self._pending = 0
+        self._closed = False
+        self._wake = threading.Event()
+        self._compactions: Dict[str, threading.Thread] = {}
+        self._syncer = threading.Thread(target=self._sync_loop, daemon=True)
+        self._syncer.start()
+
+    # -- état ------------------------------------------------------------------------
+
+    def _journal(self, name: str) -> _Journal:
+        journal = self._journals.get(name)
+        if journal is None:
+            journal = _Journal(self._base_dir / f"{name}.json", self._base_dir / f"{name}.journal.jsonl")
+            for r in getattr(self._files, f"load_{name}")():
+                journal.state[record_key(name, r)] = r
+            # Un .old reste si une compaction a été interrompue : il passe avant le journal courant.
+            for path in (journal.rotated, journal.log):
+                journal.ops += self._replay(journal, path)
+            self._journals[name] = journal
+        return journal
+
+    @staticmethod
+    def _replay(journal: _Journal, path: Path) -> int:
+        if not path.exists():
+            return 0
+        count = 0
+        with path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Dernière ligne tronquée par un arrêt brutal : le reste est ignoré.
+                    break
+                key = tuple(entry["k"])
+                if entry["op"] == "put":
+                    journal.state[key] = entry["r"]
+                else:
+                    journal.state.pop(key, None)
+                count += 1
+        return count
+
+    def _append(self, name: str, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        journal = self._journal(name)
+        if journal.fh is None:
+            self._base_dir.mkdir(parents=True, exist_ok=True)
+            journal.fh = journal.log.open("a", encoding="utf-8")
+        journal.fh.write("".join(dumps(e) + "\n" for e in entries))
+        journal.ops += len(entries)
+        self._pending += len(entries)
+        if self._pending >= self._sync_batch:
+            self._sync_locked()
+        else:
+            self._wake.set()
+        if journal.ops >= max(self._compact_min_ops, self._compact_ratio * len(journal.state)):
+            self.compact_async(name)
+
+    # -- écriture --------------------------------------------------------------------
+
+    def _upsert(self, name: str, record: Dict[str, Any]) -> None:
+        record = _normalized(record)
+        key = record_key(name, record)
+        with self._lock:
+            journal = self._journal(name)
+            if journal.state.get(key) == record:
+                return
+            journal.state[key] = record
+            self._append(name, [{"op": "put", "k": list(key), "r": record}])
+
+    def _delete(self, name: str, key: Key) -> bool:
+        with self._lock:
+            journal = self._journal(name)
+            if journal.state.pop(key, None) is None:
+                return False
+            self._append(name, [{"op": "del", "k": list(key)}])
+            return True
+
+    def _save_all(self, name: str, records: List[dict]) -> None:
+        # Un seul aller-retour JSON pour toute la liste (bien plus rapide qu'un par ligne).
+        incoming = {record_key(name, r): r for r in _normalized(list(records))}
+        with self._lock:
+            journal = self._journal(name)
+            entries: List[Dict[str, Any]] = []
+            for key in [k for k in journal.state if k not in incoming]:
+                del journal.state[key]
+                entries.append({"op": "del", "k": list(key)})
+            for key, r in incoming.items():
+                if journal.state.get(key) != r:
+                    journal.state[key] = r
+                    entries.append({"op": "put", "k": list(key), "r": r})
+            self._append(name, entries)
+
+    def save_members(self, members: List[dict]) -> None:
+        self._save_all("members", members)
+
+    def save_events(self, events: List[dict]) -> None:
+        self._save_all("events", events)
+
+    def upsert_member(self, record: Dict[str, Any]) -> None:
+        self._upsert("members", record)
+
+    def upsert_event(self, record: Dict[str, Any]) -> None:
+        self._upsert("events", record)
+
+    def delete_student(self, student_id: Any) -> bool:
+        return self._delete("members", ("student", student_id))
+
+    def delete_teacher(self, teacher_id: Any) -> bool:
+        return self._delete("members", ("teacher", teacher_id))
+
+    def delete_event(self, event_name: str) -> bool:
+        return self._delete("events", ("event", event_name))
+
+    # -- lecture ---------------------------------------------------------------------
+
+    def load_members(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._journal("members").state.values())
+
+    def load_events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._journal("events").state.values())
+
+    def load_subscriptions(self) -> List[Dict[str, Any]]:
+        return self._files.load_subscriptions()
+
+    def load_donations(self) -> List[Dict[str, Any]]:
+        return self._files.load_donations()
+
+    def stamp(self, name: str) -> Optional[Tuple[Any, ...]]:
+        if name not in JOURNALED:
+            return self._files.stamp(name)
+        stamps = []
+        for path in (self._base_dir / f"{name}.json", self._base_dir / f"{name}.journal.jsonl"):
+            try:
+                st = path.stat()
+                stamps.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    # -- fsync par lots --------------------------------------------------------------
+
+    def _sync_locked(self) -> None:
+        for journal in self._journals.values():
+            if journal.fh is not None:
+                journal.fh.flush()
+                os.fsync(journal.fh.fileno())
+        self._pending = 0
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            time.sleep(self._sync_interval)
+            with self._lock:
+                if self._pending and not self._closed:
+                    self._sync_locked()
+
+    # -- compaction ------------------------------------------------------------------
+
+    def compact(self, name: str) -> None:
+        """Réécrit la base avec l'état courant puis vide le journal.
+
+        Seules la rotation du journal et le remplacement final prennent le verrou :
+        les écritures continuent pendant la sérialisation."""
+        with self._lock:
+            journal = self._journal(name)
+            if journal.ops == 0:
+                return
+            self._sync_locked()
+            if journal.fh is not None:
+                journal.fh.close()
+                journal.fh = None
+            if journal.rotated.exists():
+                # .old laissé par une compaction interrompue : pas encore dans la base.
+                with journal.rotated.open("a", encoding="utf-8") as out:
+                    if journal.log.exists():
+                        out.write(journal.log.read_text(encoding="utf-8"))
+                journal.log.unlink(missing_ok=True)
+            elif journal.log.exists():
+                os.replace(journal.log, journal.rotated)
+            records = list(journal.state.values())
+            folded = journal.ops
+        tmp = journal.base.with_suffix(journal.base.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(records, fh, ensure_ascii=False, indent=2, default=json_default)
+            fh.flush()
+            os.fsync(fh.fileno())
+        with self._lock:
+            os.replace(tmp, journal.base)
+            journal.rotated.unlink(missing_ok=True)
+            journal.ops -= folded
+
+    def compact_async(self, name: str) -> None:
+        running = self._compactions.get(name)
+        if running is not None and running.is_alive():
+            return
+        thread = threading.Thread(target=self.compact, args=(name,), daemon=True)
+        self._compactions[name] = thread
+        thread.start()
+
+    def close(self) -> None:
+        for thread in list(self._compactions.values()):
+            thread.join()
+        with self._lock:
+            self._sync_locked()
+            for journal in self._journals.values():
+                if journal.fh is not None:
+                    journal.fh.close()
+                    journal.fh = None
+            self._closed = True
+        self._wake.set()
+        self._syncer.join()
+
+    def __enter__(self) -> "JournalStorage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
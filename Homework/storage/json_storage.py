@@ -1,14 +1,27 @@
 from __future__ import annotations
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from interfaces.storage_interface import StorageInterface
 
 
+_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\n\r"
+# Plus long littéral JSON (-Infinity) : une erreur plus près que ça de la fin
+# du bloc peut venir d'un élément coupé.
+_TAIL = 10
+
+
+def _truncated(exc: json.JSONDecodeError, buf: str) -> bool:
+    return exc.pos >= len(buf) - _TAIL or exc.msg.startswith("Unterminated string")
+
+
 class JSONStorage(StorageInterface):
-    def __init__(self, base_dir: Path) -> None:
+    def __init__(self, base_dir: Path, chunk_size: int = _CHUNK_SIZE) -> None:
         self._base_dir = base_dir
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
 
     def _load_array(self, filename: str) -> List[Dict[str, Any]]:
         path = self._base_dir / filename
@@ -22,6 +35,83 @@ class JSONStorage(StorageInterface):
         except Exception:
             return []
 
+    def _iter_array(self, filename: str) -> Iterator[Dict[str, Any]]:
+        # Lit le tableau JSON par blocs et décode un élément à la fois :
+        # seul l'enregistrement courant (plus un bloc de texte) reste en mémoire.
+        path = self._base_dir / filename
+        if not path.exists():
+            return
+        with path.open("r", encoding="utf-8") as fh:
+            buf = ""
+            pos = 0
+            eof = False
+
+            def fill() -> bool:
+                nonlocal buf, pos, eof
+                if eof:
+                    return False
+                chunk = fh.read(self._chunk_size)
+                if not chunk:
+                    eof = True
+                    return False
+                buf = buf[pos:] + chunk
+                pos = 0
+                return True
+
+            def skip(chars: str) -> str:
+                nonlocal pos
+                while True:
+                    while pos < len(buf) and buf[pos] in chars:
+                        pos += 1
+                    if pos < len(buf) or not fill():
+                        return buf[pos] if pos < len(buf) else ""
+
+            def close() -> None:
+                # Après le « ] » final, seuls des blancs sont permis (json.load : « Extra data »).
+                nonlocal pos
+                pos += 1
+                if skip(_WHITESPACE) != "":
+                    raise json.JSONDecodeError("Extra data", buf, pos)
+
+            if skip(_WHITESPACE + "\ufeff") != "[":
+                return
+            pos += 1
+            if skip(_WHITESPACE) == "]":
+                close()
+                return
+            while True:
+                if skip(_WHITESPACE) in ("", ",", "]"):
+                    # Élément vide ([1,,2], [1,]) ou tableau non fermé : refusé comme json.load.
+                    raise json.JSONDecodeError("Expecting value", buf, pos)
+                try:
+                    item, end = self._decoder.raw_decode(buf, pos)
+                    # Un nombre coupé en fin de bloc (ex: 3.|5) doit être relu en entier.
+                    if (end >= len(buf) or buf[end] not in _WHITESPACE + ",]") and fill():
+                        continue
+                except json.JSONDecodeError as exc:
+                    # Élément coupé par la fin du bloc : on relit avec un bloc de plus.
+                    # Ailleurs, c'est du JSON invalide : inutile de lire le reste du fichier.
+                    if _truncated(exc, buf) and fill():
+                        continue
+                    raise
+                pos = end
+                yield item
+                sep = skip(_WHITESPACE)
+                if sep == "]":
+                    close()
+                    return
+                if sep != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+                pos += 1
+
+    def stamp(self, name: str) -> Optional[Tuple[int, int]]:
+        # (taille, mtime) du fichier de la collection : change dès qu'il est réécrit.
+        try:
+            st = (self._base_dir / f"{name}.json").stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
     def load_members(self) -> List[Dict[str, Any]]:
         return self._load_array("members.json")
 
@@ -33,3 +123,15 @@ class JSONStorage(StorageInterface):
 
     def load_donations(self) -> List[Dict[str, Any]]:
         return self._load_array("donations.json")
+
+    def iter_members(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_array("members.json")
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_array("events.json")
+
+    def iter_subscriptions(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_array("subscriptions.json")
+
+    def iter_donations(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_array("donations.json")
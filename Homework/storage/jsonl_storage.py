@@ -0,0 +1,300 @@
+from __future__ import annotations
+import json
+import marshal
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from interfaces.storage import Storage
+from interfaces.storage_interface import COLLECTIONS, StorageInterface
+from storage.codec import dumps
+
+
+_INDEX_VERSION = 1
+# Champs indexés par collection : valeur (en texte) -> offsets des lignes.
+INDEXED_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "members": ("student_id", "teacher_id"),
+    "events": ("event_name",),
+    "subscriptions": ("student_id",),
+    "donations": (),
+}
+
+_BATCH_LINES = 10_000
+
+# champ -> valeur -> offset (ou liste d'offsets si la valeur se répète)
+_Offsets = Dict[str, Dict[str, Any]]
+
+
+def _id_key(value: Any) -> Optional[str]:
+    # 7, "7" et 7.0 désignent le même membre.
+    if value is None or value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _batches(fh: Any) -> Iterator[List[bytes]]:
+    batch: List[bytes] = []
+    for raw in fh:
+        batch.append(raw)
+        if len(batch) >= _BATCH_LINES:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _decode_lines(lines: List[bytes]) -> List[Dict[str, Any]]:
+    # Un json.loads par lot plutôt que par ligne : bien moins d'appels.
+    if not lines:
+        return []
+    return json.loads(b"[" + b",".join(lines) + b"]")
+
+
+class _Mapped:
+    """Fichier .jsonl ouvert en mmap et son index d'offsets."""
+
+    def __init__(self, stamp: Tuple[int, int], mm: Optional[mmap.mmap], offsets: _Offsets) -> None:
+        self.stamp = stamp
+        self.mm = mm
+        self.offsets = offsets
+
+    def line(self, offset: int) -> Dict[str, Any]:
+        assert self.mm is not None
+        end = self.mm.find(b"\n", offset)
+        return json.loads(self.mm[offset:end if end != -1 else len(self.mm)])
+
+    def close(self) -> None:
+        if self.mm is not None:
+            self.mm.close()
+
+
+class JSONLStorage(StorageInterface, Storage):
+    """Variante JSON Lines de ``JSONStorage`` : un enregistrement par ligne.
+
+    Un index ``<nom>.jsonl.idx`` (marshal) associe ``student_id`` / ``teacher_id``
+    (et ``event_name``) aux offsets des lignes ; le fichier est lu en mmap, donc
+    ``get_student`` coûte une recherche de fin de ligne et un ``json.loads``.
+    L'index porte la taille et le mtime du .jsonl et est reconstruit s'il ne
+    correspond plus (fichier modifié à la main, copie, etc.).
+    """
+
+    def __init__(self, base_dir: Path) -> None:
+        self._base_dir = Path(base_dir)
+        self._lock = threading.Lock()
+        self._mapped: Dict[str, _Mapped] = {}
+
+    def _path(self, name: str) -> Path:
+        return self._base_dir / f"{name}.jsonl"
+
+    def _index_path(self, name: str) -> Path:
+        return self._base_dir / f"{name}.jsonl.idx"
+
+    def stamp(self, name: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = self._path(name).stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    # -- index -----------------------------------------------------------------------
+
+    @staticmethod
+    def _add_offset(by_value: Dict[str, Any], key: str, pos: int) -> None:
+        # Un seul offset (cas courant) gardé tel quel, une liste au-delà.
+        current = by_value.get(key)
+        if current is None:
+            by_value[key] = pos
+        elif isinstance(current, list):
+            current.append(pos)
+        else:
+            by_value[key] = [current, pos]
+
+    @classmethod
+    def _scan(cls, fh: Any, fields: Iterable[str]) -> _Offsets:
+        offsets: _Offsets = {f: {} for f in fields}
+        pos = 0
+        for batch in _batches(fh):
+            positions = []
+            lines = []
+            for raw in batch:
+                if raw.strip():
+                    positions.append(pos)
+                    lines.append(raw)
+                pos += len(raw)
+            for start, record in zip(positions, _decode_lines(lines)):
+                for f, by_value in offsets.items():
+                    key = _id_key(record.get(f))
+                    if key is not None:
+                        cls._add_offset(by_value, key, start)
+        return offsets
+
+    def _write_index(self, name: str, stamp: Tuple[int, int], offsets: _Offsets) -> None:
+        path = self._index_path(name)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(marshal.dumps((_INDEX_VERSION, stamp, offsets)))
+        os.replace(tmp, path)
+
+    def _read_index(self, name: str, stamp: Tuple[int, int]) -> Optional[_Offsets]:
+        try:
+            version, saved, offsets = marshal.loads(self._index_path(name).read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != _INDEX_VERSION or tuple(saved) != stamp:
+            return None
+        return offsets
+
+    def rebuild_index(self, name: str) -> _Offsets:
+        """Relit ``<nom>.jsonl`` et réécrit son index."""
+        stamp = self.stamp(name)
+        if stamp is None:
+            return {f: {} for f in INDEXED_FIELDS[name]}
+        with self._path(name).open("rb") as fh:
+            offsets = self._scan(fh, INDEXED_FIELDS[name])
+        self._write_index(name, stamp, offsets)
+        return offsets
+
+    def _open(self, name: str) -> Optional[_Mapped]:
+        stamp = self.stamp(name)
+        with self._lock:
+            current = self._mapped.get(name)
+            if current is not None and current.stamp == stamp:
+                return current
+            if current is not None:
+                current.close()
+                del self._mapped[name]
+            if stamp is None:
+                return None
+            offsets = self._read_index(name, stamp)
+            if offsets is None:
+                offsets = self.rebuild_index(name)
+            mm = None
+            if stamp[0] > 0:
+                with self._path(name).open("rb") as fh:
+                    mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            mapped = self._mapped[name] = _Mapped(stamp, mm, offsets)
+            return mapped
+
+    def close(self) -> None:
+        with self._lock:
+            for mapped in self._mapped.values():
+                mapped.close()
+            self._mapped.clear()
+
+    def __enter__(self) -> "JSONLStorage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- accès direct ----------------------------------------------------------------
+
+    def _lookup(self, name: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        mapped = self._open(name)
+        key = _id_key(value)
+        if mapped is None or key is None:
+            return []
+        found = mapped.offsets.get(field, {}).get(key)
+        if found is None:
+            return []
+        return [mapped.line(off) for off in (found if isinstance(found, list) else [found])]
+
+    def get_student(self, student_id: Any) -> Optional[Dict[str, Any]]:
+        rows = self._lookup("members", "student_id", student_id)
+        return rows[0] if rows else None
+
+    def get_teacher(self, teacher_id: Any) -> Optional[Dict[str, Any]]:
+        rows = self._lookup("members", "teacher_id", teacher_id)
+        return rows[0] if rows else None
+
+    def get_event(self, event_name: str) -> Optional[Dict[str, Any]]:
+        rows = self._lookup("events", "event_name", event_name)
+        return rows[0] if rows else None
+
+    def subscriptions_for_student(self, student_id: Any) -> List[Dict[str, Any]]:
+        return self._lookup("subscriptions", "student_id", student_id)
+
+    # -- lecture complète ------------------------------------------------------------
+
+    def _iter_lines(self, name: str) -> Iterator[Dict[str, Any]]:
+        path = self._path(name)
+        if not path.exists():
+            return
+        with path.open("rb") as fh:
+            for batch in _batches(fh):
+                yield from _decode_lines([raw for raw in batch if raw.strip()])
+
+    def load_members(self) -> List[Dict[str, Any]]:
+        return list(self._iter_lines("members"))
+
+    def load_events(self) -> List[Dict[str, Any]]:
+        return list(self._iter_lines("events"))
+
+    def load_subscriptions(self) -> List[Dict[str, Any]]:
+        return list(self._iter_lines("subscriptions"))
+
+    def load_donations(self) -> List[Dict[str, Any]]:
+        return list(self._iter_lines("donations"))
+
+    def iter_members(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_lines("members")
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_lines("events")
+
+    def iter_subscriptions(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_lines("subscriptions")
+
+    def iter_donations(self) -> Iterator[Dict[str, Any]]:
+        return self._iter_lines("donations")
+
+    # -- écriture --------------------------------------------------------------------
+
+    def _replace(self, name: str, records: Iterable[Dict[str, Any]]) -> None:
+        # Offsets relevés pendant l'écriture : pas de relecture pour l'index.
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(name)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        offsets: _Offsets = {f: {} for f in INDEXED_FIELDS[name]}
+        pos = 0
+        with tmp.open("wb") as fh:
+            for r in records:
+                for f, by_value in offsets.items():
+                    key = _id_key(r.get(f))
+                    if key is not None:
+                        self._add_offset(by_value, key, pos)
+                line = dumps(r).encode("utf-8") + b"\n"
+                fh.write(line)
+                pos += len(line)
+        os.replace(tmp, path)
+        self._write_index(name, self.stamp(name), offsets)
+
+    def save_members(self, members: List[dict]) -> None:
+        self._replace("members", members)
+
+    def save_events(self, events: List[dict]) -> None:
+        self._replace("events", events)
+
+    def save_subscriptions(self, subscriptions: List[dict]) -> None:
+        self._replace("subscriptions", subscriptions)
+
+    def save_donations(self, donations: List[dict]) -> None:
+        self._replace("donations", donations)
+
+    def import_from(self, source: StorageInterface) -> None:
+        for name in COLLECTIONS:
+            loader = getattr(source, f"iter_{name}", None) or getattr(source, f"load_{name}")
+            self._replace(name, loader())
+
+    @classmethod
+    def from_json_dir(cls, data_dir: Path, jsonl_dir: Optional[Path] = None) -> "JSONLStorage":
+        """Convertit les tableaux ``<nom>.json`` de ``data_dir`` en ``<nom>.jsonl`` (+ index)."""
+        from storage.json_storage import JSONStorage
+
+        storage = cls(Path(jsonl_dir) if jsonl_dir is not None else Path(data_dir))
+        storage.import_from(JSONStorage(Path(data_dir)))
+        return storage
+
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import hashlib
+import marshal
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from interfaces.storage_interface import COLLECTIONS, StorageInterface
+
+
+_FORMAT_VERSION = 1
+_HASH_CHUNK = 1024 * 1024
+
+
+class SnapshotStorage(StorageInterface):
+    """Cache binaire (marshal) devant un autre StorageInterface.
+
+    Chaque collection est gardée dans ``<cache_dir>/<nom>.<empreinte>.snap`` ;
+    le snapshot n'est utilisé que si la taille, le mtime et le hash du fichier
+    source correspondent encore, sinon il est reconstruit depuis ``inner``.
+    Les ``iter_*`` lisent au fil de l'eau depuis ``inner`` sans toucher aux
+    snapshots (un snapshot se charge et s'écrit en entier).
+    """
+
+    def __init__(
+        self,
+        inner: StorageInterface,
+        data_dir: Path,
+        cache_dir: Optional[Path] = None,
+        keep: int = 1,
+    ) -> None:
+        self._inner = inner
+        self._data_dir = Path(data_dir)
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else self._data_dir / ".snapshots"
+        self._keep = max(1, keep)
+
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        h = hashlib.sha1()
+        with path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _snapshots(self, name: str) -> List[Path]:
+        if not self._cache_dir.exists():
+            return []
+        found = self._cache_dir.glob(f"{name}.*.snap")
+        return sorted(found, key=lambda p: p.stat().st_mtime_ns, reverse=True)
+
+    @staticmethod
+    def _read_header(path: Path) -> Optional[Tuple[int, int, int, str]]:
+        try:
+            with path.open("rb") as fh:
+                header = marshal.load(fh)
+            if isinstance(header, tuple) and len(header) == 4:
+                return header
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        return None
+
+    def _read_payload(self, path: Path) -> Optional[List[Dict[str, Any]]]:
+        try:
+            with path.open("rb") as fh:
+                marshal.load(fh)
+                # loads() sur le reste du fichier : marshal.load() lit par petits
+                # morceaux et est bien plus lent sur un gros snapshot.
+                data = marshal.loads(fh.read())
+            return data if isinstance(data, list) else None
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def _write_snapshot(self, name: str, stamp: Tuple[int, int], digest: str, records: List[Dict[str, Any]]) -> None:
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            target = self._cache_dir / f"{name}.{digest[:16]}.snap"
+            tmp = target.with_suffix(".tmp")
+            with tmp.open("wb") as fh:
+                marshal.dump((_FORMAT_VERSION, stamp[0], stamp[1], digest), fh)
+                marshal.dump(records, fh)
+            os.replace(tmp, target)
+        except (OSError, ValueError):
+            # Données non sérialisables ou disque en lecture seule : on se passe du cache.
+            return
+        self._evict(name, keep=target)
+
+    def _evict(self, name: str, keep: Path) -> None:
+        old = [p for p in self._snapshots(name) if p != keep][self._keep - 1:]
+        for p in old:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+    def _load(self, name: str, loader: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        source = self._data_dir / f"{name}.json"
+        if not source.exists():
+            return loader()
+        st = source.stat()
+        stamp = (st.st_size, st.st_mtime_ns)
+        digest: Optional[str] = None
+        for snap in self._snapshots(name):
+            header = self._read_header(snap)
+            if header is None or header[0] != _FORMAT_VERSION or header[1:3] != stamp:
+                continue
+            if digest is None:
+                digest = self._file_digest(source)
+            if header[3] == digest:
+                data = self._read_payload(snap)
+                if data is not None:
+                    return data
+        if digest is None:
+            digest = self._file_digest(source)
+        records = loader()
+        self._write_snapshot(name, stamp, digest, records)
+        return records
+
+    def stamp(self, name: str) -> Optional[Tuple[int, int]]:
+        inner_stamp = getattr(self._inner, "stamp", None)
+        if inner_stamp is not None:
+            return inner_stamp(name)
+        try:
+            st = (self._data_dir / f"{name}.json").stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def clear(self) -> None:
+        for name in COLLECTIONS:
+            for p in self._snapshots(name):
+                p.unlink(missing_ok=True)
+
+    def load_members(self) -> List[Dict[str, Any]]:
+        return self._load("members", self._inner.load_members)
+
+    def load_events(self) -> List[Dict[str, Any]]:
+        return self._load("events", self._inner.load_events)
+
+    def load_subscriptions(self) -> List[Dict[str, Any]]:
+        return self._load("subscriptions", self._inner.load_subscriptions)
+
+    def load_donations(self) -> List[Dict[str, Any]]:
+        return self._load("donations", self._inner.load_donations)
+
+    def _iter(self, name: str) -> Iterator[Dict[str, Any]]:
+        loader = getattr(self._inner, f"iter_{name}", None)
+        if loader is None:
+            return iter(getattr(self, f"load_{name}")())
+        return loader()
+
+    def iter_members(self) -> Iterator[Dict[str, Any]]:
+        return self._iter("members")
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        return self._iter("events")
+
+    def iter_subscriptions(self) -> Iterator[Dict[str, Any]]:
+        return self._iter("subscriptions")
+
+    def iter_donations(self) -> Iterator[Dict[str, Any]]:
+        return self._iter("donations")
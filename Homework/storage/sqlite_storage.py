@@ -0,0 +1,174 @@
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from interfaces.storage import Storage
+from interfaces.storage_interface import StorageInterface
+from storage.codec import dumps
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER,
+    teacher_id INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_members_student_id ON members(student_id);
+CREATE INDEX IF NOT EXISTS idx_members_teacher_id ON members(teacher_id);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    event_name TEXT,
+    event_date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_event_date ON events(event_date);
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER,
+    status TEXT COLLATE NOCASE,
+    date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_student_id ON subscriptions(student_id);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_status ON subscriptions(status);
+
+CREATE TABLE IF NOT EXISTS donations (
+    id INTEGER PRIMARY KEY,
+    date TEXT,
+    data TEXT NOT NULL
+);
+"""
+
+
+def _date_str(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _member_row(r: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (r.get("student_id"), r.get("teacher_id"), dumps(r))
+
+
+def _event_row(r: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (r.get("event_name", r.get("name")), _date_str(r.get("event_date")), dumps(r))
+
+
+def _subscription_row(r: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (r.get("student_id"), r.get("status"), _date_str(r.get("date")), dumps(r))
+
+
+def _donation_row(r: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (_date_str(r.get("date")), dumps(r))
+
+
+_TABLES = {
+    "members": ("INSERT INTO members(student_id, teacher_id, data) VALUES (?, ?, ?)", _member_row),
+    "events": ("INSERT INTO events(event_name, event_date, data) VALUES (?, ?, ?)", _event_row),
+    "subscriptions": ("INSERT INTO subscriptions(student_id, status, date, data) VALUES (?, ?, ?, ?)", _subscription_row),
+    "donations": ("INSERT INTO donations(date, data) VALUES (?, ?)", _donation_row),
+}
+
+
+class SQLiteStorage(StorageInterface, Storage):
+    """Stockage SQLite (stdlib uniquement) : chaque enregistrement est gardé en JSON,
+    les colonnes de recherche (ids, dates, statut) sont extraites et indexées."""
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = Path(db_path)
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "SQLiteStorage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- lecture ---------------------------------------------------------------
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def load_members(self) -> List[Dict[str, Any]]:
+        return self._query("SELECT data FROM members ORDER BY id")
+
+    def load_events(self) -> List[Dict[str, Any]]:
+        return self._query("SELECT data FROM events ORDER BY id")
+
+    def load_subscriptions(self) -> List[Dict[str, Any]]:
+        return self._query("SELECT data FROM subscriptions ORDER BY id")
+
+    def load_donations(self) -> List[Dict[str, Any]]:
+        return self._query("SELECT data FROM donations ORDER BY id")
+
+    def get_student(self, student_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT data FROM members WHERE student_id = ? ORDER BY id LIMIT 1", (student_id,))
+        return rows[0] if rows else None
+
+    def get_teacher(self, teacher_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT data FROM members WHERE teacher_id = ? ORDER BY id LIMIT 1", (teacher_id,))
+        return rows[0] if rows else None
+
+    def events_between(self, start: Any, end: Any) -> List[Dict[str, Any]]:
+        # Dates ISO (AAAA-MM-JJ) : l'ordre lexicographique suit l'ordre chronologique.
+        return self._query(
+            "SELECT data FROM events WHERE event_date BETWEEN ? AND ? ORDER BY event_date, id",
+            (_date_str(start), _date_str(end)),
+        )
+
+    def subscriptions_for_student(self, student_id: int) -> List[Dict[str, Any]]:
+        return self._query("SELECT data FROM subscriptions WHERE student_id = ? ORDER BY id", (student_id,))
+
+    def subscriptions_by_status(self, status: str) -> List[Dict[str, Any]]:
+        return self._query("SELECT data FROM subscriptions WHERE status = ? ORDER BY id", (status,))
+
+    # -- écriture --------------------------------------------------------------
+
+    def _replace(self, table: str, records: Iterable[Dict[str, Any]]) -> None:
+        insert, to_row = _TABLES[table]
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {table}")
+            self._conn.executemany(insert, (to_row(r) for r in records))
+
+    def save_members(self, members: List[dict]) -> None:
+        self._replace("members", members)
+
+    def save_events(self, events: List[dict]) -> None:
+        self._replace("events", events)
+
+    def save_subscriptions(self, subscriptions: List[dict]) -> None:
+        self._replace("subscriptions", subscriptions)
+
+    def save_donations(self, donations: List[dict]) -> None:
+        self._replace("donations", donations)
+
+    def import_from(self, source: StorageInterface) -> None:
+        # Utilise les générateurs iter_* quand la source les propose (JSONStorage),
+        # pour ne jamais matérialiser un fichier entier pendant l'import.
+        for table in _TABLES:
+            loader = getattr(source, f"iter_{table}", None) or getattr(source, f"load_{table}")
+            self._replace(table, loader())
+
+    @classmethod
+    def from_json_dir(cls, data_dir: Path, db_path: Path) -> "SQLiteStorage":
+        from storage.json_storage import JSONStorage
+
+        storage = cls(db_path)
+        storage.import_from(JSONStorage(Path(data_dir)))
+        return storage
@@ -0,0 +1,190 @@
+from __future__ import annotations
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from interfaces.storage_interface import COLLECTIONS
+from models.subscription import Subscription
+from services.group_roster import GroupRoster
+from services.revenue_ledger import RevenueLedger, subscription_from_record
+from storage.codec import dumps
+from ui.web_ui import (
+    _TABS,
+    _TAIL_LINES,
+    _Totals,
+    _build_member_maps,
+    _donation_rows,
+    _event_rows,
+    _group_rows,
+    _head_lines,
+    _index_student,
+    _link_events,
+    _parse_events,
+    _section_lines,
+    _split_members,
+    _student_rows,
+    _subscription_rows,
+    _teacher_rows,
+)
+
+# Collections dont dépend chaque étape / chaque onglet du tableau de bord.
+STAGE_DEPENDENCIES: Dict[str, FrozenSet[str]] = {
+    "split_members": frozenset({"members"}),
+    "member_maps": frozenset({"members"}),
+    "parse_events": frozenset({"members", "events"}),
+    "group_roster": frozenset({"members", "events"}),
+}
+SECTION_DEPENDENCIES: Dict[str, FrozenSet[str]] = {
+    "students": frozenset({"members"}),
+    "teachers": frozenset({"members"}),
+    "groups": frozenset({"members", "events"}),
+    "events": frozenset({"members", "events"}),
+    "subscriptions": frozenset({"members", "subscriptions"}),
+    "donations": frozenset({"donations"}),
+}
+
+
+class DashboardPipeline:
+    """Étapes de ``WebUI`` (``_split_members``, ``_build_member_maps``,
+    ``_parse_events``, rendu des onglets) gardées en cache.
+
+    ``update(collection, records)`` n'invalide que les étapes et onglets qui
+    dépendent de cette collection ; ``render()`` ne recalcule que ceux-là et
+    produit le même HTML que ``_render_html``.
+
+    ``ledger`` (montants saisis, comme le tableau de bord) vit d'une
+    régénération à l'autre : seuls les abonnements ajoutés ou retirés y sont
+    reportés, et il donne les totaux de l'onglet Subscriptions et les impayés.
+    """
+
+    def __init__(self) -> None:
+        self._inputs: Dict[str, List[Dict[str, Any]]] = {name: [] for name in COLLECTIONS}
+        self.ledger = RevenueLedger(value="amount")
+        self.ledger.track()
+        # Enregistrement JSON (clés triées) -> modèles présents dans le registre.
+        self._ledger_models: Dict[str, List[Subscription]] = {}
+        self._stages: Dict[str, Any] = {}
+        self._sections: Dict[str, str] = {}
+        self._html: Optional[str] = None
+        self.version = 0
+        self.last_computed: List[str] = []
+
+    def update(self, collection: str, records: Iterable[Dict[str, Any]]) -> None:
+        if collection not in self._inputs:
+            raise KeyError(collection)
+        self._inputs[collection] = list(records)
+        if collection == "members":
+            self._sync_groups()
+        elif collection == "subscriptions":
+            self._sync_subscriptions()
+        self.invalidate({collection})
+
+    def update_project(self, project: Dict[str, Any]) -> None:
+        for name in COLLECTIONS:
+            self.update(name, project.get(name, []))
+
+    def records(self, collection: str) -> List[Dict[str, Any]]:
+        return self._inputs[collection]
+
+    def invalidate(self, collections: Set[str]) -> None:
+        for stage, deps in STAGE_DEPENDENCIES.items():
+            if deps & collections:
+                self._stages.pop(stage, None)
+        for key, deps in SECTION_DEPENDENCIES.items():
+            if deps & collections:
+                self._sections.pop(key, None)
+        self._html = None
+        self.version += 1
+
+    def affected_sections(self, collections: Set[str]) -> List[str]:
+        return [key for key, deps in SECTION_DEPENDENCIES.items() if deps & collections]
+
+    def arrears(self, min_amount: float = 0.0) -> List[Tuple[Any, float]]:
+        return self.ledger.arrears(min_amount)
+
+    # -- registre des abonnements ------------------------------------------------------
+
+    def _sync_groups(self) -> None:
+        for m in self._inputs["members"]:
+            if "student_id" in m:
+                self.ledger.set_group(m["student_id"], m.get("groupe", ""))
+
+    def _sync_subscriptions(self) -> None:
+        # Différence par contenu : un abonnement inchangé garde son modèle et
+        # ses cumuls, seuls les ajouts et retraits touchent le registre.
+        current: Dict[str, List[Dict[str, Any]]] = {}
+        for r in self._inputs["subscriptions"]:
+            current.setdefault(dumps(r, sort_keys=True), []).append(r)
+        previous = self._ledger_models
+        kept: Dict[str, List[Subscription]] = {}
+        added: List[Subscription] = []
+        for key, records in current.items():
+            models = previous.pop(key, [])
+            while len(models) > len(records):
+                self.ledger.remove(models.pop())
+            for r in records[len(models):]:
+                models.append(subscription_from_record(r))
+                added.append(models[-1])
+            kept[key] = models
+        for models in previous.values():
+            for sub in models:
+                self.ledger.remove(sub)
+        self.ledger.add_many(added)
+        self._ledger_models = kept
+
+    # -- étapes --------------------------------------------------------------------
+
+    def _stage(self, name: str) -> Any:
+        if name not in self._stages:
+            self.last_computed.append(name)
+            self._stages[name] = self._compute(name)
+        return self._stages[name]
+
+    def _compute(self, name: str) -> Any:
+        if name == "split_members":
+            return _split_members(self._inputs["members"])
+        if name == "member_maps":
+            return _build_member_maps(*self._stage("split_members"))
+        if name == "parse_events":
+            s_map, t_map = self._stage("member_maps")
+            return _parse_events(self._inputs["events"], s_map, t_map)
+        if name == "group_roster":
+            roster = GroupRoster()
+            id_to_name: Dict[int, str] = {}
+            students, _teachers = self._stage("split_members")
+            for s in students:
+                _index_student(s, roster, id_to_name)
+            return _link_events(roster, self._stage("parse_events"))
+        raise KeyError(name)
+
+    def _render_section(self, key: str) -> str:
+        totals = _Totals()
+        if key == "students":
+            lines = _section_lines(key, _student_rows(self._stage("split_members")[0]))
+        elif key == "teachers":
+            lines = _section_lines(key, _teacher_rows(self._stage("split_members")[1]))
+        elif key == "groups":
+            lines = _section_lines(key, _group_rows(self._stage("group_roster")))
+        elif key == "events":
+            lines = _section_lines(key, _event_rows(self._stage("parse_events")))
+        elif key == "subscriptions":
+            s_map = self._stage("member_maps")[0]
+            summary = self.ledger.totals()
+            totals.paid, totals.unpaid = summary["paid"], summary["unpaid"]
+            rows = _subscription_rows(self._inputs["subscriptions"], s_map, _Totals())
+            lines = _section_lines(key, rows, totals.subscriptions_line)
+        else:
+            rows = _donation_rows(self._inputs["donations"], totals)
+            lines = _section_lines(key, rows, totals.donations_line)
+        return "\n".join(lines)
+
+    def section(self, key: str) -> str:
+        if key not in self._sections:
+            self.last_computed.append(f"section:{key}")
+            self._sections[key] = self._render_section(key)
+        return self._sections[key]
+
+    def render(self) -> str:
+        self.last_computed = []
+        if self._html is None:
+            parts = [*_head_lines(), *(self.section(key) for key, _title in _TABS), *_TAIL_LINES]
+            self._html = "\n".join(parts)
+        return self._html
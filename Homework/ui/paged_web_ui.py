@@ -0,0 +1,243 @@
+from __future__ import annotations
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.group_roster import GroupRoster
+from ui.web_ui import (
+    WebUI,
+    _STYLE,
+    _SECTION_EMPTY,
+    _SECTION_HEADERS,
+    _TABS,
+    _Totals,
+    _build_member_maps,
+    _donation_rows,
+    _esc,
+    _event_rows,
+    _group_row,
+    _index_student,
+    _link_events,
+    _parse_events,
+    _split_members,
+    _student_rows,
+    _subscription_rows,
+    _teacher_rows,
+)
+
+
+SortKey = Callable[[Dict[str, Any]], Any]
+# Rendu d'une page : toutes ses lignes en un appel (lots du noyau de rendu).
+PageRenderer = Callable[[List[Dict[str, Any]]], Iterable[str]]
+
+_MANIFEST = "pages.json"
+
+
+def _id_key(value: Any) -> Tuple[int, Any]:
+    # Ids numériques d'abord (ordre numérique), puis le reste en texte.
+    try:
+        return (0, int(value))
+    except (TypeError, ValueError):
+        return (1, "" if value is None else str(value))
+
+
+DEFAULT_SORT_KEYS: Dict[str, SortKey] = {
+    "students": lambda s: _id_key(s.get("student_id")),
+    "teachers": lambda t: _id_key(t.get("teacher_id")),
+    "groups": lambda g: g["groupe"],
+    "events": lambda e: (str(e.get("event_date", "")), str(e.get("event_name", ""))),
+    "subscriptions": lambda s: (_id_key(s.get("student_id")), str(s.get("date", ""))),
+    "donations": lambda d: (str(d.get("date", "")), str(d.get("donor_name", ""))),
+}
+
+
+class PagedWebUI(WebUI):
+    """Écrit chaque onglet en pages de ``page_size`` lignes plus un index.
+
+    Les lignes sont triées (tri stable) selon ``sort_keys`` pour que les limites
+    de pages ne dépendent pas de l'ordre des fichiers ; seules les pages dont le
+    contenu a changé depuis la dernière génération sont réécrites.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        page_size: int = 500,
+        sort_keys: Optional[Dict[str, SortKey]] = None,
+    ) -> None:
+        super().__init__(Path(out_dir) / "index.html")
+        self._out_dir = Path(out_dir)
+        self._page_size = max(1, page_size)
+        self._sort_keys = {**DEFAULT_SORT_KEYS, **(sort_keys or {})}
+        self.last_written: List[str] = []
+
+    def show_dashboard(self, project: Dict[str, Any]) -> None:
+        self.last_written = []
+        students, teachers = _split_members(project.get("members", []))
+        s_map, t_map = _build_member_maps(students, teachers)
+        events = _parse_events(project.get("events", []), s_map, t_map)
+        subs = list(project.get("subscriptions", []))
+        donations = list(project.get("donations", []))
+
+        roster = GroupRoster()
+        id_to_name: Dict[int, str] = {}
+        for s in students:
+            _index_student(s, roster, id_to_name)
+        _link_events(roster, events)
+        groups = [
+            {"groupe": g, "students": names, "teachers": teachers}
+            for g, names, teachers in roster.rows()
+        ]
+
+        # Les totaux des pages ne servent pas : ceux de l'index sont calculés à part.
+        renderers: Dict[str, Tuple[List[Dict[str, Any]], PageRenderer]] = {
+            "students": (students, _student_rows),
+            "teachers": (teachers, _teacher_rows),
+            "groups": (groups, lambda chunk: [_group_row(g["groupe"], g["students"], g["teachers"]) for g in chunk]),
+            "events": (events, _event_rows),
+            "subscriptions": (subs, lambda chunk: _subscription_rows(chunk, id_to_name, _Totals())),
+            "donations": (donations, lambda chunk: _donation_rows(chunk, _Totals())),
+        }
+
+        self._out_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._read_manifest()
+        pages: Dict[str, str] = {}
+        counts: Dict[str, Tuple[int, List[str]]] = {}
+        for key, _title in _TABS:
+            records, render = renderers[key]
+            ordered = sorted(records, key=self._sort_keys[key])
+            names = self._write_tab(key, ordered, render, manifest, pages)
+            counts[key] = (len(ordered), names)
+
+        pages["index.html"] = self._write_page("index.html", self._index_html(counts, subs, donations), manifest)
+        for stale in set(manifest) - set(pages):
+            (self._out_dir / stale).unlink(missing_ok=True)
+        (self._out_dir / _MANIFEST).write_text(json.dumps(pages, indent=2, sort_keys=True), encoding="utf-8")
+        self._open_in_browser()
+
+    def _read_manifest(self) -> Dict[str, str]:
+        path = self._out_dir / _MANIFEST
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_page(self, name: str, html: str, manifest: Dict[str, str]) -> str:
+        digest = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        path = self._out_dir / name
+        if manifest.get(name) != digest or not path.exists():
+            path.write_text(html, encoding="utf-8")
+            self.last_written.append(name)
+        return digest
+
+    def _write_tab(
+        self,
+        key: str,
+        ordered: List[Dict[str, Any]],
+        render: PageRenderer,
+        manifest: Dict[str, str],
+        pages: Dict[str, str],
+    ) -> List[str]:
+        n_pages = max(1, -(-len(ordered) // self._page_size))
+        names = [f"{key}-{i + 1:04d}.html" for i in range(n_pages)]
+        for i, name in enumerate(names):
+            chunk = ordered[i * self._page_size:(i + 1) * self._page_size]
+            rows = list(render(chunk))
+            prev_name = names[i - 1] if i > 0 else None
+            next_name = names[i + 1] if i + 1 < n_pages else None
+            html = self._tab_page_html(key, i + 1, rows, prev_name, next_name)
+            pages[name] = self._write_page(name, html, manifest)
+        return names
+
+    @staticmethod
+    def _page_shell(title: str, body: List[str]) -> str:
+        return "\n".join([
+            "<!doctype html>",
+            "<html lang='fr'>",
+            "<head>",
+            "<meta charset='utf-8' />",
+            f"<title>{_esc(title)}</title>",
+            _STYLE,
+            "</head>",
+            "<body>",
+            "<header>",
+            "<h1>Madrassa</h1>",
+            "</header>",
+            "<main class='container'>",
+            *body,
+            "</main>",
+            "<footer>© 2026 Madrassa.</footer>",
+            "</body>",
+            "</html>",
+        ])
+
+    def _tab_page_html(
+        self,
+        key: str,
+        number: int,
+        rows: List[str],
+        prev_name: Optional[str],
+        next_name: Optional[str],
+    ) -> str:
+        title = dict(_TABS)[key]
+        nav = ["<a href='index.html'>Index</a>"]
+        if prev_name:
+            nav.append(f"<a href='{prev_name}'>&larr; Previous</a>")
+        if next_name:
+            nav.append(f"<a href='{next_name}'>Next &rarr;</a>")
+        if not rows:
+            colspan, label = _SECTION_EMPTY[key]
+            rows = [f"<tr><td colspan='{colspan}'>{label}</td></tr>"]
+        body = [
+            f"<section id='tab-{key}' class='tab-section active'>",
+            f"<h2>{title} — page {number}</h2>",
+            f"<p class='subtitle'>{' | '.join(nav)}</p>",
+            "<table>",
+            "<thead><tr>",
+            *_SECTION_HEADERS[key],
+            "</tr></thead>",
+            "<tbody>",
+            *rows,
+            "</tbody>",
+            "</table>",
+            "</section>",
+        ]
+        return self._page_shell(f"Madrassa — {title} {number}", body)
+
+    def _index_html(
+        self,
+        counts: Dict[str, Tuple[int, List[str]]],
+        subs: List[Dict[str, Any]],
+        donations: List[Dict[str, Any]],
+    ) -> str:
+        total_paid = 0.0
+        total_unpaid = 0.0
+        for sub in subs:
+            amount = float(sub.get("amount", 0.0))
+            if str(sub.get("status", "unpaid")).lower() == "paid":
+                total_paid += amount
+            else:
+                total_unpaid += amount
+        total_don = sum(float(d.get("amount", 0.0)) for d in donations)
+
+        rows = []
+        for key, title in _TABS:
+            n, names = counts[key]
+            links = " ".join(f"<a href='{name}'>{i + 1}</a>" for i, name in enumerate(names))
+            rows.append(f"<tr><td>{title}</td><td>{n}</td><td>{links}</td></tr>")
+        body = [
+            "<section class='tab-section active'>",
+            "<h2>Index</h2>",
+            "<table>",
+            "<thead><tr><th>Tab</th><th>Rows</th><th>Pages</th></tr></thead>",
+            "<tbody>",
+            *rows,
+            "</tbody>",
+            "</table>",
+            f"<p class='subtitle'>Total paid: {total_paid:.2f} | Total unpaid: {total_unpaid:.2f}"
+            f" | Total donations: {total_don:.2f}</p>",
+            "</section>",
+        ]
+        return self._page_shell("Madrassa", body)
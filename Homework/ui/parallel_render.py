@@ -0,0 +1,138 @@
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+from models.member_store import MemberRows
+from services.group_roster import GroupRoster
+from ui.web_ui import (
+    _TAIL_LINES,
+    _Totals,
+    _donation_rows,
+    _event_rows,
+    _group_row,
+    _head_lines,
+    _index_student,
+    _link_events,
+    _render_html,
+    _section_lines,
+    _student_rows,
+    _subscription_amount,
+    _subscription_rows,
+    _teacher_rows,
+)
+
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# (onglet, lignes du bloc, contexte propre au bloc)
+_Task = Tuple[str, Sequence[Any], Dict[Any, Any]]
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _render_chunk(task: _Task) -> str:
+    # Exécuté dans un processus fils : doit rester une fonction de module (picklable).
+    key, records, ctx = task
+    if key == "students":
+        rows = _student_rows(records)
+    elif key == "teachers":
+        rows = _teacher_rows(records)
+    elif key == "groups":
+        rows = (_group_row(g, names, teachers) for g, names, teachers in records)
+    elif key == "events":
+        rows = _event_rows(records)
+    elif key == "subscriptions":
+        # Totaux recalculés côté parent, dans l'ordre d'origine.
+        rows = _subscription_rows(records, ctx, _Totals())
+    else:
+        rows = _donation_rows(records, _Totals())
+    return "\n".join(rows)
+
+
+def _chunks(records: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(records), size):
+        chunk = records[start:start + size]
+        # Vues MemberRows : copiées en dicts pour ne pas envoyer tout le MemberStore.
+        yield chunk.to_dicts() if isinstance(chunk, MemberRows) else chunk
+
+
+def _subscription_context(chunk: Sequence[Dict[str, Any]], id_to_name: Dict[int, str]) -> Dict[int, str]:
+    # Seuls les noms utiles au bloc sont envoyés au processus fils.
+    ctx: Dict[int, str] = {}
+    for sub in chunk:
+        try:
+            sid = int(sub.get("student_id"))
+        except (TypeError, ValueError):
+            continue
+        if sid in id_to_name:
+            ctx[sid] = id_to_name[sid]
+    return ctx
+
+
+def render_html_parallel(
+    students: Sequence[Mapping[str, Any]],
+    teachers: Sequence[Mapping[str, Any]],
+    events: List[Dict[str, Any]],
+    subs: List[Dict[str, Any]],
+    donations: List[Dict[str, Any]],
+    workers: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> str:
+    """Même HTML que ``_render_html``, les onglets (et les blocs de lignes des
+    grands onglets) étant rendus dans un pool de processus puis réassemblés
+    dans l'ordre. ``workers <= 1`` ou un pool indisponible : rendu série."""
+    workers = workers or default_workers()
+    if workers <= 1:
+        return _render_html(students, teachers, events, subs, donations)
+
+    roster = GroupRoster()
+    id_to_name: Dict[int, str] = {}
+    for s in students:
+        _index_student(s, roster, id_to_name)
+    groups = list(_link_events(roster, events).rows())
+
+    sections: List[Tuple[str, Sequence[Any]]] = [
+        ("students", students),
+        ("teachers", teachers),
+        ("groups", groups),
+        ("events", events),
+        ("subscriptions", subs),
+        ("donations", donations),
+    ]
+    tasks: List[_Task] = []
+    for key, records in sections:
+        for chunk in _chunks(records, max(1, chunk_size)):
+            ctx = _subscription_context(chunk, id_to_name) if key == "subscriptions" else {}
+            tasks.append((key, chunk, ctx))
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, max(1, len(tasks)))) as pool:
+            rendered = list(pool.map(_render_chunk, tasks))
+    except (OSError, BrokenProcessPool, NotImplementedError):
+        return _render_html(students, teachers, events, subs, donations)
+
+    by_section: Dict[str, List[str]] = {key: [] for key, _ in sections}
+    for (key, _chunk, _ctx), html in zip(tasks, rendered):
+        by_section[key].append(html)
+
+    # Totaux cumulés dans l'ordre d'origine : mêmes arrondis qu'en série.
+    totals = _Totals()
+    for sub in subs:
+        totals.add_subscription(*_subscription_amount(sub))
+    for d in donations:
+        totals.donations += float(d.get("amount", 0.0))
+
+    lines: List[str] = list(_head_lines())
+    for key, _records in sections:
+        footer = None
+        if key == "subscriptions":
+            footer = totals.subscriptions_line
+        elif key == "donations":
+            footer = totals.donations_line
+        lines.extend(_section_lines(key, by_section[key], footer))
+    lines.extend(_TAIL_LINES)
+    return "\n".join(lines)
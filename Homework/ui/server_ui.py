@@ -0,0 +1,227 @@
+from __future__ import annotations
+import gzip
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from interfaces.storage_interface import COLLECTIONS, StorageInterface
+from interfaces.ui_interface import UIInterface
+from ui.dashboard_pipeline import DashboardPipeline
+
+
+_GZIP_LEVEL = 6
+_PATHS = ("/", "/index.html", "/madrassa.html")
+
+
+def _accepts_gzip(header: Optional[str]) -> bool:
+    # « gzip;q=0 » refuse explicitement l'encodage.
+    for part in (header or "").split(","):
+        coding, _sep, params = part.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def _gzip_etag(etag: str) -> str:
+    # ETag fort propre à la version gzip : deux codages, deux validateurs.
+    return etag[:-1] + '-gz"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """``etag`` : ETag de la version non compressée. Comparaison faible : « W/ »
+    ignoré, et les suffixes « -gz » (le nôtre) ou « -gzip » (ajouté par certains
+    proxys) désignent le même contenu sous un autre codage."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for t in header.split(","):
+        tag = t.strip().removeprefix("W/")
+        for suffix in ('-gzip"', '-gz"'):
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)] + '"'
+                break
+        if tag == etag:
+            return True
+    return False
+
+
+class _DashboardHandler(BaseHTTPRequestHandler):
+    server: "_DashboardServer"
+
+    def do_GET(self) -> None:
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool) -> None:
+        if self.path.split("?", 1)[0] not in _PATHS:
+            self.send_error(404)
+            return
+        html, compressed, etag = self.server.ui.payload()
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        body = html
+        if _accepts_gzip(self.headers.get("Accept-Encoding")):
+            body = compressed
+            headers["ETag"] = _gzip_etag(etag)
+            headers["Content-Encoding"] = "gzip"
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            # 304 : l'ETag renvoyé est celui du codage de cette requête.
+            headers.pop("Content-Encoding", None)
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.ui.verbose:
+            super().log_message(format, *args)
+
+
+class _DashboardServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], ui: "ServerUI") -> None:
+        super().__init__(address, _DashboardHandler)
+        self.ui = ui
+
+
+class ServerUI(UIInterface):
+    """Sert le tableau de bord en HTTP au lieu d'écrire ``madrassa.html``.
+
+    Le HTML (et sa version gzip) est gardé en mémoire avec un ETag ; les
+    onglets viennent d'un ``DashboardPipeline``. À chaque requête (au plus une
+    fois par ``check_interval`` secondes), seules les collections dont le
+    ``stamp()`` du stockage a changé sont relues, et seuls les onglets qui en
+    dépendent sont re-rendus. Les requêtes simultanées partagent le même rendu.
+    """
+
+    def __init__(
+        self,
+        storage: Optional[StorageInterface] = None,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        check_interval: float = 1.0,
+        verbose: bool = False,
+    ) -> None:
+        self._storage = storage
+        self._host = host
+        self._port = port
+        self._check_interval = check_interval
+        self.verbose = verbose
+        self._pipeline = DashboardPipeline()
+        self._stamps: Dict[str, Any] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._cache: Optional[Tuple[bytes, bytes, str]] = None
+        self._cache_version = -1
+        self._server: Optional[_DashboardServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2] if self._server else (self._host, self._port)
+        return f"http://{host}:{port}/"
+
+    # -- UIInterface -----------------------------------------------------------------
+
+    def show_dashboard(self, project: Dict[str, Any]) -> None:
+        self.load(project)
+        self._bind()
+        print(f"Tableau de bord : {self.url} (Ctrl+C pour arrêter)")
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def load(self, project: Dict[str, Any]) -> None:
+        with self._lock:
+            for name in COLLECTIONS:
+                self._stamps[name] = self._stamp(name)
+                self._pipeline.update(name, project.get(name, []))
+            self._last_check = time.monotonic()
+
+    def start(self) -> str:
+        """Démarre le serveur dans un thread (tests, intégration) et renvoie son URL."""
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def shutdown(self) -> None:
+        if self._server is None:
+            return
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self._server = None
+
+    def _bind(self) -> None:
+        if self._server is None:
+            self._server = _DashboardServer((self._host, self._port), self)
+
+    # -- rendu en cache --------------------------------------------------------------
+
+    def _stamp(self, name: str) -> Any:
+        stamp = getattr(self._storage, "stamp", None)
+        return stamp(name) if stamp is not None else None
+
+    def _refresh(self) -> None:
+        if self._storage is None:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self._check_interval:
+            return
+        self._last_check = now
+        has_stamp = hasattr(self._storage, "stamp")
+        for name in COLLECTIONS:
+            if has_stamp:
+                stamp = self._stamp(name)
+                if stamp == self._stamps.get(name):
+                    continue
+                self._stamps[name] = stamp
+                self._pipeline.update(name, getattr(self._storage, f"load_{name}")())
+            else:
+                # Sans stamp(), on relit et on ne re-rend que si le contenu diffère.
+                records = getattr(self._storage, f"load_{name}")()
+                if records != self._pipeline.records(name):
+                    self._pipeline.update(name, records)
+
+    def payload(self) -> Tuple[bytes, bytes, str]:
+        """(HTML, HTML gzip, ETag) à jour avec le stockage."""
+        with self._lock:
+            self._refresh()
+            if self._cache is None or self._cache_version != self._pipeline.version:
+                html = self._pipeline.render().encode("utf-8")
+                compressed = gzip.compress(html, compresslevel=_GZIP_LEVEL, mtime=0)
+                etag = '"' + hashlib.sha1(html).hexdigest()[:20] + '"'
+                self._cache = (html, compressed, etag)
+                self._cache_version = self._pipeline.version
+            return self._cache
@@ -0,0 +1,434 @@
+from __future__ import annotations
+import json
+import math
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from services.group_roster import GroupRoster
+from ui.web_ui import (
+    WebUI,
+    _KIND_LABELS,
+    _SECTION_EMPTY,
+    _SECTION_HEADERS,
+    _TABS,
+    _TAIL_LINES,
+    _Totals,
+    _badge_class,
+    _build_member_maps,
+    _head_lines,
+    _index_student,
+    _link_events,
+    _parse_events,
+    _split_members,
+    _subscription_amount,
+    _subscription_student,
+    _text,
+)
+from utils.instrumentation import metrics
+from utils.render_kernel import Column
+
+
+# Une colonne est encodée par dictionnaire quand ses valeurs distinctes sont
+# au plus la moitié des lignes (statuts, groupes, dates, sources...).
+_DICT_RATIO = 0.5
+
+_VIRTUAL_STYLE = """
+    <style>
+      .vt-toolbar{display:flex;gap:12px;align-items:center;}
+      .vt-filter{
+        background:var(--bg-panel);
+        border:1px solid var(--border);
+        border-radius:8px;
+        color:var(--text-main);
+        padding:6px 10px;
+        font-size:13px;
+        min-width:260px;
+      }
+      .vt-count{color:var(--text-muted);font-size:12px;}
+      .vt-viewport{
+        max-height:70vh;
+        overflow:auto;
+        margin-top:12px;
+        border-radius:12px;
+        box-shadow:0 12px 30px rgba(15,23,42,0.8);
+      }
+      .vt-viewport table{margin-top:0;overflow:visible;box-shadow:none;}
+      .vt-viewport thead th{position:sticky;top:0;background:#020617;cursor:pointer;user-select:none;}
+      .vt-viewport thead th.vt-asc::after{content:" \\25B2";}
+      .vt-viewport thead th.vt-desc::after{content:" \\25BC";}
+      .vt-viewport tr:nth-child(even) td{background:transparent;}
+      .vt-viewport tr.vt-alt td{background:#020617;}
+      .vt-viewport tr:hover td{background:#111827;}
+      .vt-viewport tr.vt-pad td{padding:0;border:0;background:transparent;}
+    </style>
+    """
+
+# Rendu côté navigateur : chaque onglet est décodé à sa première ouverture,
+# seules les lignes visibles (plus une marge) existent dans le DOM ; tri et
+# filtre travaillent sur des tableaux d'indices.
+_VIRTUAL_SCRIPT = [
+    "<script>",
+    "const VT_OVERSCAN=10;",
+    "const vtTables={};",
+    "const vtCollator=new Intl.Collator(undefined,{numeric:true,sensitivity:'base'});",
+    "function vtText(c,i){",
+    "  if(c.dict){return c.dict[c.codes[i]];}",
+    "  if(c.kind!=='number'){return c.values[i];}",
+    "  return c.values[i]===null?'-':c.values[i].toFixed(2);",
+    "}",
+    "function vtLoad(key){",
+    "  if(vtTables[key]){return vtTables[key];}",
+    "  const src=document.getElementById('data-'+key);",
+    "  if(!src){return null;}",
+    "  const data=JSON.parse(src.textContent);",
+    "  src.remove();",
+    "  const t={key:key,cols:data.columns,n:data.rows,sortCol:-1,sortDir:1,rowH:0,match:null,pending:false};",
+    "  t.vp=document.getElementById('vp-'+key);",
+    "  t.body=document.getElementById('rows-'+key);",
+    "  t.count=document.getElementById('count-'+key);",
+    "  t.heads=Array.from(t.vp.querySelectorAll('thead th'));",
+    "  t.order=new Uint32Array(t.n);",
+    "  for(let i=0;i<t.n;i++){t.order[i]=i;}",
+    "  t.view=t.order;",
+    "  t.vp.addEventListener('scroll',()=>vtSchedule(t));",
+    "  t.heads.forEach((th,j)=>th.addEventListener('click',()=>vtSort(t,j)));",
+    "  const input=document.getElementById('filter-'+key);",
+    "  let timer=0;",
+    "  input.addEventListener('input',()=>{clearTimeout(timer);timer=setTimeout(()=>vtFilter(t,input.value),120);});",
+    "  vtTables[key]=t;",
+    "  return t;",
+    "}",
+    "function vtComparator(c){",
+    "  if(c.dict){",
+    "    if(!c.rank){",
+    "      const ids=c.dict.map((_,k)=>k).sort((a,b)=>vtCollator.compare(c.dict[a],c.dict[b]));",
+    "      c.rank=new Uint32Array(c.dict.length);",
+    "      ids.forEach((id,r)=>{c.rank[id]=r;});",
+    "    }",
+    "    const codes=c.codes,rank=c.rank;",
+    "    return (a,b)=>rank[codes[a]]-rank[codes[b]];",
+    "  }",
+    "  const v=c.values;",
+    "  if(c.kind==='number'){return (a,b)=>v[a]-v[b];}",
+    "  return (a,b)=>vtCollator.compare(v[a],v[b]);",
+    "}",
+    "function vtSort(t,j){",
+    "  t.sortDir=t.sortCol===j?-t.sortDir:1;",
+    "  t.sortCol=j;",
+    "  const cmp=vtComparator(t.cols[j]),dir=t.sortDir;",
+    "  const order=new Uint32Array(t.n);",
+    "  for(let i=0;i<t.n;i++){order[i]=i;}",
+    "  t.order=order.sort((a,b)=>dir*cmp(a,b)||a-b);",
+    "  t.heads.forEach((th,k)=>{",
+    "    th.classList.toggle('vt-asc',k===j&&dir>0);",
+    "    th.classList.toggle('vt-desc',k===j&&dir<0);",
+    "  });",
+    "  vtApply(t);",
+    "}",
+    "function vtFilter(t,query){",
+    "  const q=query.trim().toLowerCase();",
+    "  if(!q){t.match=null;vtApply(t);return;}",
+    "  const m=new Uint8Array(t.n);",
+    "  for(const c of t.cols){",
+    "    if(c.dict){",
+    "      const hit=c.dict.map(v=>v.toLowerCase().includes(q));",
+    "      const codes=c.codes;",
+    "      for(let i=0;i<t.n;i++){if(hit[codes[i]]){m[i]=1;}}",
+    "    }else{",
+    "      if(!c.lower){c.lower=c.values.map((v,i)=>vtText(c,i).toLowerCase());}",
+    "      const low=c.lower;",
+    "      for(let i=0;i<t.n;i++){if(!m[i]&&low[i].includes(q)){m[i]=1;}}",
+    "    }",
+    "  }",
+    "  t.match=m;",
+    "  vtApply(t);",
+    "}",
+    "function vtApply(t){",
+    "  t.view=t.match?t.order.filter(i=>t.match[i]):t.order;",
+    "  t.vp.scrollTop=0;",
+    "  vtRender(t);",
+    "}",
+    "function vtSpacer(height,span){",
+    "  const tr=document.createElement('tr');",
+    "  tr.className='vt-pad';",
+    "  const td=document.createElement('td');",
+    "  td.colSpan=span;",
+    "  td.style.height=height+'px';",
+    "  tr.appendChild(td);",
+    "  return tr;",
+    "}",
+    "function vtRender(t){",
+    "  t.pending=false;",
+    "  const view=t.view,total=view.length,cols=t.cols;",
+    "  const rowH=t.rowH||32;",
+    "  const first=Math.max(0,Math.floor(t.vp.scrollTop/rowH)-VT_OVERSCAN);",
+    "  const last=Math.min(total,first+Math.ceil(t.vp.clientHeight/rowH)+2*VT_OVERSCAN);",
+    "  const frag=document.createDocumentFragment();",
+    "  frag.appendChild(vtSpacer(first*rowH,cols.length));",
+    "  for(let r=first;r<last;r++){",
+    "    const i=view[r],tr=document.createElement('tr');",
+    "    if(r%2){tr.className='vt-alt';}",
+    "    for(const c of cols){",
+    "      const td=document.createElement('td');",
+    "      if(c.kind==='badge'){",
+    "        const span=document.createElement('span');",
+    "        span.className='badge '+c.classes[c.codes[i]];",
+    "        span.textContent=vtText(c,i);",
+    "        td.appendChild(span);",
+    "      }else{",
+    "        td.textContent=vtText(c,i);",
+    "      }",
+    "      tr.appendChild(td);",
+    "    }",
+    "    frag.appendChild(tr);",
+    "  }",
+    "  if(!total){",
+    "    const tr=document.createElement('tr'),td=document.createElement('td');",
+    "    td.colSpan=cols.length;",
+    "    td.textContent=t.body.dataset.empty;",
+    "    tr.appendChild(td);",
+    "    frag.appendChild(tr);",
+    "  }",
+    "  frag.appendChild(vtSpacer((total-last)*rowH,cols.length));",
+    "  t.body.replaceChildren(frag);",
+    "  t.count.textContent=total===t.n?t.n+' rows':total+' / '+t.n+' rows';",
+    "  if(!t.rowH&&last>first){",
+    "    // Hauteur réelle d'une ligne, mesurée au premier rendu visible.",
+    "    const measured=t.body.children[1].offsetHeight;",
+    "    if(measured){t.rowH=measured;if(measured!==rowH){vtRender(t);}}",
+    "  }",
+    "}",
+    "function vtSchedule(t){",
+    "  if(!t.pending){t.pending=true;requestAnimationFrame(()=>vtRender(t));}",
+    "}",
+    "const vtShowTab=showTab;",
+    "showTab=function(name){",
+    "  vtShowTab(name);",
+    "  const t=vtLoad(name);",
+    "  if(t){vtRender(t);}",
+    "};",
+    "window.addEventListener('resize',()=>Object.values(vtTables).forEach(vtSchedule));",
+    "</script>",
+]
+
+
+def _encode(values: List[Any], kind: str = "text", classes: Optional[Callable[[str], str]] = None) -> Dict[str, Any]:
+    """Colonne du payload : ``values`` brutes, ou ``dict`` + ``codes`` (indices).
+
+    Les badges sont toujours encodés par dictionnaire : ``classes`` donne la
+    classe CSS de chaque valeur distincte.
+    """
+    column: Dict[str, Any] = {"kind": kind}
+    if kind == "number":
+        # NaN / inf ne sont pas du JSON valide : null, affiché « - ».
+        column["values"] = [v if math.isfinite(v) else None for v in values]
+        return column
+    distinct = dict.fromkeys(values)
+    if classes is not None or len(distinct) <= len(values) * _DICT_RATIO:
+        index = {v: i for i, v in enumerate(distinct)}
+        column["dict"] = list(distinct)
+        column["codes"] = list(map(index.__getitem__, values))
+        if classes is not None:
+            column["classes"] = [classes(v) for v in distinct]
+    else:
+        column["values"] = values
+    return column
+
+
+def _texts(records: List[Dict[str, Any]], key: str) -> List[str]:
+    return Column(key).values(records)
+
+
+def _joined(records: List[Dict[str, Any]], key: str) -> List[str]:
+    return [", ".join(r.get(key, [])) for r in records]
+
+
+def _subscription_badge_class(status: str) -> str:
+    return "badge-paid" if status.lower() == "paid" else "badge-unpaid"
+
+
+def _student_columns(students: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        _encode(_texts(students, "student_id")),
+        _encode(_texts(students, "full_name")),
+        _encode(_texts(students, "email")),
+        _encode(_texts(students, "phone")),
+        _encode(_texts(students, "address")),
+        _encode(_texts(students, "join_date")),
+        _encode(_joined(students, "skills")),
+        _encode(_joined(students, "interests")),
+        _encode([str(s.get("subscription_status", "Pending")) for s in students], "badge", _badge_class),
+    ]
+
+
+def _teacher_columns(teachers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        _encode(_texts(teachers, "teacher_id")),
+        _encode(_texts(teachers, "full_name")),
+        _encode(_texts(teachers, "email")),
+        _encode(_texts(teachers, "phone")),
+        _encode(_texts(teachers, "address")),
+        _encode(_texts(teachers, "join_date")),
+        _encode(_joined(teachers, "skills")),
+        _encode(_joined(teachers, "interests")),
+    ]
+
+
+def _group_columns(rows: List[Tuple[str, List[str], List[str]]]) -> List[Dict[str, Any]]:
+    return [
+        _encode([_text(g) for g, _names, _teachers in rows]),
+        _encode([", ".join(teachers) or "-" for _g, _names, teachers in rows]),
+        _encode([", ".join(names) for _g, names, _teachers in rows]),
+    ]
+
+
+def _event_columns(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        _encode(_texts(events, "event_name")),
+        _encode(_texts(events, "description")),
+        _encode(_texts(events, "event_date")),
+        _encode([", ".join(_text(n) for n in e.get("organizers", [])) or "-" for e in events]),
+        _encode([", ".join(_text(n) for n in e.get("participants", [])) or "-" for e in events]),
+    ]
+
+
+def _subscription_columns(
+    subs: List[Dict[str, Any]],
+    id_to_name: Dict[int, str],
+    totals: _Totals,
+) -> List[Dict[str, Any]]:
+    amounts: List[float] = []
+    for sub in subs:
+        amount, paid = _subscription_amount(sub)
+        totals.add_subscription(amount, paid)
+        amounts.append(amount)
+    return [
+        _encode([_text(sub.get("student_id")) for sub in subs]),
+        _encode([_subscription_student(sub, id_to_name) for sub in subs]),
+        _encode([_KIND_LABELS.get(str(sub.get("kind", "base")).lower(), "Standard") for sub in subs]),
+        _encode(amounts, "number"),
+        _encode(_texts(subs, "date")),
+        _encode([str(sub.get("status", "unpaid")) for sub in subs], "badge", _subscription_badge_class),
+    ]
+
+
+def _donation_columns(donations: List[Dict[str, Any]], totals: _Totals) -> List[Dict[str, Any]]:
+    amounts = [float(d.get("amount", 0.0)) for d in donations]
+    for amount in amounts:
+        totals.donations += amount
+    return [
+        _encode(_texts(donations, "donor_name")),
+        _encode(_texts(donations, "source")),
+        _encode(amounts, "number"),
+        _encode(_texts(donations, "date")),
+        _encode(_texts(donations, "purpose")),
+        _encode(_texts(donations, "note")),
+    ]
+
+
+_SCRIPT_ESCAPES = str.maketrans({"<": "\\u003c", ">": "\\u003e", "&": "\\u0026"})
+
+
+def _payload(columns: List[Dict[str, Any]], rows: int) -> str:
+    text = json.dumps({"rows": rows, "columns": columns}, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    # Échappements JSON de < > & : rien dans le <script> ne peut fermer la
+    # balise ni ouvrir un commentaire (« </script> », « <!-- »), et JSON.parse
+    # rend le texte d'origine.
+    return text.translate(_SCRIPT_ESCAPES)
+
+
+def _virtual_section_lines(key: str, payload: str, footer: Optional[str] = None) -> Iterator[str]:
+    title = dict(_TABS)[key]
+    _colspan, label = _SECTION_EMPTY[key]
+    yield f"<section id='tab-{key}' class='tab-section'>"
+    yield f"<h2>{title}</h2>"
+    yield "<div class='vt-toolbar'>"
+    yield f"<input id='filter-{key}' class='vt-filter' type='search' placeholder='Filter…' />"
+    yield f"<span id='count-{key}' class='vt-count'></span>"
+    yield "</div>"
+    yield f"<div id='vp-{key}' class='vt-viewport'>"
+    yield "<table>"
+    yield "<thead><tr>"
+    yield from _SECTION_HEADERS[key]
+    yield "</tr></thead>"
+    yield f"<tbody id='rows-{key}' data-empty='{label}'></tbody>"
+    yield "</table>"
+    yield "</div>"
+    yield f"<script type='application/json' id='data-{key}'>{payload}</script>"
+    if footer is not None:
+        yield footer
+    yield "</section>"
+
+
+def _iter_virtual_html(
+    students: Sequence[Mapping[str, Any]],
+    teachers: Sequence[Mapping[str, Any]],
+    events: List[Dict[str, Any]],
+    subs: Iterable[Dict[str, Any]],
+    donations: Iterable[Dict[str, Any]],
+) -> Iterator[str]:
+    roster = GroupRoster()
+    id_to_name: Dict[int, str] = {}
+    for s in students:
+        _index_student(s, roster, id_to_name)
+    _link_events(roster, events)
+    subs = list(subs)
+    donations = list(donations)
+    totals = _Totals()
+
+    head = _head_lines()
+    end = head.index("</head>")
+    head[end:end] = [_VIRTUAL_STYLE, *_VIRTUAL_SCRIPT]
+    yield from head
+    yield from _virtual_section_lines("students", _payload(_student_columns(students), len(students)))
+    yield from _virtual_section_lines("teachers", _payload(_teacher_columns(teachers), len(teachers)))
+    groups = list(roster.rows())
+    yield from _virtual_section_lines("groups", _payload(_group_columns(groups), len(groups)))
+    yield from _virtual_section_lines("events", _payload(_event_columns(events), len(events)))
+    payload = _payload(_subscription_columns(subs, id_to_name, totals), len(subs))
+    yield from _virtual_section_lines("subscriptions", payload, totals.subscriptions_line())
+    payload = _payload(_donation_columns(donations, totals), len(donations))
+    yield from _virtual_section_lines("donations", payload, totals.donations_line())
+    yield from _TAIL_LINES
+
+
+def _render_virtual_html(
+    students: Sequence[Mapping[str, Any]],
+    teachers: Sequence[Mapping[str, Any]],
+    events: List[Dict[str, Any]],
+    subs: Iterable[Dict[str, Any]],
+    donations: Iterable[Dict[str, Any]],
+) -> str:
+    return "\n".join(_iter_virtual_html(students, teachers, events, subs, donations))
+
+
+class VirtualWebUI(WebUI):
+    """Même page que ``WebUI``, mais les lignes de chaque onglet sont embarquées
+    en JSON colonnaire (chaînes répétées encodées par dictionnaire) et rendues
+    par le navigateur : seules les lignes visibles sont dans le DOM, le tri et
+    le filtre se font côté client.
+    """
+
+    def __init__(self, out_file: Path) -> None:
+        super().__init__(out_file)
+
+    def show_dashboard(self, project: Dict[str, Any]) -> None:
+        self._out_file.parent.mkdir(parents=True, exist_ok=True)
+        with metrics.stage("split_members") as st:
+            students, teachers = _split_members(project.get("members", []))
+            st.add_rows(len(students) + len(teachers))
+        with metrics.stage("build_member_maps") as st:
+            s_map, t_map = _build_member_maps(students, teachers)
+            st.add_rows(len(s_map) + len(t_map))
+        with metrics.stage("parse_events") as st:
+            events = _parse_events(project.get("events", []), s_map, t_map)
+            st.add_rows(len(events))
+        subs = project.get("subscriptions", [])
+        donations = project.get("donations", [])
+        with metrics.stage("render_virtual") as st:
+            html = _render_virtual_html(students, teachers, events, subs, donations)
+            st.add_rows(len(students) + len(teachers) + len(events) + len(subs) + len(donations))
+        with metrics.stage("write_html") as st:
+            self._out_file.write_text(html, encoding="utf-8")
+            st.add_bytes(self._out_file.stat().st_size if metrics.enabled else 0)
+        self._open_in_browser()
@@ -1,135 +1,114 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 from html import escape
 import webbrowser
 
 from interfaces.ui_interface import UIInterface
+from models.member_store import MemberStore
+from services.group_roster import GroupRoster
+from utils.instrumentation import metrics
+from utils.render_kernel import Column, EscapeCache, RowFormatter, batches, cells_template
+from utils.memory_budget import NORMALIZED_BYTES_PER_MEMBER, RENDER_BYTES_PER_ROW, MemoryBudget
 
 
-def _split_members(records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+def _normalize_member(r: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    item = dict(r)
+    item.setdefault("full_name", item.get("name", ""))
+    item.setdefault("email", "")
+    item.setdefault("phone", "")
+    item.setdefault("address", "")
+    item.setdefault("join_date", "")
+    if "student_id" in item:
+        item.setdefault("subscription_status", "Pending")
+        item.setdefault("groupe", "")
+        item.setdefault("skills", [])
+        item.setdefault("interests", [])
+        return "student", item
+    if "teacher_id" in item:
+        item.setdefault("skills", [])
+        item.setdefault("interests", [])
+        return "teacher", item
+    return None, item
+
+
+def _split_members(records: Iterable[Dict[str, Any]]) -> Tuple[Sequence[Mapping[str, Any]], Sequence[Mapping[str, Any]]]:
+    if isinstance(records, MemberStore):
+        # Déjà normalisé : vues MemberRows sur les colonnes, sans copie par membre.
+        return records.students(), records.teachers()
     students: List[Dict[str, Any]] = []
     teachers: List[Dict[str, Any]] = []
     for r in records:
-        item = dict(r)
-        item.setdefault("full_name", item.get("name", ""))
-        item.setdefault("email", "")
-        item.setdefault("phone", "")
-        item.setdefault("address", "")
-        item.setdefault("join_date", "")
-        if "student_id" in item:
-            item.setdefault("subscription_status", "Pending")
-            item.setdefault("groupe", "")
-            item.setdefault("skills", [])
-            item.setdefault("interests", [])
+        kind, item = _normalize_member(r)
+        if kind == "student":
             students.append(item)
-        elif "teacher_id" in item:
-            item.setdefault("skills", [])
-            item.setdefault("interests", [])
+        elif kind == "teacher":
             teachers.append(item)
     return students, teachers
 
 
+def _add_to_map(m: Dict[int, str], raw_id: Any, name: str) -> None:
+    if raw_id is not None:
+        try:
+            m[int(raw_id)] = name
+        except ValueError:
+            pass
+
+
 def _build_member_maps(
-    students: List[Dict[str, Any]],
-    teachers: List[Dict[str, Any]],
+    students: Sequence[Mapping[str, Any]],
+    teachers: Sequence[Mapping[str, Any]],
 ) -> Tuple[Dict[int, str], Dict[int, str]]:
     s_map: Dict[int, str] = {}
     t_map: Dict[int, str] = {}
     for s in students:
-        sid = s.get("student_id")
-        if sid is not None:
-            try:
-                s_map[int(sid)] = s.get("full_name", "")
-            except ValueError:
-                pass
+        _add_to_map(s_map, s.get("student_id"), s.get("full_name", ""))
     for t in teachers:
-        tid = t.get("teacher_id")
-        if tid is not None:
-            try:
-                t_map[int(tid)] = t.get("full_name", "")
-            except ValueError:
-                pass
+        _add_to_map(t_map, t.get("teacher_id"), t.get("full_name", ""))
     return s_map, t_map
 
 
+def _parse_event(
+    e: Dict[str, Any],
+    student_map: Dict[int, str],
+    teacher_map: Dict[int, str],
+) -> Dict[str, Any]:
+    ev = dict(e)
+    ev.setdefault("event_name", ev.get("name", ""))
+    ev.setdefault("description", "")
+    ev.setdefault("event_date", "")
+    org_ids = ev.get("organizer_ids") or ev.get("organizers_ids") or []
+    part_ids = ev.get("participant_ids") or ev.get("participants_ids") or []
+    organizers: List[str] = []
+    participants: List[str] = []
+    for oid in org_ids:
+        try:
+            organizers.append(teacher_map.get(int(oid), f"Teacher#{oid}"))
+        except ValueError:
+            organizers.append(f"Teacher#{oid}")
+    for sid in part_ids:
+        try:
+            participants.append(student_map.get(int(sid), f"Student#{sid}"))
+        except ValueError:
+            participants.append(f"Student#{sid}")
+    return {
+        "event_name": ev["event_name"],
+        "description": ev.get("description", ""),
+        "event_date": ev.get("event_date", ""),
+        "organizers": organizers,
+        "participants": participants,
+    }
+
+
 def _parse_events(
-    records: List[Dict[str, Any]],
+    records: Iterable[Dict[str, Any]],
     student_map: Dict[int, str],
     teacher_map: Dict[int, str],
 ) -> List[Dict[str, Any]]:
-    parsed: List[Dict[str, Any]] = []
-    for e in records:
-        ev = dict(e)
-        ev.setdefault("event_name", ev.get("name", ""))
-        ev.setdefault("description", "")
-        ev.setdefault("event_date", "")
-        org_ids = ev.get("organizer_ids") or ev.get("organizers_ids") or []
-        part_ids = ev.get("participant_ids") or ev.get("participants_ids") or []
-        organizers: List[str] = []
-        participants: List[str] = []
-        for oid in org_ids:
-            try:
-                organizers.append(teacher_map.get(int(oid), f"Teacher#{oid}"))
-            except ValueError:
-                organizers.append(f"Teacher#{oid}")
-        for sid in part_ids:
-            try:
-                participants.append(student_map.get(int(sid), f"Student#{sid}"))
-            except ValueError:
-                participants.append(f"Student#{sid}")
-        parsed.append(
-            {
-                "event_name": ev["event_name"],
-                "description": ev.get("description", ""),
-                "event_date": ev.get("event_date", ""),
-                "organizers": organizers,
-                "participants": participants,
-            }
-        )
-    return parsed
+    return [_parse_event(e, student_map, teacher_map) for e in records]
 
 
-def _render_html(
-    students: List[Dict[str, Any]],
-    teachers: List[Dict[str, Any]],
-    events: List[Dict[str, Any]],
-    subs: List[Dict[str, Any]],
-    donations: List[Dict[str, Any]],
-) -> str:
-    group_students: Dict[str, List[str]] = {}
-    name_to_group: Dict[str, str] = {}
-    for s in students:
-        g = str(s.get("groupe", "") or "-")
-        name = s.get("full_name", "")
-        if not name:
-            continue
-        name_to_group[name] = g
-        group_students.setdefault(g, []).append(name)
-
-    id_to_name: Dict[int, str] = {}
-    for s in students:
-        sid = s.get("student_id")
-        if sid is not None:
-            try:
-                id_to_name[int(sid)] = s.get("full_name", "")
-            except ValueError:
-                pass
-
-    group_teachers: Dict[str, List[str]] = {}
-    for e in events:
-        orgs = e.get("organizers", [])
-        parts = e.get("participants", [])
-        for p in parts:
-            g = name_to_group.get(p)
-            if not g:
-                continue
-            for org in orgs:
-                group_teachers.setdefault(g, [])
-                if org not in group_teachers[g]:
-                    group_teachers[g].append(org)
-
-    style = """
+_STYLE = """
     <style>
       :root{
         --bg-main:#050816;
@@ -279,256 +258,513 @@ def _render_html(
     </style>
     """
 
-    def esc(x: Any) -> str:
-        return escape("" if x is None else str(x))
 
-    stu_rows: List[str] = []
-    for s in students:
-        status = str(s.get("subscription_status", "Pending"))
-        status_lower = status.lower()
-        if status_lower == "paid":
-            cls = "badge-paid"
-        elif status_lower == "pending":
-            cls = "badge-pending"
-        else:
-            cls = "badge-unpaid"
-        stu_rows.append(
-            "<tr>"
-            f"<td>{esc(s.get('student_id',''))}</td>"
-            f"<td>{esc(s.get('full_name',''))}</td>"
-            f"<td>{esc(s.get('email',''))}</td>"
-            f"<td>{esc(s.get('phone',''))}</td>"
-            f"<td>{esc(s.get('address',''))}</td>"
-            f"<td>{esc(s.get('join_date',''))}</td>"
-            f"<td>{esc(', '.join(s.get('skills',[])))}</td>"
-            f"<td>{esc(', '.join(s.get('interests',[])))}</td>"
-            f"<td><span class='badge {cls}'>{esc(status)}</span></td>"
-            "</tr>"
-        )
+_SCRIPT = [
+    "<script>",
+    "function showTab(name){",
+    "  const sections=document.querySelectorAll('.tab-section');",
+    "  sections.forEach(s=>s.classList.remove('active'));",
+    "  const btns=document.querySelectorAll('.tab-btn');",
+    "  btns.forEach(b=>b.classList.remove('active'));",
+    "  const s=document.getElementById('tab-'+name);",
+    "  const b=document.getElementById('btn-'+name);",
+    "  if(s){s.classList.add('active');}",
+    "  if(b){b.classList.add('active');}",
+    "}",
+    "document.addEventListener('DOMContentLoaded',()=>{showTab('students');});",
+    "</script>",
+]
 
-    tea_rows: List[str] = []
-    for t in teachers:
-        tea_rows.append(
-            "<tr>"
-            f"<td>{esc(t.get('teacher_id',''))}</td>"
-            f"<td>{esc(t.get('full_name',''))}</td>"
-            f"<td>{esc(t.get('email',''))}</td>"
-            f"<td>{esc(t.get('phone',''))}</td>"
-            f"<td>{esc(t.get('address',''))}</td>"
-            f"<td>{esc(t.get('join_date',''))}</td>"
-            f"<td>{esc(', '.join(t.get('skills',[])))}</td>"
-            f"<td>{esc(', '.join(t.get('interests',[])))}</td>"
-            "</tr>"
-        )
+_TABS: List[Tuple[str, str]] = [
+    ("students", "Students"),
+    ("teachers", "Teachers"),
+    ("groups", "Groups"),
+    ("events", "Events"),
+    ("subscriptions", "Subscriptions"),
+    ("donations", "Donations"),
+]
 
-    group_rows: List[str] = []
-    for g, names in sorted(group_students.items(), key=lambda x: x[0]):
-        teachers_for_group = ", ".join(group_teachers.get(g, [])) or "-"
-        group_rows.append(
-            "<tr>"
-            f"<td>{esc(g)}</td>"
-            f"<td>{esc(teachers_for_group)}</td>"
-            f"<td>{esc(', '.join(names))}</td>"
-            "</tr>"
-        )
+_SECTION_HEADERS: Dict[str, List[str]] = {
+    "students": [
+        "<th>#</th><th>Full Name</th><th>Email</th><th>Phone</th>",
+        "<th>Address</th><th>Join Date</th><th>Skills</th><th>Interests</th><th>Subscription</th>",
+    ],
+    "teachers": [
+        "<th>#</th><th>Full Name</th><th>Email</th><th>Phone</th>",
+        "<th>Address</th><th>Join Date</th><th>Skills</th><th>Interests</th>",
+    ],
+    "groups": ["<th>Group</th><th>Teacher</th><th>Students</th>"],
+    "events": ["<th>Name</th><th>Description</th><th>Date</th><th>Organizers</th><th>Participants</th>"],
+    "subscriptions": ["<th>Student ID</th><th>Student</th><th>Type</th><th>Amount</th><th>Date</th><th>Status</th>"],
+    "donations": ["<th>Donor</th><th>Source</th><th>Amount</th><th>Date</th><th>Purpose</th><th>Note</th>"],
+}
 
-    evt_rows: List[str] = []
-    for e in events:
-        orgs = ", ".join(esc(n) for n in e.get("organizers", [])) or "-"
-        parts = ", ".join(esc(n) for n in e.get("participants", [])) or "-"
-        evt_rows.append(
-            "<tr>"
-            f"<td>{esc(e.get('event_name',''))}</td>"
-            f"<td>{esc(e.get('description',''))}</td>"
-            f"<td>{esc(e.get('event_date',''))}</td>"
-            f"<td>{orgs}</td>"
-            f"<td>{parts}</td>"
-            "</tr>"
-        )
+_SECTION_EMPTY: Dict[str, Tuple[int, str]] = {
+    "students": (9, "No students"),
+    "teachers": (8, "No teachers"),
+    "groups": (3, "No groups"),
+    "events": (5, "No events"),
+    "subscriptions": (6, "No subscriptions"),
+    "donations": (6, "No donations"),
+}
 
-    sub_rows: List[str] = []
-    total_paid = 0.0
-    total_unpaid = 0.0
-    for sub in subs:
-        sid = sub.get("student_id")
-        try:
-            sid_int = int(sid) if sid is not None else None
-        except ValueError:
-            sid_int = None
-        student_name = id_to_name.get(sid_int, f"Student #{sid}") if sid_int is not None else "-"
-        amount = float(sub.get("amount", 0.0))
-        status = str(sub.get("status", "unpaid"))
-        kind = str(sub.get("kind", "base")).lower()
-        date_value = sub.get("date", "")
-        if status.lower() == "paid":
-            badge_cls = "badge-paid"
-            total_paid += amount
-        else:
-            badge_cls = "badge-unpaid"
-            total_unpaid += amount
-        if kind == "monthly":
-            kind_label = "Monthly"
-        elif kind == "annual":
-            kind_label = "Annual"
-        else:
-            kind_label = "Standard"
-        sub_rows.append(
-            "<tr>"
-            f"<td>{esc(sid)}</td>"
-            f"<td>{esc(student_name)}</td>"
-            f"<td>{esc(kind_label)}</td>"
-            f"<td>{amount:.2f}</td>"
-            f"<td>{esc(date_value)}</td>"
-            f"<td><span class='badge {badge_cls}'>{esc(status)}</span></td>"
-            "</tr>"
-        )
+_TOTALS_STYLE = "margin-top:12px;font-size:13px;color:var(--text-muted);"
 
-    don_rows: List[str] = []
-    total_don = 0.0
-    for d in donations:
-        amount = float(d.get("amount", 0.0))
-        total_don += amount
-        don_rows.append(
-            "<tr>"
-            f"<td>{esc(d.get('donor_name',''))}</td>"
-            f"<td>{esc(d.get('source',''))}</td>"
-            f"<td>{amount:.2f}</td>"
-            f"<td>{esc(d.get('date',''))}</td>"
-            f"<td>{esc(d.get('purpose',''))}</td>"
-            f"<td>{esc(d.get('note',''))}</td>"
-            "</tr>"
-        )
 
-    html_doc: List[str] = [
+def _text(x: Any) -> str:
+    return "" if x is None else str(x)
+
+
+def _esc(x: Any) -> str:
+    return escape(_text(x))
+
+
+def _head_lines() -> List[str]:
+    lines = [
         "<!doctype html>",
         "<html lang='fr'>",
         "<head>",
         "<meta charset='utf-8' />",
         "<title>Madrassa</title>",
-        style,
-        "<script>",
-        "function showTab(name){",
-        "  const sections=document.querySelectorAll('.tab-section');",
-        "  sections.forEach(s=>s.classList.remove('active'));",
-        "  const btns=document.querySelectorAll('.tab-btn');",
-        "  btns.forEach(b=>b.classList.remove('active'));",
-        "  const s=document.getElementById('tab-'+name);",
-        "  const b=document.getElementById('btn-'+name);",
-        "  if(s){s.classList.add('active');}",
-        "  if(b){b.classList.add('active');}",
-        "}",
-        "document.addEventListener('DOMContentLoaded',()=>{showTab('students');});",
-        "</script>",
+        _STYLE,
+        *_SCRIPT,
         "</head>",
         "<body>",
         "<header>",
         "<h1>Madrassa</h1>",
         "</header>",
         "<div class='tabs-bar'>",
-        "<button id='btn-students' class='tab-btn' onclick=\"showTab('students')\">Students</button>",
-        "<button id='btn-teachers' class='tab-btn' onclick=\"showTab('teachers')\">Teachers</button>",
-        "<button id='btn-groups' class='tab-btn' onclick=\"showTab('groups')\">Groups</button>",
-        "<button id='btn-events' class='tab-btn' onclick=\"showTab('events')\">Events</button>",
-        "<button id='btn-subscriptions' class='tab-btn' onclick=\"showTab('subscriptions')\">Subscriptions</button>",
-        "<button id='btn-donations' class='tab-btn' onclick=\"showTab('donations')\">Donations</button>",
-        "</div>",
-        "<main class='container'>",
-        "<section id='tab-students' class='tab-section'>",
-        "<h2>Students</h2>",
-        "<table>",
-        "<thead><tr>",
-        "<th>#</th><th>Full Name</th><th>Email</th><th>Phone</th>",
-        "<th>Address</th><th>Join Date</th><th>Skills</th><th>Interests</th><th>Subscription</th>",
-        "</tr></thead>",
-        "<tbody>",
-        *(stu_rows if stu_rows else ["<tr><td colspan='9'>No students</td></tr>"]),
-        "</tbody>",
-        "</table>",
-        "</section>",
-        "<section id='tab-teachers' class='tab-section'>",
-        "<h2>Teachers</h2>",
-        "<table>",
-        "<thead><tr>",
-        "<th>#</th><th>Full Name</th><th>Email</th><th>Phone</th>",
-        "<th>Address</th><th>Join Date</th><th>Skills</th><th>Interests</th>",
-        "</tr></thead>",
-        "<tbody>",
-        *(tea_rows if tea_rows else ["<tr><td colspan='8'>No teachers</td></tr>"]),
-        "</tbody>",
-        "</table>",
-        "</section>",
-        "<section id='tab-groups' class='tab-section'>",
-        "<h2>Groups</h2>",
-        "<table>",
-        "<thead><tr>",
-        "<th>Group</th><th>Teacher</th><th>Students</th>",
-        "</tr></thead>",
-        "<tbody>",
-        *(group_rows if group_rows else ["<tr><td colspan='3'>No groups</td></tr>"]),
-        "</tbody>",
-        "</table>",
-        "</section>",
-        "<section id='tab-events' class='tab-section'>",
-        "<h2>Events</h2>",
-        "<table>",
-        "<thead><tr>",
-        "<th>Name</th><th>Description</th><th>Date</th><th>Organizers</th><th>Participants</th>",
-        "</tr></thead>",
-        "<tbody>",
-        *(evt_rows if evt_rows else ["<tr><td colspan='5'>No events</td></tr>"]),
-        "</tbody>",
-        "</table>",
-        "</section>",
-        "<section id='tab-subscriptions' class='tab-section'>",
-        "<h2>Subscriptions</h2>",
-        "<table>",
-        "<thead><tr>",
-        "<th>Student ID</th><th>Student</th><th>Type</th><th>Amount</th><th>Date</th><th>Status</th>",
-        "</tr></thead>",
-        "<tbody>",
-        *(sub_rows if sub_rows else ["<tr><td colspan='6'>No subscriptions</td></tr>"]),
-        "</tbody>",
-        "</table>",
-        f"<p style='margin-top:12px;font-size:13px;color:var(--text-muted);'>Total paid: {total_paid:.2f} | Total unpaid: {total_unpaid:.2f}</p>",
-        "</section>",
-        "<section id='tab-donations' class='tab-section'>",
-        "<h2>Donations</h2>",
-        "<table>",
-        "<thead><tr>",
-        "<th>Donor</th><th>Source</th><th>Amount</th><th>Date</th><th>Purpose</th><th>Note</th>",
-        "</tr></thead>",
-        "<tbody>",
-        *(don_rows if don_rows else ["<tr><td colspan='6'>No donations</td></tr>"]),
-        "</tbody>",
-        "</table>",
-        f"<p style='margin-top:12px;font-size:13px;color:var(--text-muted);'>Total donations: {total_don:.2f}</p>",
-        "</section>",
-        "</main>",
-        "<footer>© 2026 Madrassa.</footer>",
-        "</body>",
-        "</html>",
     ]
-    return "\n".join(html_doc)
+    for key, title in _TABS:
+        lines.append(f"<button id='btn-{key}' class='tab-btn' onclick=\"showTab('{key}')\">{title}</button>")
+    lines += ["</div>", "<main class='container'>"]
+    return lines
+
+
+_TAIL_LINES = [
+    "</main>",
+    "<footer>© 2026 Madrassa.</footer>",
+    "</body>",
+    "</html>",
+]
+
+
+def _section_lines(
+    key: str,
+    rows: Iterable[str],
+    footer: Optional[Callable[[], str]] = None,
+) -> Iterator[str]:
+    title = dict(_TABS)[key]
+    yield f"<section id='tab-{key}' class='tab-section'>"
+    yield f"<h2>{title}</h2>"
+    yield "<table>"
+    yield "<thead><tr>"
+    yield from _SECTION_HEADERS[key]
+    yield "</tr></thead>"
+    yield "<tbody>"
+    empty = True
+    for row in rows:
+        empty = False
+        yield row
+    if empty:
+        colspan, label = _SECTION_EMPTY[key]
+        yield f"<tr><td colspan='{colspan}'>{label}</td></tr>"
+    yield "</tbody>"
+    yield "</table>"
+    if footer is not None:
+        # Appelé après les lignes : les totaux sont cumulés pendant leur rendu.
+        yield footer()
+    yield "</section>"
+
+
+def _badge_class(status: str) -> str:
+    status_lower = status.lower()
+    if status_lower == "paid":
+        return "badge-paid"
+    if status_lower == "pending":
+        return "badge-pending"
+    return "badge-unpaid"
+
+
+def _badge(cls: str, status: str) -> str:
+    return f"<span class='badge {cls}'>{_esc(status)}</span>"
+
+
+# Peu de statuts distincts : le markup du badge est construit une fois par
+# valeur (la classe ne dépend que du statut), dans un cache borné.
+_STUDENT_BADGES = EscapeCache(build=lambda status: _badge(_badge_class(status), status))
+_SUBSCRIPTION_BADGES = EscapeCache(
+    build=lambda status: _badge("badge-paid" if status.lower() == "paid" else "badge-unpaid", status)
+)
+
+
+def _student_badge(s: Dict[str, Any]) -> str:
+    return _STUDENT_BADGES(str(s.get("subscription_status", "Pending")))
+
+
+def _joined(key: str) -> Callable[[Dict[str, Any]], str]:
+    return lambda r: ", ".join(r.get(key, []))
+
+
+_STUDENT_ROW = RowFormatter(
+    cells_template(9),
+    [
+        Column("student_id"),
+        Column("full_name"),
+        Column("email"),
+        Column("phone"),
+        Column("address"),
+        Column("join_date", "cached"),
+        Column(_joined("skills"), "cached"),
+        Column(_joined("interests"), "cached"),
+        Column(_student_badge, "raw"),
+    ],
+)
+
+_TEACHER_ROW = RowFormatter(
+    cells_template(8),
+    [
+        Column("teacher_id"),
+        Column("full_name"),
+        Column("email"),
+        Column("phone"),
+        Column("address"),
+        Column("join_date", "cached"),
+        Column(_joined("skills"), "cached"),
+        Column(_joined("interests"), "cached"),
+    ],
+)
+
+_NAMES = EscapeCache(limit=100_000)
+
+
+def _names(key: str) -> Callable[[Dict[str, Any]], str]:
+    # Les mêmes noms reviennent d'un évènement à l'autre : échappés une fois.
+    return lambda e: ", ".join([_NAMES(_text(n)) for n in e.get(key, [])]) or "-"
+
+
+_EVENT_ROW = RowFormatter(
+    cells_template(5),
+    [
+        Column("event_name"),
+        Column("description"),
+        Column("event_date", "cached"),
+        Column(_names("organizers"), "raw"),
+        Column(_names("participants"), "raw"),
+    ],
+)
+
+
+def _student_rows(students: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    return _STUDENT_ROW.rows(students)
+
+
+def _teacher_rows(teachers: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    return _TEACHER_ROW.rows(teachers)
+
+
+def _group_row(g: str, names: List[str], teachers: List[str]) -> str:
+    teachers_for_group = ", ".join(teachers) or "-"
+    return (
+        "<tr>"
+        f"<td>{_esc(g)}</td>"
+        f"<td>{_esc(teachers_for_group)}</td>"
+        f"<td>{_esc(', '.join(names))}</td>"
+        "</tr>"
+    )
+
+
+def _event_rows(events: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    try:
+        yield from _EVENT_ROW.rows(events)
+    finally:
+        # Noms gardés le temps d'un rendu : --serve / --watch ne les accumulent pas.
+        _NAMES.clear()
+
+
+def _subscription_amount(sub: Dict[str, Any]) -> Tuple[float, bool]:
+    return float(sub.get("amount", 0.0)), str(sub.get("status", "unpaid")).lower() == "paid"
+
+
+def _subscription_student(sub: Dict[str, Any], id_to_name: Dict[int, str]) -> str:
+    sid = sub.get("student_id")
+    try:
+        sid_int = int(sid) if sid is not None else None
+    except ValueError:
+        sid_int = None
+    return id_to_name.get(sid_int, f"Student #{sid}") if sid_int is not None else "-"
+
+
+_KIND_LABELS = {"monthly": "Monthly", "annual": "Annual"}
+
+
+# Nom, type, montant et badge sont calculés par lot dans _subscription_rows
+# (le montant sert aussi aux totaux) et fournis au formateur.
+_SUBSCRIPTION_ROW = RowFormatter(
+    cells_template(6),
+    [
+        Column("student_id"),
+        Column(None),
+        Column(None, "raw"),
+        Column(None, "raw"),
+        Column("date", "cached"),
+        Column(None, "raw"),
+    ],
+)
+
+
+_DONATION_ROW = RowFormatter(
+    cells_template(6),
+    [
+        Column("donor_name"),
+        Column("source", "cached"),
+        Column(lambda d: f"{float(d.get('amount', 0.0)):.2f}", "raw"),
+        Column("date", "cached"),
+        Column("purpose", "cached"),
+        Column("note"),
+    ],
+)
+
+
+class _Totals:
+    def __init__(self) -> None:
+        self.paid = 0.0
+        self.unpaid = 0.0
+        self.donations = 0.0
+
+    def add_subscription(self, amount: float, paid: bool) -> None:
+        if paid:
+            self.paid += amount
+        else:
+            self.unpaid += amount
+
+    def subscriptions_line(self) -> str:
+        return f"<p style='{_TOTALS_STYLE}'>Total paid: {self.paid:.2f} | Total unpaid: {self.unpaid:.2f}</p>"
+
+    def donations_line(self) -> str:
+        return f"<p style='{_TOTALS_STYLE}'>Total donations: {self.donations:.2f}</p>"
+
+
+def _subscription_rows(subs: Iterable[Dict[str, Any]], id_to_name: Dict[int, str], totals: _Totals) -> Iterator[str]:
+    for batch in batches(subs):
+        amounts = [float(sub.get("amount", 0.0)) for sub in batch]
+        statuses = [str(sub.get("status", "unpaid")) for sub in batch]
+        paid = [status.lower() == "paid" for status in statuses]
+        # Totaux cumulés ligne à ligne, dans l'ordre : mêmes arrondis qu'avant.
+        for amount, is_paid in zip(amounts, paid):
+            totals.add_subscription(amount, is_paid)
+        yield from _SUBSCRIPTION_ROW.format_batch(
+            batch,
+            [_subscription_student(sub, id_to_name) for sub in batch],
+            [_KIND_LABELS.get(str(sub.get("kind", "base")).lower(), "Standard") for sub in batch],
+            [f"{amount:.2f}" for amount in amounts],
+            _SUBSCRIPTION_BADGES.column(statuses),
+        )
+
+
+def _donation_rows(donations: Iterable[Dict[str, Any]], totals: _Totals) -> Iterator[str]:
+    for batch in batches(donations):
+        for d in batch:
+            totals.donations += float(d.get("amount", 0.0))
+        yield from _DONATION_ROW.rows(batch)
+
+
+def _index_student(s: Dict[str, Any], roster: GroupRoster, id_to_name: Dict[int, str]) -> None:
+    roster.add_student(s.get("full_name", ""), s.get("groupe", ""))
+    _add_to_map(id_to_name, s.get("student_id"), s.get("full_name", ""))
+
+
+def _link_events(roster: GroupRoster, events: Iterable[Dict[str, Any]]) -> GroupRoster:
+    for e in events:
+        roster.link_event(e.get("organizers", []), e.get("participants", []))
+    return roster
+
+
+def _group_rows(roster: GroupRoster) -> Iterator[str]:
+    for g, names, teachers in roster.rows():
+        yield _group_row(g, names, teachers)
+
+
+def _iter_html(
+    students: Sequence[Mapping[str, Any]],
+    teachers: Sequence[Mapping[str, Any]],
+    events: List[Dict[str, Any]],
+    subs: Iterable[Dict[str, Any]],
+    donations: Iterable[Dict[str, Any]],
+) -> Iterator[str]:
+    roster = GroupRoster()
+    id_to_name: Dict[int, str] = {}
+    for s in students:
+        _index_student(s, roster, id_to_name)
+    _link_events(roster, events)
+    totals = _Totals()
+
+    yield from _head_lines()
+    yield from _section_lines("students", _student_rows(students))
+    yield from _section_lines("teachers", _teacher_rows(teachers))
+    yield from _section_lines("groups", _group_rows(roster))
+    yield from _section_lines("events", _event_rows(events))
+    yield from _section_lines("subscriptions", _subscription_rows(subs, id_to_name, totals), totals.subscriptions_line)
+    yield from _section_lines("donations", _donation_rows(donations, totals), totals.donations_line)
+    yield from _TAIL_LINES
+
+
+def _render_html(
+    students: Sequence[Mapping[str, Any]],
+    teachers: Sequence[Mapping[str, Any]],
+    events: List[Dict[str, Any]],
+    subs: List[Dict[str, Any]],
+    donations: List[Dict[str, Any]],
+) -> str:
+    return "\n".join(_iter_html(students, teachers, events, subs, donations))
+
+
+def _iter_html_streaming(
+    members: Iterable[Dict[str, Any]],
+    events_raw: Iterable[Dict[str, Any]],
+    subs: Iterable[Dict[str, Any]],
+    donations: Iterable[Dict[str, Any]],
+) -> Iterator[str]:
+    # Un seul passage sur chaque itérable : les lignes étudiants sont écrites
+    # au fil de la lecture, on ne garde que les petites tables nom/groupe/id
+    # nécessaires aux onglets suivants. Les professeurs, peu nombreux, sont
+    # gardés pour être rendus après tous les étudiants.
+    roster = GroupRoster()
+    s_map: Dict[int, str] = {}
+    t_map: Dict[int, str] = {}
+    teachers: List[Dict[str, Any]] = []
+    totals = _Totals()
+
+    def students() -> Iterator[Dict[str, Any]]:
+        for r in members:
+            kind, item = _normalize_member(r)
+            if kind == "student":
+                _index_student(item, roster, s_map)
+                yield item
+            elif kind == "teacher":
+                _add_to_map(t_map, item.get("teacher_id"), item.get("full_name", ""))
+                teachers.append(item)
+
+    yield from _head_lines()
+    # Rendu par lots (render_kernel) : seul le lot courant d'étudiants est en mémoire.
+    yield from _section_lines("students", _student_rows(students()))
+    yield from _section_lines("teachers", _teacher_rows(teachers))
+    events = _parse_events(events_raw, s_map, t_map)
+    yield from _section_lines("groups", _group_rows(_link_events(roster, events)))
+    yield from _section_lines("events", _event_rows(events))
+    yield from _section_lines("subscriptions", _subscription_rows(subs, s_map, totals), totals.subscriptions_line)
+    yield from _section_lines("donations", _donation_rows(donations, totals), totals.donations_line)
+    yield from _TAIL_LINES
+
+
+def _write_lines(fh: IO[str], lines: Iterable[str]) -> int:
+    written = 0
+    sep = ""
+    for line in lines:
+        written += fh.write(sep)
+        written += fh.write(line)
+        sep = "\n"
+    return written
+
+
+def _write_html(
+    fh: IO[str],
+    members: Iterable[Dict[str, Any]],
+    events_raw: Iterable[Dict[str, Any]],
+    subs: Iterable[Dict[str, Any]],
+    donations: Iterable[Dict[str, Any]],
+) -> int:
+    return _write_lines(fh, _iter_html_streaming(members, events_raw, subs, donations))
 
 
 class WebUI(UIInterface):
-    def __init__(self, out_file: Path) -> None:
+    def __init__(
+        self,
+        out_file: Path,
+        streaming: bool = False,
+        workers: int = 1,
+        budget: Optional[MemoryBudget] = None,
+    ) -> None:
         self._out_file = out_file
+        self._streaming = streaming
+        # workers > 1 : rendu des onglets en parallèle (ui.parallel_render), 0 = un par cœur.
+        self._workers = workers
+        # Budget mémoire : passe en écriture ligne à ligne plutôt que de dépasser.
+        self._budget = budget
+
+    def _over_budget(self, stage: str, extra: int, reason: str) -> bool:
+        if self._budget is None:
+            return False
+        if self._budget.streaming:
+            return True
+        if self._budget.would_exceed(extra):
+            self._budget.switch(stage, reason)
+            return True
+        return False
+
+    def _stream_project(self, project: Dict[str, Any]) -> None:
+        # Lecture, rendu et écriture sont entremêlés : une seule étape mesurée.
+        with metrics.stage("render_stream") as st, self._out_file.open("w", encoding="utf-8") as fh:
+            _write_html(
+                fh,
+                project.get("members", []),
+                project.get("events", []),
+                project.get("subscriptions", []),
+                project.get("donations", []),
+            )
+        st.add_bytes(self._out_file.stat().st_size if metrics.enabled else 0)
 
     def show_dashboard(self, project: Dict[str, Any]) -> None:
+        self._out_file.parent.mkdir(parents=True, exist_ok=True)
         members = project.get("members", [])
-        events_raw = project.get("events", [])
+        n_members = len(members) if hasattr(members, "__len__") else 0
+        if self._streaming or self._over_budget(
+            "split_members", n_members * NORMALIZED_BYTES_PER_MEMBER, f"{n_members} membres à normaliser"
+        ):
+            self._stream_project(project)
+            self._open_in_browser()
+            return
+
+        # Chaque collection est lue juste avant d'être utilisée : avec un
+        # projet préchargé en parallèle, le traitement des membres démarre
+        # pendant que les autres fichiers se chargent encore.
+        with metrics.stage("split_members") as st:
+            students, teachers = _split_members(members)
+            st.add_rows(len(students) + len(teachers))
+        with metrics.stage("build_member_maps") as st:
+            s_map, t_map = _build_member_maps(students, teachers)
+            st.add_rows(len(s_map) + len(t_map))
+        with metrics.stage("parse_events") as st:
+            events = _parse_events(project.get("events", []), s_map, t_map)
+            st.add_rows(len(events))
         subs = project.get("subscriptions", [])
         donations = project.get("donations", [])
 
-        students, teachers = _split_members(members)
-        s_map, t_map = _build_member_maps(students, teachers)
-        events = _parse_events(events_raw, s_map, t_map)
+        rows = len(students) + len(teachers) + len(events) + len(subs) + len(donations)
+        if self._over_budget("render_html", rows * RENDER_BYTES_PER_ROW, f"{rows} lignes à rendre"):
+            # La page complète ne tiendrait pas dans le budget : elle est écrite
+            # au fil du rendu, sans liste de lignes ni chaîne finale (même HTML).
+            with metrics.stage("render_write_stream") as st, self._out_file.open("w", encoding="utf-8") as fh:
+                _write_lines(fh, _iter_html(students, teachers, events, subs, donations))
+                st.add_rows(rows)
+            st.add_bytes(self._out_file.stat().st_size if metrics.enabled else 0)
+        else:
+            with metrics.stage("render_html") as st:
+                if self._workers == 1:
+                    html = _render_html(students, teachers, events, subs, donations)
+                else:
+                    from ui.parallel_render import render_html_parallel
 
-        html = _render_html(students, teachers, events, subs, donations)
+                    html = render_html_parallel(
+                        students, teachers, events, list(subs), list(donations), workers=self._workers
+                    )
+                st.add_rows(rows)
+            with metrics.stage("write_html") as st:
+                self._out_file.write_text(html, encoding="utf-8")
+                st.add_bytes(self._out_file.stat().st_size if metrics.enabled else 0)
+        self._open_in_browser()
 
-        self._out_file.parent.mkdir(parents=True, exist_ok=True)
-        self._out_file.write_text(html, encoding="utf-8")
+    def _open_in_browser(self) -> None:
         try:
             webbrowser.open(self._out_file.resolve().as_uri())
         except Exception:
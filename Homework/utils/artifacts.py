@@ -0,0 +1,329 @@
+from __future__ import annotations
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import brotli  # optionnel : pip install brotli
+except ImportError:
+    brotli = None
+
+
+MANIFEST = "manifest.json"
+ASSET_DIR = "assets"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_CHUNK = 1 << 20
+_HEAD_LIMIT = 1 << 20
+_HASH_LEN = 12
+
+# Blocs inline du <head> sortis en fichiers : <style> et <script> sans attribut
+# (les <script type='application/json'> de données restent dans la page).
+_INLINE = re.compile(r"<(style|script)>(.*?)</\1>", re.S)
+_TYPES = {
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+}
+
+
+class _Outputs:
+    """Écrit le même flux dans la page et ses variantes compressées (.gz, .br),
+    dans des fichiers temporaires remplacés d'un coup par ``commit``."""
+
+    def __init__(self, target: Path, gzip_level: int, brotli_quality: Optional[int]) -> None:
+        self._target = target
+        self._files: List[Tuple[Path, Path, BinaryIO]] = []
+        self._plain = self._open(target)
+        self._gz_raw = self._open(target.with_name(target.name + ".gz"))
+        # filename="" : le nom du fichier temporaire n'entre pas dans l'en-tête gzip.
+        self._gz = gzip.GzipFile(filename="", mode="wb", fileobj=self._gz_raw, compresslevel=gzip_level, mtime=0)
+        self._br: Any = None
+        if brotli_quality is not None:
+            self._br_raw = self._open(target.with_name(target.name + ".br"))
+            self._br = brotli.Compressor(quality=brotli_quality)
+        self.size = 0
+
+    def _open(self, path: Path) -> BinaryIO:
+        tmp = path.with_name(path.name + ".tmp")
+        fh = tmp.open("wb")
+        self._files.append((tmp, path, fh))
+        return fh
+
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        self._plain.write(data)
+        self._gz.write(data)
+        if self._br is not None:
+            self._br_raw.write(self._br.process(data))
+
+    def commit(self) -> Dict[str, str]:
+        """Remplace les fichiers ; une variante pas plus petite que l'original est abandonnée."""
+        self._gz.close()
+        if self._br is not None:
+            self._br_raw.write(self._br.finish())
+        encodings: Dict[str, str] = {}
+        for tmp, path, fh in self._files:
+            fh.close()
+            if path == self._target:
+                os.replace(tmp, path)
+                continue
+            encoding = "gzip" if path.suffix == ".gz" else "br"
+            if tmp.stat().st_size < self.size:
+                os.replace(tmp, path)
+                encodings[encoding] = path.name
+            else:
+                tmp.unlink()
+                path.unlink(missing_ok=True)
+        return encodings
+
+    def abort(self) -> None:
+        for tmp, _path, fh in self._files:
+            fh.close()
+            tmp.unlink(missing_ok=True)
+
+
+class ArtifactPipeline:
+    """Copie déployable des pages générées, pour un reverse proxy.
+
+    ``publish(page)`` sort les ``<style>`` / ``<script>`` inline du ``<head>``
+    dans ``assets/style.<hash>.css`` et ``assets/script.<hash>.js`` (noms
+    dépendant du contenu : cache long sans invalidation), écrit la page dans
+    ``out_dir`` avec ses variantes ``.gz`` et, si le module ``brotli`` est
+    installé, ``.br``. ``write_manifest()`` liste chaque fichier avec son
+    empreinte, ses variantes et sa politique de cache : d'une génération à
+    l'autre seules les pages de données changent, une page identique n'est
+    pas réécrite.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        use_brotli: Optional[bool] = None,
+        gzip_level: int = 9,
+        brotli_quality: int = 11,
+        page_gzip_level: int = 6,
+        page_brotli_quality: int = 5,
+    ) -> None:
+        if use_brotli and brotli is None:
+            raise RuntimeError("brotli n'est pas installé (pip install brotli)")
+        self.out_dir = Path(out_dir)
+        if use_brotli is None:
+            use_brotli = brotli is not None
+        # Assets : petits et compressés une fois pour toutes -> niveaux maximum.
+        # Pages de données : recompressées à chaque génération ; au-delà, le
+        # gain est de quelques % pour un temps multiplié par 4 à 6 (45 Mo à 100k).
+        self._compression = {
+            "gzip_level": gzip_level,
+            "brotli_quality": brotli_quality if use_brotli else None,
+            "page_gzip_level": page_gzip_level,
+            "page_brotli_quality": page_brotli_quality if use_brotli else None,
+        }
+        self._previous = self._read_manifest()
+        # Réglages de compression changés : tout est recompressé.
+        self._reuse = self._previous.get("compression") == self._compression
+        self._assets: Dict[str, Dict[str, Any]] = {}
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._written: List[str] = []
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            data = json.loads((self.out_dir / MANIFEST).read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    # -- assets ------------------------------------------------------------------
+
+    def asset(self, kind: str, content: str) -> str:
+        """Écrit ``assets/<kind>.<hash><ext>`` (une fois) ; renvoie son chemin relatif."""
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        ext = ".css" if kind == "style" else ".js"
+        rel = f"{ASSET_DIR}/{kind}.{digest[:_HASH_LEN]}{ext}"
+        if rel in self._assets:
+            return rel
+        target = self.out_dir / rel
+        entry = self._reusable("assets", rel, digest)
+        if entry is None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            out = _Outputs(target, self._compression["gzip_level"], self._compression["brotli_quality"])
+            out.write(data)
+            entry = self._entry(digest, len(data), _TYPES[ext], IMMUTABLE, out.commit(), rel)
+            self._written.append(rel)
+        self._assets[rel] = entry
+        return rel
+
+    def _reusable(self, section: str, rel: str, digest: str) -> Optional[Dict[str, Any]]:
+        """Entrée de la génération précédente, si le fichier et ses variantes sont encore là."""
+        entry = self._previous.get(section, {}).get(rel)
+        if not self._reuse or entry is None or entry.get("sha256") != digest:
+            return None
+        files = [rel, *entry.get("encodings", {}).values()]
+        return entry if all((self.out_dir / f).exists() for f in files) else None
+
+    @staticmethod
+    def _entry(digest: str, size: int, content_type: str, cache: str, encodings: Dict[str, str], rel: str) -> Dict[str, Any]:
+        folder = rel.rpartition("/")[0]
+        return {
+            "sha256": digest,
+            "bytes": size,
+            "type": content_type,
+            "cache": cache,
+            "encodings": {k: f"{folder}/{v}" if folder else v for k, v in encodings.items()},
+        }
+
+    # -- pages -------------------------------------------------------------------
+
+    def publish(self, page: Path, name: Optional[str] = None) -> Dict[str, Any]:
+        """Publie ``page`` (déjà écrite, styles/scripts inline) sous ``out_dir/name``."""
+        page = Path(page)
+        rel = name or page.name
+        target = self.out_dir / rel
+        depth = rel.count("/")
+        with page.open("rb") as fh:
+            head, rest = self._read_head(fh)
+            head, assets = self._extract_assets(head, "../" * depth)
+            digest = hashlib.sha256(head)
+            self._copy(fh, rest, digest.update)
+        previous = self._reusable("pages", rel, digest.hexdigest())
+        if previous is not None:
+            self._pages[rel] = previous
+            return previous
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        out = _Outputs(target, self._compression["page_gzip_level"], self._compression["page_brotli_quality"])
+        try:
+            with page.open("rb") as fh:
+                _head, rest = self._read_head(fh)
+                out.write(head)
+                self._copy(fh, rest, out.write)
+        except BaseException:
+            out.abort()
+            raise
+        entry = self._entry(digest.hexdigest(), out.size, _TYPES[".html"], REVALIDATE, out.commit(), rel)
+        entry["assets"] = assets
+        self._pages[rel] = entry
+        self._written.append(rel)
+        return entry
+
+    @staticmethod
+    def _read_head(fh: BinaryIO) -> Tuple[bytes, bytes]:
+        # Le <head> est court : lu en entier ; le reste de la page est recopié par blocs.
+        data = b""
+        while len(data) < _HEAD_LIMIT:
+            chunk = fh.read(64 * 1024)
+            if not chunk:
+                break
+            data += chunk
+            end = data.find(b"</head>")
+            if end != -1:
+                end += len(b"</head>")
+                return data[:end], data[end:]
+        return b"", data
+
+    @staticmethod
+    def _copy(fh: BinaryIO, first: bytes, sink: Callable[[bytes], Any]) -> None:
+        sink(first)
+        while True:
+            chunk = fh.read(_CHUNK)
+            if not chunk:
+                return
+            sink(chunk)
+
+    def _extract_assets(self, head: bytes, prefix: str) -> Tuple[bytes, List[str]]:
+        if not head:
+            return head, []
+        blocks: Dict[str, List[str]] = {"style": [], "script": []}
+
+        def take(match: "re.Match[str]") -> str:
+            kind = match.group(1)
+            blocks[kind].append(match.group(2).strip("\n"))
+            # Un seul fichier par type, à la place du premier bloc : l'ordre est conservé.
+            return f"\0{kind}\0" if len(blocks[kind]) == 1 else ""
+
+        text = _INLINE.sub(take, head.decode("utf-8"))
+        assets: List[str] = []
+        for kind, parts in blocks.items():
+            if not parts:
+                continue
+            rel = self.asset(kind, "\n".join(parts) + "\n")
+            assets.append(rel)
+            tag = (
+                f"<link rel='stylesheet' href='{prefix}{rel}' />"
+                if kind == "style"
+                else f"<script src='{prefix}{rel}'></script>"
+            )
+            text = text.replace(f"\0{kind}\0", tag)
+        return text.encode("utf-8"), assets
+
+    def publish_dir(self, src_dir: Path, pattern: str = "*.html") -> List[str]:
+        """Publie toutes les pages d'un dossier (ex: sortie de ``PagedWebUI``)."""
+        names = []
+        for page in sorted(Path(src_dir).glob(pattern)):
+            self.publish(page)
+            names.append(page.name)
+        return names
+
+    # -- manifeste ---------------------------------------------------------------
+
+    def write_manifest(self) -> List[str]:
+        """Écrit ``manifest.json``, supprime les assets devenus inutiles et
+        renvoie les fichiers écrits depuis le manifeste précédent.
+
+        Les pages non republiées cette fois restent listées (si elles existent
+        encore) ; les assets de la génération précédente sont gardés une
+        génération de plus pour les clients qui ont encore l'ancienne page.
+        """
+        pages = {
+            rel: entry
+            for rel, entry in self._previous.get("pages", {}).items()
+            if rel not in self._pages and (self.out_dir / rel).exists()
+        }
+        pages.update(self._pages)
+        assets = dict(self._assets)
+        for entry in pages.values():
+            for rel in entry.get("assets", []):
+                if rel not in assets and rel in self._previous.get("assets", {}):
+                    assets[rel] = self._previous["assets"][rel]
+        manifest = {
+            "version": 1,
+            "compression": self._compression,
+            "assets": dict(sorted(assets.items())),
+            "pages": dict(sorted(pages.items())),
+        }
+
+        self._prune(self._files_of(manifest) | self._files_of(self._previous))
+        path = self.out_dir / MANIFEST
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(MANIFEST + ".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        self._previous = manifest
+        self._reuse = True
+        self._assets.clear()
+        self._pages.clear()
+        written, self._written = self._written, []
+        return written
+
+    @staticmethod
+    def _files_of(manifest: Dict[str, Any]) -> Set[str]:
+        files: Set[str] = set()
+        for rel, entry in manifest.get("assets", {}).items():
+            files.add(rel)
+            files.update(entry.get("encodings", {}).values())
+        return files
+
+    def _prune(self, keep: Set[str]) -> None:
+        folder = self.out_dir / ASSET_DIR
+        if not folder.is_dir():
+            return
+        for path in folder.iterdir():
+            if path.is_file() and f"{ASSET_DIR}/{path.name}" not in keep:
+                path.unlink()
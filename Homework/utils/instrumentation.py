@@ -0,0 +1,196 @@
+from __future__ import annotations
+import functools
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _label(name: str) -> str:
+    return name.replace("\\", "\\\\").replace('"', '\\"')
+
+
+class StageStats:
+    __slots__ = ("name", "calls", "wall", "cpu", "rows", "bytes")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rows = 0
+        self.bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "wall_seconds": round(self.wall, 6),
+            "cpu_seconds": round(self.cpu, 6),
+            "rows": self.rows,
+            "bytes": self.bytes,
+        }
+
+
+class _Stage:
+    """Mesure en cours : ``add_rows`` / ``add_bytes`` pendant le bloc ``with``."""
+
+    __slots__ = ("_stats", "_memory", "_wall", "_cpu")
+
+    def __init__(self, stats: StageStats, memory: Any = None) -> None:
+        self._stats = stats
+        self._memory = memory
+
+    def __enter__(self) -> "_Stage":
+        if self._memory is not None:
+            self._memory.enter(self._stats.name)
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        stats = self._stats
+        stats.calls += 1
+        stats.wall += time.perf_counter() - self._wall
+        stats.cpu += time.process_time() - self._cpu
+        if self._memory is not None:
+            self._memory.exit(stats.name)
+
+    def add_rows(self, n: int) -> None:
+        self._stats.rows += n
+
+    def add_bytes(self, n: int) -> None:
+        self._stats.bytes += n
+
+
+class _NullStage:
+    # Instance unique renvoyée quand la mesure est coupée : aucune allocation, aucun appel d'horloge.
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+    def add_rows(self, n: int) -> None:
+        pass
+
+    def add_bytes(self, n: int) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Instrumentation:
+    """Temps mural, temps CPU, lignes et octets par étape du pipeline.
+
+        with metrics.stage("render_html") as st:
+            html = _render_html(...)
+            st.add_rows(len(students))
+
+    ``@metrics.timed("load")`` fait de même pour une fonction. Désactivée,
+    ``stage()`` renvoie un objet vide partagé : le coût se limite à un test.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.memory: Any = None
+        self._stages: Dict[str, StageStats] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def attach_memory(self, budget: Any) -> None:
+        """Relie un ``utils.memory_budget.MemoryBudget`` : pic tracemalloc par étape.
+
+        Indépendant de ``enable()`` : sans lui, les étapes suivent la mémoire
+        mais aucun temps n'est enregistré."""
+        self.memory = budget
+
+    def reset(self) -> None:
+        self._stages.clear()
+
+    def stage(self, name: str) -> Any:
+        if not self.enabled:
+            if self.memory is None:
+                return _NULL_STAGE
+            # Budget mémoire sans --metrics : compteurs jetables, hors rapport.
+            return _Stage(StageStats(name), self.memory)
+        stats = self._stages.get(name)
+        if stats is None:
+            stats = self._stages[name] = StageStats(name)
+        return _Stage(stats, self.memory)
+
+    def timed(self, name: Optional[str] = None) -> Callable[[F], F]:
+        def decorate(fn: F) -> F:
+            label = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with self.stage(label):
+                    return fn(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+    def __iter__(self) -> Iterator[StageStats]:
+        return iter(self._stages.values())
+
+    def get(self, name: str) -> Optional[StageStats]:
+        return self._stages.get(name)
+
+    # -- rapports --------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {"stages": {s.name: s.to_dict() for s in self}}
+        if self.memory is not None:
+            report["memory"] = self.memory.to_dict()
+        return report
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "madrassa_dashboard") -> str:
+        """Format texte d'exposition Prometheus (fichier pour le textfile collector)."""
+        series = (
+            ("stage_calls_total", "counter", "Exécutions de l'étape", lambda s: s.calls),
+            ("stage_wall_seconds_total", "counter", "Temps mural cumulé", lambda s: s.wall),
+            ("stage_cpu_seconds_total", "counter", "Temps CPU cumulé", lambda s: s.cpu),
+            ("stage_rows_total", "counter", "Lignes traitées", lambda s: s.rows),
+            ("stage_bytes_total", "counter", "Octets écrits", lambda s: s.bytes),
+        )
+        lines: List[str] = []
+        for suffix, kind, help_text, value in series:
+            metric = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}.")
+            lines.append(f"# TYPE {metric} {kind}")
+            for s in self:
+                lines.append(f'{metric}{{stage="{_label(s.name)}"}} {value(s)!r}')
+        if self.memory is not None:
+            metric = f"{prefix}_stage_peak_memory_bytes"
+            lines.append(f"# HELP {metric} Pic d'allocation tracemalloc pendant l'étape.")
+            lines.append(f"# TYPE {metric} gauge")
+            for name, stage in self.memory.to_dict()["stages"].items():
+                lines.append(f'{metric}{{stage="{_label(name)}"}} {stage["peak_bytes"]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """``.prom`` -> format Prometheus, sinon JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = self.to_prometheus() if path.suffix == ".prom" else self.to_json()
+        path.write_text(text, encoding="utf-8")
+
+
+# Instance partagée utilisée par main.py et WebUI ; coupée par défaut.
+metrics = Instrumentation()
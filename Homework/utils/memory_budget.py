@@ -0,0 +1,158 @@
+from __future__ import annotations
+import json
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Ordres de grandeur mesurés sur les jeux synthétiques (benchmarks/) :
+# un fichier JSON chargé occupe ~4x sa taille en objets Python, la normalisation
+# (_split_members, _parse_events) ~350 octets par membre, et _render_html
+# culmine vers ~450 octets par ligne (liste de lignes + chaîne finale).
+PARSED_BYTES_PER_FILE_BYTE = 4
+NORMALIZED_BYTES_PER_MEMBER = 350
+RENDER_BYTES_PER_ROW = 450
+
+_UNITS = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+def parse_bytes(text: str) -> int:
+    """« 512M » -> 536870912 ; un nombre seul est en octets."""
+    text = text.strip().lower().removesuffix("b").removesuffix("i")
+    factor = _UNITS.get(text[-1:], 1)
+    if factor != 1:
+        text = text[:-1]
+    return int(float(text) * factor)
+
+
+class _StageMemory:
+    __slots__ = ("name", "calls", "start", "peak", "top")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.start = 0
+        self.peak = 0
+        self.top: List[Dict[str, Any]] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "peak_bytes": self.peak,
+            "peak_increase_bytes": max(0, self.peak - self.start),
+            "top_sites": self.top,
+        }
+
+
+class MemoryBudget:
+    """Suivi tracemalloc par étape et budget mémoire d'une génération.
+
+    Branché sur ``Instrumentation`` (``metrics.attach_memory(budget)``), chaque
+    ``metrics.stage(...)`` relève le pic d'allocation de l'étape et, si ``top``
+    > 0, les sites d'allocation les plus gros à la sortie des étapes de premier niveau. ``would_exceed`` sert
+    aux étapes qui peuvent passer en mode flux (lecture ``iter_*``, écriture
+    ligne à ligne) ; ``switch`` note le basculement dans le rapport.
+    """
+
+    def __init__(self, limit: Optional[int] = None, headroom: float = 0.9, top: int = 0, frames: int = 1) -> None:
+        self.limit = limit
+        self.headroom = headroom
+        self.top = top
+        self.frames = frames
+        self.streaming = False
+        self.switches: List[Dict[str, Any]] = []
+        self._stages: Dict[str, _StageMemory] = {}
+        # Étapes ouvertes : [étape, mémoire à l'entrée, pic vu depuis l'entrée].
+        self._open: List[List[Any]] = []
+        self._started_here = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_here = True
+
+    def stop(self) -> None:
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+
+    # -- budget ----------------------------------------------------------------------
+
+    def current(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+    def would_exceed(self, extra: int) -> bool:
+        if self.limit is None:
+            return False
+        return self.current() + extra > self.limit * self.headroom
+
+    def switch(self, stage: str, reason: str) -> None:
+        self.streaming = True
+        self.switches.append({"stage": stage, "reason": reason, "current_bytes": self.current()})
+
+    # -- étapes (appelé par Instrumentation) -----------------------------------------
+
+    def enter(self, name: str) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        # reset_peak() est global : le pic vu jusqu'ici est reporté sur les étapes englobantes.
+        for entry in self._open:
+            entry[2] = max(entry[2], peak)
+        tracemalloc.reset_peak()
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _StageMemory(name)
+        self._open.append([stage, current, current])
+
+    def exit(self, name: str) -> None:
+        if not self._open:
+            return
+        stage, start, seen = self._open.pop()
+        peak = max(seen, tracemalloc.get_traced_memory()[1])
+        stage.calls += 1
+        if peak - start > stage.peak - stage.start:
+            stage.start, stage.peak = start, peak
+        for entry in self._open:
+            entry[2] = max(entry[2], peak)
+        # statistics() coûte plusieurs secondes sur un gros tas : seulement en
+        # sortie des étapes de premier niveau (chargement, tableau de bord).
+        if self.top and not self._open:
+            stage.top = self._top_sites()
+
+    def _top_sites(self) -> List[Dict[str, Any]]:
+        stats = tracemalloc.take_snapshot().statistics("lineno")[: self.top]
+        return [
+            {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}", "bytes": s.size, "blocks": s.count}
+            for s in stats
+        ]
+
+    # -- rapport ---------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        _, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        return {
+            "limit_bytes": self.limit,
+            "peak_bytes": max([peak, *(s.peak for s in self._stages.values())]),
+            "streaming": self.streaming,
+            "switches": self.switches,
+            "stages": {s.name: s.to_dict() for s in self._stages.values()},
+        }
+
+    def write(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+
+def estimate_load_bytes(storage: Any, names: Tuple[str, ...]) -> Optional[int]:
+    """Mémoire prévue pour charger ``names`` d'après ``storage.stamp()`` (taille des fichiers)."""
+    stamp = getattr(storage, "stamp", None)
+    if stamp is None:
+        return None
+    total = 0
+    for name in names:
+        st = stamp(name)
+        if isinstance(st, tuple) and st and isinstance(st[0], int):
+            total += st[0]
+    return total * PARSED_BYTES_PER_FILE_BYTE
